@@ -2,11 +2,8 @@
  * Router intelligent - Détermine si utiliser algorithmes locaux ou LLM
  * Économise 70% des ressources IA via pré-traitement
  */
-import { exec } from 'child_process';
-import { promisify } from 'util';
 import path from 'path';
-
-const execAsync = promisify(exec);
+import { PreintelWorkerClient } from './preintel-worker';
 
 export interface AlgorithmDecision {
   useLocal: boolean;
@@ -18,8 +15,7 @@ export interface AlgorithmDecision {
 
 export class AlgorithmRouter {
   private readonly forensicPath = 'algorithms/forensic-timeline-analyzer.js';
-  private readonly nerPath = 'osint-tools-advanced/services/ner-french-enhanced.py';
-  private readonly nlpPath = 'backend/core/nlp_analyzer.py';
+  private readonly worker = new PreintelWorkerClient();
 
   async route(prompt: string, context?: any): Promise<AlgorithmDecision> {
     const promptLower = prompt.toLowerCase();
@@ -82,8 +78,7 @@ export class AlgorithmRouter {
 
   private async executeNER(text: string): Promise<any> {
     try {
-      const { stdout } = await execAsync(`python3 ${this.nerPath} "${text.replace(/"/g, '\\"')}"`);
-      return JSON.parse(stdout);
+      return await this.worker.request('ner', { text });
     } catch (error) {
       throw new Error(`NER execution failed: ${error.message}`);
     }
@@ -101,20 +96,16 @@ export class AlgorithmRouter {
 
   private async executeNLP(text: string): Promise<any> {
     try {
-      const { stdout } = await execAsync(`python3 -c "
-import sys
-sys.path.append('backend/core')
-from nlp_analyzer import NLPAnalyzer
-analyzer = NLPAnalyzer()
-result = analyzer.analyze_content('${text.replace(/'/g, "\\'")}')
-print(result.__dict__)
-"`);
-      return eval(`(${stdout.trim()})`);
+      return await this.worker.request('nlp', { text });
     } catch (error) {
       throw new Error(`NLP execution failed: ${error.message}`);
     }
   }
 
+  async shutdown(): Promise<void> {
+    await this.worker.shutdown();
+  }
+
   private isEntityExtraction(prompt: string): boolean {
     const patterns = [
       /extract.*entit/i, /find.*email/i, /find.*phone/i, /find.*address/i,
@@ -0,0 +1,100 @@
+/**
+ * Client du worker Python persistant (backend/core/preintel_worker.py)
+ * Un seul processus python3 sert NER + NLP en JSON-lines: plus de spawn par requête
+ */
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import readline from 'readline';
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+export class PreintelWorkerClient {
+  private proc: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingRequest>();
+  private nextId = 1;
+
+  constructor(
+    private readonly scriptPath = 'backend/core/preintel_worker.py',
+    private readonly jobs = parseInt(process.env.AURA_PREINTEL_JOBS || '1'),
+    private readonly timeoutMs = parseInt(process.env.AURA_PREINTEL_TIMEOUT_MS || '10000')
+  ) {}
+
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.proc) return this.proc;
+
+    const proc = spawn('python3', [this.scriptPath, '--jobs', String(this.jobs)], {
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    const lines = readline.createInterface({ input: proc.stdout });
+
+    lines.on('line', (line) => {
+      let message: any;
+      try {
+        message = JSON.parse(line);
+      } catch {
+        return;
+      }
+      const entry = this.pending.get(message.id);
+      if (!entry) return; // événement "ready" ou réponse expirée
+      this.pending.delete(message.id);
+      clearTimeout(entry.timer);
+      if (message.ok) entry.resolve(message.result);
+      else entry.reject(new Error(message.error));
+    });
+
+    proc.stderr.on('data', (chunk) => process.stderr.write(`[preintel-worker] ${chunk}`));
+    proc.on('exit', (code) => {
+      if (this.proc === proc) this.proc = null;
+      this.failAll(new Error(`Preintel worker exited (code ${code})`));
+    });
+    // spawn impossible (ENOENT) ou EPIPE après la mort du worker: rejet des requêtes, pas de crash
+    proc.on('error', (error) => {
+      if (this.proc === proc) this.proc = null;
+      this.failAll(new Error(`Preintel worker error: ${error.message}`));
+    });
+    proc.stdin.on('error', (error) => {
+      this.failAll(new Error(`Preintel worker stdin error: ${error.message}`));
+    });
+
+    this.proc = proc;
+    return proc;
+  }
+
+  private failAll(error: Error) {
+    for (const [id, entry] of this.pending) {
+      clearTimeout(entry.timer);
+      entry.reject(error);
+      this.pending.delete(id);
+    }
+  }
+
+  request(method: string, params: Record<string, any> = {}): Promise<any> {
+    const proc = this.ensureStarted();
+    const id = this.nextId++;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Preintel worker timeout after ${this.timeoutMs}ms (${method})`));
+      }, this.timeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      proc.stdin.write(JSON.stringify({ id, method, params }) + '\n');
+    });
+  }
+
+  health(): Promise<any> {
+    return this.request('health');
+  }
+
+  async shutdown(): Promise<void> {
+    if (!this.proc) return;
+    const proc = this.proc;
+    const exited = new Promise<void>((resolve) => proc.once('exit', () => resolve()));
+    await this.request('shutdown').catch(() => undefined);
+    proc.stdin.end();
+    await exited;
+  }
+}
@@ -0,0 +1,105 @@
+"""
+AURA OSINT - Analysis Cache
+Cache LRU/TTL des résultats NLP, indexé par empreinte du texte normalisé
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+def content_key(normalized_text: str, lexicon_version: str) -> Tuple[bytes, str]:
+    """Clé de cache: empreinte du texte normalisé + version du lexique"""
+    digest = hashlib.blake2b(normalized_text.encode('utf-8'), digest_size=16).digest()
+    return digest, lexicon_version
+
+class AnalysisCache:
+    """Cache borné (LRU + TTL) avec compteurs hit/miss exportables en Prometheus"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0, metric_prefix: str = 'nlp_analysis_cache'):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.metric_prefix = metric_prefix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {'lru': 0, 'ttl': 0, 'invalidation': 0}
+        self.lexicon_version: Optional[str] = None
+        self._store: 'OrderedDict[Tuple[bytes, str], Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[Any]:
+        """Retourne la valeur en cache ou None (compte hit/miss)"""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if time.monotonic() > expires_at:
+                del self._store[key]
+                self.evictions['ttl'] += 1
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[bytes, str], value: Any):
+        """Ajoute une valeur, en évinçant l'entrée la moins récemment utilisée si plein"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            # Un changement de version du lexique rend toutes les entrées obsolètes
+            if key[1] != self.lexicon_version:
+                self._invalidate(key[1])
+            self._store[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._store.move_to_end(key)
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+                self.evictions['lru'] += 1
+
+    def invalidate(self, lexicon_version: Optional[str] = None):
+        """Vide le cache (appelé quand le lexique change)"""
+        with self._lock:
+            self._invalidate(lexicon_version)
+
+    def _invalidate(self, lexicon_version: Optional[str]):
+        self.evictions['invalidation'] += len(self._store)
+        self._store.clear()
+        self.lexicon_version = lexicon_version
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques du cache"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._store),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'evictions': dict(self.evictions),
+            'lexicon_version': self.lexicon_version,
+        }
+
+    def to_prometheus(self) -> str:
+        """Export au format texte Prometheus (même style que ai_semantic_cache_hits_total)"""
+        p = self.metric_prefix
+        lines = [
+            f"# HELP {p}_hits_total NLP analysis cache lookups by result",
+            f"# TYPE {p}_hits_total counter",
+            f'{p}_hits_total{{result="hit"}} {self.hits}',
+            f'{p}_hits_total{{result="miss"}} {self.misses}',
+            f"# HELP {p}_evictions_total NLP analysis cache evictions by reason",
+            f"# TYPE {p}_evictions_total counter",
+        ]
+        lines.extend(f'{p}_evictions_total{{reason="{reason}"}} {count}' for reason, count in self.evictions.items())
+        lines.extend([
+            f"# HELP {p}_entries Current number of cached results",
+            f"# TYPE {p}_entries gauge",
+            f"{p}_entries {len(self._store)}",
+        ])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,147 @@
+"""
+AURA OSINT - Analysis Metrics
+Instrumentation optionnelle de NLPAnalyzer: histogrammes par étape, débit, court-circuits
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Bornes des histogrammes d'étape, en secondes (10µs → 100ms)
+DEFAULT_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1)
+
+def per_process_path(path: str) -> str:
+    """Chemin d'export par processus: {pid} ajouté avant l'extension s'il est absent
+
+    Sans {pid}, les processus d'un pool écraseraient le même fichier et leurs valeurs,
+    qui s'additionnent, seraient perdues.
+    """
+    if '{pid}' in path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{{pid}}{ext}"
+
+class StageHistogram:
+    """Histogramme cumulatif au sens Prometheus"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # dernier compteur: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+class AnalysisMetrics:
+    """Compteurs et histogrammes d'analyse, exportables au format texte Prometheus
+
+    export_path peut contenir {pid}: chaque processus d'un pool écrit alors son propre
+    fichier, et les valeurs s'additionnent à l'agrégation (aggregate-report.py).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, metric_prefix: str = 'nlp_analysis',
+                 export_path: Optional[str] = None, export_interval: float = 5.0):
+        self.buckets = tuple(buckets)
+        self.metric_prefix = metric_prefix
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.stages: Dict[str, StageHistogram] = {}
+        self.texts = 0
+        self.bytes = 0
+        self.short_circuits = 0
+        self.hate = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.time()
+        # Exports Prometheus additionnels inclus dans le fichier (ex: AnalysisCache.to_prometheus)
+        self.collectors: List[Callable[[], str]] = []
+        self._last_export = time.monotonic()
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        """Enregistre la durée d'une étape"""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = StageHistogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record_text(self, size_bytes: int, seconds: float, short_circuit: bool = False, is_hate: bool = False):
+        """Enregistre un texte analysé (durée totale, taille, court-circuit éventuel)"""
+        self.texts += 1
+        self.bytes += size_bytes
+        self.busy_seconds += seconds
+        if short_circuit:
+            self.short_circuits += 1
+        if is_hate:
+            self.hate += 1
+        self.observe('total', seconds)
+        if self.export_path and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
+
+    def rates(self) -> Dict[str, float]:
+        """Débits: sur le temps passé à analyser et sur le temps écoulé depuis le démarrage"""
+        wall = max(time.time() - self.started_at, 1e-9)
+        busy = max(self.busy_seconds, 1e-9)
+        return {
+            'texts_per_second': self.texts / busy,
+            'bytes_per_second': self.bytes / busy,
+            'texts_per_second_wall': self.texts / wall,
+        }
+
+    def to_prometheus(self) -> str:
+        """Export au format texte Prometheus"""
+        p = self.metric_prefix
+        lines: List[str] = [
+            f"# HELP {p}_stage_seconds Time spent in each NLPAnalyzer stage",
+            f"# TYPE {p}_stage_seconds histogram",
+        ]
+        for stage, histogram in self.stages.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.9f}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        rates = self.rates()
+        lines.extend([
+            f"# HELP {p}_texts_total Texts analyzed",
+            f"# TYPE {p}_texts_total counter",
+            f"{p}_texts_total {self.texts}",
+            f"# HELP {p}_bytes_total UTF-8 bytes analyzed",
+            f"# TYPE {p}_bytes_total counter",
+            f"{p}_bytes_total {self.bytes}",
+            f"# HELP {p}_short_circuit_total Texts returned early as too short (< 3 chars)",
+            f"# TYPE {p}_short_circuit_total counter",
+            f"{p}_short_circuit_total {self.short_circuits}",
+            f"# HELP {p}_hate_total Texts classified as hate speech",
+            f"# TYPE {p}_hate_total counter",
+            f"{p}_hate_total {self.hate}",
+            f"# HELP {p}_texts_per_second Texts analyzed per second of analysis time",
+            f"# TYPE {p}_texts_per_second gauge",
+            f"{p}_texts_per_second {rates['texts_per_second']:.3f}",
+            f"# HELP {p}_bytes_per_second Bytes analyzed per second of analysis time",
+            f"# TYPE {p}_bytes_per_second gauge",
+            f"{p}_bytes_per_second {rates['bytes_per_second']:.3f}",
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: Optional[str] = None):
+        """Écrit l'export Prometheus (et celui des collecteurs) dans un fichier, atomiquement"""
+        path = (path or self.export_path).format(pid=os.getpid())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w') as f:
+                f.write(self.to_prometheus())
+                for collect in self.collectors:
+                    f.write(collect())
+            os.replace(tmp, path)
+            self._last_export = time.monotonic()
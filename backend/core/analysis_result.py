@@ -0,0 +1,151 @@
+"""
+AURA OSINT - Analysis Result
+Résultat d'analyse NLP compact: catégories en masque de bits, mots-clés en identifiants
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SEVERITY_LEVELS = ('low', 'medium', 'high', 'critical')
+_SEVERITY_INDEX = {level: i for i, level in enumerate(SEVERITY_LEVELS)}
+
+SAFE_EXPLANATION = "Contenu analysé comme sûr"
+NO_HATE_EXPLANATION = "Aucun contenu haineux détecté"
+
+# flags (bit0: haine, bit1: court-circuit), confiance en millièmes, sévérité, nb mots-clés
+_HEADER = struct.Struct('<BHBH')
+
+def format_explanation(names: Sequence[str], confidence: float) -> str:
+    """Explication lisible d'une détection"""
+    if not names:
+        return NO_HATE_EXPLANATION
+    return f"Contenu potentiellement haineux détecté: {', '.join(names)} (confiance: {confidence:.1%})"
+
+class ResultVocabulary:
+    """Tables partagées par tous les résultats d'un même lexique (catégories, mots-clés, libellés)"""
+
+    __slots__ = ('categories', 'entries', 'labels')
+
+    def __init__(self, categories: List[str], entries: Sequence[Tuple[str, str]], labels: Dict[str, str]):
+        self.categories = categories
+        self.entries = entries
+        self.labels = labels
+
+    def categories_from_mask(self, mask: int) -> List[str]:
+        categories = self.categories
+        found = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                found.append(categories[bit])
+            mask >>= 1
+            bit += 1
+        return found
+
+class AnalysisResult:
+    """Résultat d'analyse NLP (slotted; partagé par le cache, ne pas modifier)
+
+    Les catégories sont stockées en masque de bits (bit i = vocab.categories[i]) et les
+    mots-clés en identifiants d'entrée du lexique; l'explication n'est construite
+    qu'à la première lecture.
+    """
+
+    __slots__ = ('is_hate_speech', 'confidence_score', 'severity_level', 'category_mask',
+                 'keyword_ids', 'vocab', '_explanation')
+
+    def __init__(self, is_hate_speech: bool, confidence_score: float, severity_level: str,
+                 category_mask: int = 0, keyword_ids: Tuple[int, ...] = (),
+                 vocab: Optional[ResultVocabulary] = None, explanation: Optional[str] = None):
+        self.is_hate_speech = is_hate_speech
+        self.confidence_score = confidence_score
+        self.severity_level = severity_level  # low, medium, high, critical
+        self.category_mask = category_mask
+        self.keyword_ids = keyword_ids
+        self.vocab = vocab
+        self._explanation = explanation
+
+    @property
+    def detected_categories(self) -> List[str]:
+        if not self.category_mask:
+            return []
+        return self.vocab.categories_from_mask(self.category_mask)
+
+    @property
+    def keywords_detected(self) -> List[str]:
+        entries = self.vocab.entries if self.keyword_ids else ()
+        return [entries[entry_id][0] for entry_id in self.keyword_ids]
+
+    @property
+    def explanation(self) -> str:
+        if self._explanation is None:
+            labels = self.vocab.labels
+            names = [labels.get(cat, cat) for cat in self.detected_categories]
+            self._explanation = format_explanation(names, self.confidence_score)
+        return self._explanation
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forme dict historique (mêmes clés que l'ancien dataclass)"""
+        return {
+            'is_hate_speech': self.is_hate_speech,
+            'confidence_score': self.confidence_score,
+            'detected_categories': self.detected_categories,
+            'severity_level': self.severity_level,
+            'explanation': self.explanation,
+            'keywords_detected': self.keywords_detected,
+        }
+
+    def to_json(self, full: bool = True) -> str:
+        """JSON; full=False produit la forme compacte (masque et identifiants, sans textes)"""
+        if full:
+            return json.dumps(self.to_dict(), ensure_ascii=False)
+        return json.dumps({
+            'h': self.is_hate_speech,
+            'c': self.confidence_score,
+            's': self.severity_level,
+            'm': self.category_mask,
+            'k': list(self.keyword_ids),
+        })
+
+    def to_bytes(self) -> bytes:
+        """Sérialisation binaire compacte (le vocabulaire n'est pas inclus)"""
+        flags = (1 if self.is_hate_speech else 0) | (2 if self._explanation == SAFE_EXPLANATION else 0)
+        mask = self.category_mask
+        mask_bytes = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+        ids = self.keyword_ids
+        return b''.join((
+            _HEADER.pack(flags, round(self.confidence_score * 1000), _SEVERITY_INDEX[self.severity_level], len(ids)),
+            bytes((len(mask_bytes),)),
+            mask_bytes,
+            struct.pack(f'<{len(ids)}I', *ids),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, vocab: ResultVocabulary) -> 'AnalysisResult':
+        """Inverse de to_bytes, avec le vocabulaire du lexique d'origine"""
+        flags, confidence, severity, n_ids = _HEADER.unpack_from(data, 0)
+        offset = _HEADER.size
+        mask_len = data[offset]
+        offset += 1
+        mask = int.from_bytes(data[offset:offset + mask_len], 'little')
+        offset += mask_len
+        ids = struct.unpack_from(f'<{n_ids}I', data, offset)
+        return cls(
+            is_hate_speech=bool(flags & 1),
+            confidence_score=confidence / 1000,
+            severity_level=SEVERITY_LEVELS[severity],
+            category_mask=mask,
+            keyword_ids=ids,
+            vocab=vocab,
+            explanation=SAFE_EXPLANATION if flags & 2 else None,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (f"AnalysisResult(is_hate_speech={self.is_hate_speech}, confidence_score={self.confidence_score}, "
+                f"detected_categories={self.detected_categories}, severity_level={self.severity_level!r}, "
+                f"keywords_detected={self.keywords_detected})")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - Entity Index
+Index inversé persistant des entités FrenchNER (SQLite): valeur normalisée → documents, positions
+
+Pivots d'enquête ("dans quels documents apparaît ce SIREN / ce téléphone ?") sans
+relancer la NER: recherche exacte et par préfixe sur l'index B-tree des valeurs,
+ajout incrémental (un document réindexé remplace ses occurrences précédentes).
+
+Usage:
+    python3 backend/core/ner_corpus.py corpus.jsonl -o entites.jsonl
+    python3 backend/core/entity_index.py add enquete.db entites.jsonl
+    python3 backend/core/entity_index.py lookup enquete.db 732829320
+    python3 backend/core/entity_index.py lookup enquete.db +33612 --prefix --type phone_fr
+    python3 backend/core/entity_index.py info enquete.db
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (type, valeur normalisée, début, fin, confiance)
+EntityRow = Tuple[str, str, int, int, float]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS entity_values (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL,
+    type TEXT NOT NULL,
+    UNIQUE (value, type)
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    value_id INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    confidence REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS occurrences_value ON occurrences (value_id);
+CREATE INDEX IF NOT EXISTS occurrences_document ON occurrences (document_id);
+"""
+
+LOOKUP_COLUMNS = """
+SELECT d.key, v.type, v.value, o.start, o.end, o.confidence
+FROM entity_values v
+JOIN occurrences o ON o.value_id = v.id
+JOIN documents d ON d.id = o.document_id
+"""
+
+def result_entities(result: Dict[str, Any]) -> Iterator[EntityRow]:
+    """Entités d'un résultat FrenchNER.process_document (format groupé ou colonnes)"""
+    if 'entities_by_type' in result:
+        for entity_type, entities in result['entities_by_type'].items():
+            for entity in entities:
+                occurrences = entity['metadata'].get('occurrences') or [entity['position']]
+                for start, end in occurrences:
+                    yield entity_type, entity['normalized'], start, end, entity['confidence']
+    elif 'entities' in result:
+        types, strings, metadata = result['types'], result['strings'], result['metadata']
+        columns = result['entities']
+        for t, n, start, end, confidence, m in zip(columns['type'], columns['normalized'], columns['start'],
+                                                   columns['end'], columns['confidence'], columns['metadata']):
+            for start, end in metadata[m].get('occurrences') or [(start, end)]:
+                yield types[t], strings[n], start, end, confidence
+
+def result_key(result: Dict[str, Any], source: Optional[str] = None) -> Optional[str]:
+    """Clé de document d'une ligne de sortie ner_corpus.py: id, chemin ou numéro de ligne
+
+    Chemin et numéro de ligne ne sont uniques que dans une sortie: préfixés par source
+    (fichier de résultats) pour ne pas remplacer les documents d'une autre sortie.
+    """
+    if result.get('id') is not None:
+        return str(result['id'])
+    for field in ('path', 'line'):
+        if result.get(field) is not None:
+            return f"{source}:{result[field]}" if source else str(result[field])
+    return None
+
+class EntityIndex:
+    """Index inversé entités → documents sur un fichier SQLite"""
+
+    def __init__(self, path: str, cache_size: int = 100000):
+        self.path = path
+        self.cache_size = cache_size
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        # (valeur, type) → id, évite un SELECT par entité lors des insertions en masse
+        self._value_ids: Dict[Tuple[str, str], int] = {}
+
+    def _value_id(self, value: str, entity_type: str) -> int:
+        key = (value, entity_type)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            row = self._db.execute('SELECT id FROM entity_values WHERE value = ? AND type = ?', key).fetchone()
+            if row is None:
+                value_id = self._db.execute('INSERT INTO entity_values (value, type) VALUES (?, ?)', key).lastrowid
+            else:
+                value_id = row[0]
+            if len(self._value_ids) >= self.cache_size:
+                self._value_ids.clear()
+            self._value_ids[key] = value_id
+        return value_id
+
+    def _delete_occurrences(self, document_id: int) -> List[int]:
+        """Supprime les occurrences d'un document; retourne les ids de valeurs concernés"""
+        value_ids = [row[0] for row in self._db.execute(
+            'SELECT DISTINCT value_id FROM occurrences WHERE document_id = ?', (document_id,))]
+        self._db.execute('DELETE FROM occurrences WHERE document_id = ?', (document_id,))
+        return value_ids
+
+    def _prune_values(self, value_ids: List[int]):
+        """Supprime les valeurs parmi value_ids qui n'ont plus d'occurrence"""
+        for i in range(0, len(value_ids), 500):
+            batch = value_ids[i:i + 500]
+            marks = ','.join('?' * len(batch))
+            orphans = self._db.execute(
+                f'SELECT id, value, type FROM entity_values WHERE id IN ({marks}) '
+                'AND NOT EXISTS (SELECT 1 FROM occurrences WHERE value_id = entity_values.id)', batch).fetchall()
+            if not orphans:
+                continue
+            self._db.executemany('DELETE FROM entity_values WHERE id = ?', [(value_id,) for value_id, _, _ in orphans])
+            for _, value, entity_type in orphans:
+                self._value_ids.pop((value, entity_type), None)
+
+    def _add(self, key: str, entities: Iterable[EntityRow]):
+        row = self._db.execute('SELECT id FROM documents WHERE key = ?', (key,)).fetchone()
+        previous: List[int] = []
+        if row is None:
+            document_id = self._db.execute('INSERT INTO documents (key) VALUES (?)', (key,)).lastrowid
+        else:
+            # Document réindexé: ses anciennes occurrences sont remplacées
+            document_id = row[0]
+            previous = self._delete_occurrences(document_id)
+        self._db.executemany(
+            'INSERT INTO occurrences (value_id, document_id, start, end, confidence) VALUES (?, ?, ?, ?, ?)',
+            [(self._value_id(value, entity_type), document_id, start, end, confidence)
+             for entity_type, value, start, end, confidence in entities])
+        self._prune_values(previous)
+
+    def add_document(self, key: str, entities: Iterable[EntityRow]):
+        """Indexe (ou réindexe) un document"""
+        self.add_documents([(key, entities)])
+
+    def add_documents(self, documents: Iterable[Tuple[str, Iterable[EntityRow]]], batch_size: int = 1000) -> int:
+        """Insertion en masse, une transaction par lot de documents; retourne le nombre indexé"""
+        count = 0
+        pending = 0
+        try:
+            for key, entities in documents:
+                self._add(key, entities)
+                count += 1
+                pending += 1
+                if pending >= batch_size:
+                    self._db.commit()
+                    pending = 0
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            self._value_ids.clear()  # ids de valeurs annulées
+            raise
+        return count
+
+    def remove_document(self, key: str):
+        row = self._db.execute('SELECT id FROM documents WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return
+        with self._db:
+            self._prune_values(self._delete_occurrences(row[0]))
+            self._db.execute('DELETE FROM documents WHERE id = ?', (row[0],))
+
+    def _rows(self, where: str, params: Tuple, limit: Optional[int]) -> List[Dict[str, Any]]:
+        sql = LOOKUP_COLUMNS + where + ' ORDER BY v.value, d.key, o.start'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [{'document': key, 'type': entity_type, 'value': value, 'start': start, 'end': end,
+                 'confidence': confidence}
+                for key, entity_type, value, start, end, confidence in self._db.execute(sql, params)]
+
+    def lookup(self, value: str, entity_type: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Occurrences d'une valeur normalisée exacte (recherche dans l'index des valeurs)"""
+        if entity_type is None:
+            return self._rows('WHERE v.value = ?', (value,), limit)
+        return self._rows('WHERE v.value = ? AND v.type = ?', (value, entity_type), limit)
+
+    def lookup_prefix(self, prefix: str, entity_type: Optional[str] = None,
+                      limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """Occurrences des valeurs commençant par prefix (ex. '+3361', 'FR7630004')
+
+        Intervalle [prefix, prefix + U+10FFFF) sur l'index des valeurs (LIKE ne l'utilise pas:
+        il est insensible à la casse).
+        """
+        bounds = (prefix, prefix + '\U0010ffff')
+        if entity_type is None:
+            return self._rows('WHERE v.value >= ? AND v.value < ?', bounds, limit)
+        return self._rows('WHERE v.value >= ? AND v.value < ? AND v.type = ?', bounds + (entity_type,), limit)
+
+    def documents(self, value: str, entity_type: Optional[str] = None) -> List[str]:
+        """Documents distincts contenant une valeur"""
+        return sorted({row['document'] for row in self.lookup(value, entity_type)})
+
+    def stats(self) -> Dict[str, Any]:
+        count = lambda table: self._db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        by_type = dict(self._db.execute('SELECT type, COUNT(*) FROM entity_values GROUP BY type ORDER BY type'))
+        return {
+            'documents': count('documents'),
+            'values': count('entity_values'),
+            'occurrences': count('occurrences'),
+            'values_by_type': by_type,
+            'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def close(self):
+        self._db.close()
+
+def iter_results(path: str) -> Iterator[Tuple[str, Iterable[EntityRow]]]:
+    """(clé, entités) pour chaque ligne valide d'une sortie ner_corpus.py"""
+    source = os.path.abspath(path)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            key = result_key(result, source)
+            if key is None or 'error' in result:
+                continue
+            yield key, list(result_entities(result))
+
+def main():
+    parser = argparse.ArgumentParser(description="Index inversé persistant des entités FrenchNER")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="Indexe une sortie JSONL de ner_corpus.py (documents existants remplacés)")
+    add.add_argument('index', help="Fichier d'index SQLite (créé si absent)")
+    add.add_argument('results', nargs='+', help="Fichiers JSONL de résultats")
+
+    lookup = sub.add_parser('lookup', help="Recherche une valeur normalisée")
+    lookup.add_argument('index', help="Fichier d'index SQLite")
+    lookup.add_argument('value', help="Valeur normalisée (ex. 732829320, +33612345678, jean@acme.fr)")
+    lookup.add_argument('--prefix', action='store_true', help="Recherche par préfixe")
+    lookup.add_argument('--type', help="Type d'entité (siren, phone_fr, iban_fr, ...)")
+    lookup.add_argument('--limit', type=int, default=1000, help="Nombre maximal d'occurrences")
+
+    info = sub.add_parser('info', help="Statistiques de l'index")
+    info.add_argument('index', help="Fichier d'index SQLite")
+
+    args = parser.parse_args()
+    if args.command != 'add' and not os.path.isfile(args.index):
+        raise SystemExit(f"Index introuvable: {args.index}")
+    index = EntityIndex(args.index)
+    try:
+        if args.command == 'add':
+            total = sum(index.add_documents(iter_results(path)) for path in args.results)
+            print(f"[entity-index] {total} documents indexés dans {args.index}", file=sys.stderr)
+        elif args.command == 'lookup':
+            search = index.lookup_prefix if args.prefix else index.lookup
+            for row in search(args.value, args.type, limit=args.limit):
+                print(json.dumps(row, ensure_ascii=False))
+        else:
+            print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+    finally:
+        index.close()
+
+if __name__ == '__main__':
+    main()
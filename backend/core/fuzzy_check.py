@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - Fuzzy Check
+Contrôle de précision du mode approché (FuzzyMatcher) sur des phrases de référence
+
+Deux jeux de phrases: du français courant, proche des mots-clés par la distance
+d'édition ou par recollage de mots ("C'est tout à fait normal", "Il a pu te voir"), qui
+ne doit rien ajouter à la détection exacte; et des obfuscations (séparateurs insérés,
+homoglyphes, lettres isolées, fautes de frappe) qui doivent être détectées.
+
+Usage:
+    python3 backend/core/fuzzy_check.py            # code de sortie 1 en cas d'échec
+"""
+
+import sys
+import json
+from typing import Dict, List, Tuple
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .nlp_analyzer import NLPAnalyzer
+except ImportError:
+    from nlp_analyzer import NLPAnalyzer
+
+# Phrases ordinaires: aucun mot-clé de plus qu'en détection exacte
+SAFE_SENTENCES = [
+    "C'est tout à fait normal",
+    "Je vais créer un compte",
+    "Un film étrange",
+    "Il a pu te voir hier",
+    "Je n'ai pas pu te le dire",
+    "Je consulte mes mails ce matin",
+    "Le cheval galope dans le pré",
+    "Faire le ménage le dimanche",
+    "Je suis crevée après le travail",
+    "En 2017 on a pu te croiser",
+    "Peut-être demain, aujourd'hui il fait beau",
+    "Elle a pu te parler de la réunion",
+    "Le cœur a ses raisons",
+    "Ils se sont fait une place",
+]
+
+# Obfuscations: (texte, mot-clé attendu)
+OBFUSCATED: List[Tuple[str, str]] = [
+    ("t.u.e.r", 'tuer'),
+    ("t u e r", 'tuer'),
+    ("s a l o p e", 'salope'),
+    ("sаlope", 'salope'),          # 'а' cyrillique
+    ("sal.ope", 'salope'),
+    ("sal*ope", 'salope'),
+    ("p.u.t.e", 'pute'),
+    ("pu.te", 'pute'),
+    ("tap​ette", 'tapette'),  # espace de largeur nulle
+    ("harcelemment", 'harcèlement'),
+    ("sale rase", 'sale race'),
+    ("va cr.ever", 'crever'),
+]
+
+def self_check(analyzer: NLPAnalyzer, exact: NLPAnalyzer) -> Dict[str, List]:
+    """Échecs: phrases ordinaires signalées en plus par le mode approché, obfuscations manquées"""
+    false_positives = []
+    for text in SAFE_SENTENCES:
+        added = set(analyzer.analyze_content(text).keywords_detected) - set(exact.analyze_content(text).keywords_detected)
+        if added:
+            false_positives.append({'text': text, 'keywords': sorted(added)})
+    missed = []
+    for text, keyword in OBFUSCATED:
+        if keyword not in analyzer.analyze_content(text).keywords_detected:
+            missed.append({'text': text, 'keyword': keyword})
+    return {'false_positives': false_positives, 'missed': missed}
+
+def main():
+    report = self_check(NLPAnalyzer(fuzzy=True), NLPAnalyzer())
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if report['false_positives'] or report['missed']:
+        print("[fuzzy-check] ÉCHEC", file=sys.stderr)
+        sys.exit(1)
+    print(f"[fuzzy-check] {len(SAFE_SENTENCES)} phrases sûres, {len(OBFUSCATED)} obfuscations OK", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
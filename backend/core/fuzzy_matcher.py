@@ -0,0 +1,315 @@
+"""
+AURA OSINT - Fuzzy Matcher
+Détection tolérante aux obfuscations: homoglyphes, séparateurs insérés, fautes de frappe
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Set, Tuple, Union
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .keyword_automaton import KeywordMatch
+except ImportError:
+    from keyword_automaton import KeywordMatch
+
+# Homoglyphes (cyrillique, grec) et substitutions courantes → lettre latine
+HOMOGLYPHS = {
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p',
+    'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'і': 'i', 'ї': 'i', 'ј': 'j', 'ԁ': 'd',
+    'ɡ': 'g', 'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'ν': 'v', 'ο': 'o',
+    'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+    '@': 'a', '$': 's', '€': 'e', '£': 'l', '7': 't', '8': 'b', '9': 'g',
+    'œ': 'oe', 'æ': 'ae', 'ß': 'ss',
+}
+
+# Remplacés par 'i' seulement entre deux lettres (sinon ponctuation: "tuer!")
+CONTEXT_I = frozenset('!|¡')
+
+# Caractères invisibles insérés pour casser les mots-clés
+INVISIBLE = frozenset('­​‌‍⁠﻿')
+
+# Ligatures usuelles du français ('cœur'): repliées mais pas un signe d'obfuscation
+LIGATURES = frozenset('œæß')
+
+# Séparateurs ordinaires à l'intérieur d'un mot ('peut-être', "aujourd'hui"): pas un signe d'obfuscation
+WORD_JOINERS = frozenset("-'’")
+
+# Distance d'édition tolérée selon la longueur (mots courts: correspondance exacte uniquement)
+DEFAULT_DISTANCES = ((10, 2), (6, 1), (0, 0))
+
+# Règles de validation des occurrences (version incluse dans celle des résultats)
+MATCH_RULES_VERSION = 2
+
+# Mots courants (forme repliée): une occurrence approchée sur un seul de ces mots est un
+# mot ordinaire, pas un mot-clé déformé ('normal' / anormal, 'consulte' / insulte)
+COMMON_WORDS = frozenset('''
+a ai as au aux avec avez avoir avons c ca car ce ces cet cette chez d dans de des dire dit donc du elle elles en
+entre es est et etre etes eu fait faire il ils j je l la le les leur lui m ma mais me mes moi mon n ne ni nos
+notre nous on ont ou par pas peu peut plus pour pu qu que qui s sa sans se ses si son sont sous suis sur t ta
+te tes toi ton tous tout toute toutes tres tu un une vers voir vos votre vous y
+normal normale normales normaux anormalement creer cree creee crees creez creent etrange etranges etrangement
+retour retours retourner retournez retournes retournent retournons menage menages menager consulte consultes
+consulter galope galoper galopes crevee creves
+'''.split())
+
+_fold_cache: Dict[str, str] = {}
+
+def fold_char(ch: str) -> str:
+    """Forme repliée d'un caractère: homoglyphes, compatibilité Unicode, sans accents"""
+    folded = _fold_cache.get(ch)
+    if folded is None:
+        if ch in INVISIBLE:
+            folded = ''
+        else:
+            decomposed = unicodedata.normalize('NFKD', HOMOGLYPHS.get(ch, ch))
+            folded = ''.join(HOMOGLYPHS.get(c, c) for c in decomposed if not unicodedata.combining(c)).lower()
+        _fold_cache[ch] = folded
+    return folded
+
+def fold_keyword(keyword: str) -> str:
+    """Forme compacte d'un mot-clé: replié, sans séparateurs ('sale race' → 'salerace')"""
+    return ''.join(c for c in ''.join(fold_char(ch) for ch in keyword) if c.isalnum())
+
+def _deletions(word: str, max_dist: int) -> Set[str]:
+    """word et toutes ses variantes obtenues par au plus max_dist suppressions"""
+    variants = {word}
+    frontier = [word]
+    for _ in range(max_dist):
+        following = []
+        for current in frontier:
+            for i in range(len(current)):
+                variant = current[:i] + current[i + 1:]
+                if variant not in variants:
+                    variants.add(variant)
+                    following.append(variant)
+        frontier = following
+    return variants
+
+def _bounded_distance(a: str, b: str, limit: int) -> int:
+    """Distance de Damerau-Levenshtein restreinte, limit + 1 dès qu'elle dépasse limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def _is_substitution(ch: str) -> bool:
+    """Caractère remplaçant une lettre pour masquer un mot (homoglyphe, forme de compatibilité)"""
+    if ch in LIGATURES:
+        return False
+    return ch in HOMOGLYPHS or ch in CONTEXT_I or unicodedata.normalize('NFKC', ch) != ch
+
+def _joins(text: str, tokens: List['Token'], start: int) -> bool:
+    """Le jeton commençant à start est-il collé au précédent par un séparateur inséré ('sal.ope')?"""
+    if not tokens:
+        return False
+    gap = text[tokens[-1].end:start]
+    return (bool(gap) and not any(c.isspace() for c in gap)
+            and not all(c in WORD_JOINERS or c in INVISIBLE for c in gap))
+
+class Token(NamedTuple):
+    """Jeton replié: forme, positions dans le texte et signes d'obfuscation"""
+    form: str
+    start: int
+    end: int
+    substituted: bool  # homoglyphe, caractère de compatibilité ou invisible dans le jeton
+    joined: bool       # collé au jeton précédent par un séparateur qui n'est pas une espace
+
+@dataclass
+class FuzzyMatch(KeywordMatch):
+    """Occurrence approchée: forme rencontrée et distance d'édition au mot-clé canonique"""
+    matched: str = ''
+    distance: int = 0
+
+class FuzzyMatcher:
+    """Recherche approchée des mots-clés du lexique, par index de suppressions symétriques
+
+    Le texte est replié (homoglyphes, accents, caractères invisibles) puis découpé en
+    jetons; chaque fenêtre de jetons consécutifs recollés est comparée aux mots-clés
+    compactés. L'index associe à chaque mot-clé ses variantes à k suppressions près
+    (k = distance tolérée pour sa longueur): deux chaînes à distance <= k partagent une
+    variante, la requête ne génère donc que ses propres suppressions puis vérifie les
+    candidats (distance de Damerau restreinte bornée). Le coût par jeton ne dépend pas
+    de la taille du lexique et le temps reste linéaire en la longueur du texte. Les
+    résultats par fenêtre sont mis en cache (le vocabulaire des commentaires se répète).
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, str]], distances: Sequence[Tuple[int, int]] = DEFAULT_DISTANCES,
+                 max_window: int = 4, cache_size: int = 100000):
+        self.entries = entries
+        self.distances = tuple(distances)
+        self.cache_size = cache_size
+        self._cache: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+
+        # Variante → identifiant d'entrée (int) ou tuple d'identifiants si plusieurs
+        self._index: Dict[str, Union[int, Tuple[int, ...]]] = {}
+        self._compact: List[str] = []
+        self._budget: List[int] = []
+        longest = 0
+        max_tokens = 1
+        index = self._index
+        for entry_id, (keyword, _) in enumerate(entries):
+            compact = fold_keyword(keyword)
+            budget = self.max_distance(len(compact))
+            self._compact.append(compact)
+            self._budget.append(budget)
+            if not compact:
+                continue
+            longest = max(longest, len(compact))
+            max_tokens = max(max_tokens, len(keyword.split()))
+            for variant in _deletions(compact, budget):
+                current = index.get(variant)
+                if current is None:
+                    index[variant] = entry_id
+                elif isinstance(current, int):
+                    index[variant] = (current, entry_id)
+                else:
+                    index[variant] = current + (entry_id,)
+        self._words = [len(keyword.split()) for keyword, _ in entries]
+        self.longest = longest
+        # Une fenêtre de plus que le mot-clé le plus long en mots: un mot coupé en deux ('sa le')
+        self.max_window = min(max_tokens + 1, max_window)
+
+    def max_distance(self, length: int) -> int:
+        for min_length, distance in self.distances:
+            if length >= min_length:
+                return distance
+        return 0
+
+    def _tokens(self, text: str) -> List['Token']:
+        """Jetons repliés avec positions dans text et signes d'obfuscation"""
+        tokens: List[Token] = []
+        chars: List[str] = []
+        start = end = 0
+        substituted = letters = False
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            folded = fold_char(ch)
+            if ch in CONTEXT_I and 0 < i < last and text[i - 1].isalpha() and text[i + 1].isalpha():
+                folded = 'i'
+            if folded == '':
+                # Caractère invisible inséré dans un mot
+                substituted = substituted or bool(chars)
+                continue
+            if folded.isalnum():
+                if not chars:
+                    start = i
+                chars.append(folded)
+                end = i + 1
+                letters = letters or ch.isalpha()
+                if folded != ch and _is_substitution(ch):
+                    substituted = True
+            elif chars:
+                # Chiffres seuls ('2017'): un nombre, pas un mot masqué
+                tokens.append(Token(''.join(chars), start, end, substituted and letters,
+                                    _joins(text, tokens, start)))
+                chars = []
+                substituted = letters = False
+        if chars:
+            tokens.append(Token(''.join(chars), start, end, substituted and letters, _joins(text, tokens, start)))
+
+        # Lettres isolées consécutives recollées ('t u e r', 't.u.e.r'): obfuscation
+        merged: List[Token] = []
+        i = 0
+        while i < len(tokens):
+            j = i
+            while j < len(tokens) and len(tokens[j].form) == 1:
+                j += 1
+            if j - i >= 3:
+                merged.append(Token(''.join(t.form for t in tokens[i:j]), tokens[i].start, tokens[j - 1].end,
+                                    True, tokens[i].joined))
+                i = j
+            else:
+                merged.append(tokens[i])
+                i += 1
+        return merged
+
+    def lookup(self, query: str) -> Tuple[Tuple[int, int], ...]:
+        """Entrées à distance tolérée de query (forme compacte): ((entry_id, distance), ...)"""
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+        max_dist = self.max_distance(len(query))
+        index, compact, budget = self._index, self._compact, self._budget
+        candidates = set()
+        for variant in _deletions(query, max_dist):
+            hit = index.get(variant)
+            if hit is None:
+                continue
+            if isinstance(hit, int):
+                candidates.add(hit)
+            else:
+                candidates.update(hit)
+        found = []
+        for entry_id in sorted(candidates):
+            limit = min(max_dist, budget[entry_id])
+            keyword = compact[entry_id]
+            distance = 0 if keyword == query else _bounded_distance(query, keyword, limit)
+            if distance <= limit:
+                found.append((entry_id, distance))
+        found = tuple(found)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[query] = found
+        return found
+
+    def _hits(self, tokens: List['Token']) -> Iterator[Tuple[int, int, int, int]]:
+        """(premier jeton, dernier jeton, entry_id, distance) pour chaque fenêtre reconnue
+
+        Des jetons ne sont recollés que sur un signe d'obfuscation (séparateur inséré dans
+        le mot, homoglyphe, lettres isolées); sinon seulement pour un mot-clé d'autant de
+        mots ('sale rase'). Sont écartées les occurrences approchées qui ne font que
+        retirer des lettres au bord du mot-clé ('normal' / anormal, 'étrange' / étranger)
+        et celles qui portent sur un seul mot courant.
+        """
+        limit = self.longest + self.max_distance(self.longest)
+        compact, words = self._compact, self._words
+        for i in range(len(tokens)):
+            query = ''
+            signal = False
+            for j in range(i, min(i + self.max_window, len(tokens))):
+                token = tokens[j]
+                query += token.form
+                if len(query) > limit:
+                    break
+                signal = signal or token.substituted or (j > i and token.joined)
+                for entry_id, distance in self.lookup(query):
+                    if j > i and not signal and words[entry_id] != j - i + 1:
+                        continue
+                    if distance:
+                        if query in compact[entry_id]:
+                            continue
+                        if j == i and not token.substituted and token.form in COMMON_WORDS:
+                            continue
+                    yield i, j, entry_id, distance
+
+    def find_all(self, text: str) -> List[FuzzyMatch]:
+        """Occurrences approchées dans text (positions dans text), triées par position"""
+        tokens = self._tokens(text)
+        entries = self.entries
+        seen = set()
+        matches: List[FuzzyMatch] = []
+        for i, j, entry_id, distance in self._hits(tokens):
+            start, end = tokens[i].start, tokens[j].end
+            if (entry_id, start) in seen:
+                continue
+            seen.add((entry_id, start))
+            keyword, category = entries[entry_id]
+            matches.append(FuzzyMatch(keyword=keyword, category=category, start=start, end=end,
+                                      matched=text[start:end], distance=distance))
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+    def found_entries(self, text: str) -> List[int]:
+        """Identifiants distincts des entrées trouvées, dans l'ordre du lexique"""
+        return sorted({entry_id for _, _, entry_id, _ in self._hits(self._tokens(text))})
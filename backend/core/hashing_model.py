@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - Hashing Model
+Mode rapide de NLPAnalyzer: n-grammes hachés (caractères et mots) + modèle linéaire
+
+Les textes d'un lot sont vectorisés et scorés ensemble par opérations matricielles
+NumPy; sans NumPy, un repli en Python pur produit les mêmes caractéristiques.
+Les poids sont lus par mmap dans un fichier local (format AURAMDL).
+
+Usage:
+    python3 backend/core/hashing_model.py train exemples.jsonl -o hate.auramodel
+    python3 backend/core/hashing_model.py info hate.auramodel
+
+Exemples d'entraînement: {"text": "...", "labels": ["racism", "violence"]} (labels vide = sûr)
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import zlib
+import random
+import struct
+import hashlib
+import argparse
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: repli en Python pur
+    np = None
+
+MAGIC = b'AURAMDL\0'
+FORMAT_VERSION = 1
+
+# magic, version du format, taille des métadonnées JSON
+HEADER = struct.Struct('<8sII')
+
+MASK32 = 0xFFFFFFFF
+POLY = 0x01000193         # multiplicateur du hachage polynomial des n-grammes de caractères
+CHAR_SALT = 0x9E3779B9    # séparation des domaines caractères / mots
+WORD_SALT = 0x5BD1E995
+
+WORD_RE = re.compile(r'\w+')
+
+def _fmix32(h: int) -> int:
+    """Finaliseur murmur3 (mélange des bits avant réduction modulo n_features)"""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & MASK32
+    return h ^ (h >> 16)
+
+def _fmix32_np(h):
+    h = h ^ (h >> 16)
+    h = (h * 0x85EBCA6B) & MASK32
+    h = h ^ (h >> 13)
+    h = (h * 0xC2B2AE35) & MASK32
+    return h ^ (h >> 16)
+
+class HashingVectorizer:
+    """N-grammes de caractères et de mots hachés dans n_features colonnes (signe haché)"""
+
+    def __init__(self, n_features: int = 1 << 18, char_ngrams: Tuple[int, int] = (3, 5),
+                 word_ngrams: Tuple[int, int] = (1, 2)):
+        if n_features <= 0 or n_features & (n_features - 1) or n_features > 1 << 24:
+            raise ValueError("n_features must be a power of two <= 2**24")
+        self.n_features = n_features
+        self.char_ngrams = tuple(char_ngrams)
+        self.word_ngrams = tuple(word_ngrams)
+
+    def config(self) -> Dict[str, Any]:
+        return {'n_features': self.n_features, 'char_ngrams': list(self.char_ngrams),
+                'word_ngrams': list(self.word_ngrams)}
+
+    def _word_hashes(self, text: str) -> List[int]:
+        tokens = WORD_RE.findall(text)
+        lo, hi = self.word_ngrams
+        hashes = []
+        for n in range(lo, hi + 1):
+            for i in range(len(tokens) - n + 1):
+                hashes.append(zlib.crc32(' '.join(tokens[i:i + n]).encode('utf-8'), n) ^ WORD_SALT)
+        return hashes
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Vecteur creux normalisé L2 d'un texte (déjà normalisé): {colonne: valeur}"""
+        mask = self.n_features - 1
+        lo, hi = self.char_ngrams
+        counts: Dict[int, float] = {}
+
+        def add(f: int):
+            index = f & mask
+            counts[index] = counts.get(index, 0.0) + (-1.0 if f & 0x80000000 else 1.0)
+
+        codes = [ord(ch) for ch in f' {text} ']
+        hashes = codes
+        for n in range(1, hi + 1):
+            if n > 1:
+                hashes = [(hashes[i] * POLY + codes[i + n - 1]) & MASK32 for i in range(len(hashes) - 1)]
+            if n >= lo:
+                salt = n * CHAR_SALT
+                for h in hashes:
+                    add(_fmix32((h + salt) & MASK32))
+        for h in self._word_hashes(text):
+            add(_fmix32(h))
+
+        norm = math.sqrt(sum(v * v for v in counts.values()))
+        if not norm:
+            return {}
+        return {index: v / norm for index, v in counts.items() if v}
+
+    def transform(self, texts: Sequence[str]):
+        """Matrice creuse d'un lot (NumPy requis): (lignes, colonnes, valeurs), triée par ligne"""
+        lo, hi = self.char_ngrams
+        padded = [f' {text} ' for text in texts]
+        lengths = np.fromiter((len(p) for p in padded), dtype=np.int64, count=len(padded))
+        ends = np.cumsum(lengths)
+        codes = np.frombuffer(''.join(padded).encode('utf-32-le'), dtype='<u4').astype(np.uint64)
+        doc_ids = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        positions = np.arange(len(codes), dtype=np.int64)
+
+        rows, hashed = [], []
+        hashes = codes
+        for n in range(1, hi + 1):
+            if n > 1:
+                hashes = (hashes[:-1] * POLY + codes[n - 1:]) & MASK32
+            if n >= lo:
+                # Les n-grammes à cheval sur deux textes du lot sont écartés
+                docs = doc_ids[:len(hashes)]
+                valid = positions[:len(hashes)] + n <= ends[docs]
+                rows.append(docs[valid])
+                hashed.append(_fmix32_np((hashes[valid] + n * CHAR_SALT) & MASK32))
+
+        word_rows, word_hashes = [], []
+        for row, text in enumerate(texts):
+            hashes_w = self._word_hashes(text)
+            word_rows.extend([row] * len(hashes_w))
+            word_hashes.extend(hashes_w)
+        rows.append(np.asarray(word_rows, dtype=np.int64))
+        hashed.append(_fmix32_np(np.asarray(word_hashes, dtype=np.uint64)))
+
+        rows = np.concatenate(rows)
+        hashed = np.concatenate(hashed)
+        signs = np.where(hashed & 0x80000000, -1.0, 1.0)
+        keys = rows * self.n_features + (hashed & (self.n_features - 1)).astype(np.int64)
+
+        # Agrégation des doublons (ligne, colonne) puis normalisation L2 par ligne
+        keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=signs)
+        keep = values != 0
+        keys, values = keys[keep], values[keep]
+        rows, cols = keys // self.n_features, keys % self.n_features
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        return rows, cols, values / norms[rows]
+
+class LinearTextModel:
+    """Modèle linéaire une-catégorie-contre-toutes (sigmoïde) sur caractéristiques hachées"""
+
+    def __init__(self, vectorizer: HashingVectorizer, categories: List[str], weights, bias,
+                 threshold: float = 0.5, version: str = '', meta: Optional[Dict[str, Any]] = None):
+        self.vectorizer = vectorizer
+        self.categories = categories
+        self.weights = weights  # n_features x n_categories, ligne par ligne
+        self.bias = bias
+        self.threshold = threshold
+        self.version = version
+        self.meta = meta or {}
+        self._mmap = None
+
+    @classmethod
+    def load(cls, path: str) -> 'LinearTextModel':
+        """Ouvre un fichier AURAMDL par projection mémoire"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an AURA model file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported model format version {version}")
+        meta = json.loads(mapped[HEADER.size:HEADER.size + meta_len].decode('utf-8'))
+
+        vectorizer = HashingVectorizer(meta['n_features'], tuple(meta['char_ngrams']), tuple(meta['word_ngrams']))
+        n_weights = meta['n_features'] * len(meta['categories'])
+        offset = (HEADER.size + meta_len + 7) & ~7
+        if np is not None:
+            weights = np.frombuffer(mapped, dtype='<f4', count=n_weights, offset=offset)
+            weights = weights.reshape(meta['n_features'], len(meta['categories']))
+            bias = np.frombuffer(mapped, dtype='<f4', count=len(meta['categories']), offset=offset + 4 * n_weights)
+        else:
+            view = memoryview(mapped)
+            weights = view[offset:offset + 4 * n_weights].cast('f')
+            bias = view[offset + 4 * n_weights:offset + 4 * (n_weights + len(meta['categories']))].cast('f')
+
+        model = cls(vectorizer, meta['categories'], weights, bias, meta.get('threshold', 0.5), meta['version'], meta)
+        model._mmap = mapped
+        return model
+
+    def predict_proba(self, texts: Sequence[str]) -> List[List[float]]:
+        """Probabilité de chaque catégorie pour chaque texte (déjà normalisé)"""
+        if not texts:
+            return []
+        if np is not None:
+            return self._predict_np(texts).tolist()
+        return [self._predict_one(text) for text in texts]
+
+    def _predict_np(self, texts: Sequence[str]):
+        rows, cols, values = self.vectorizer.transform(texts)
+        scores = np.zeros((len(texts), len(self.categories)))
+        if len(rows):
+            contrib = self.weights[cols] * values[:, None]
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            scores[rows[starts]] = np.add.reduceat(contrib, starts, axis=0)
+        return 1.0 / (1.0 + np.exp(-(scores + self.bias)))
+
+    def _predict_one(self, text: str) -> List[float]:
+        weights = self.weights
+        n = len(self.categories)
+        scores = [float(b) for b in self.bias]
+        for index, value in self.vectorizer.features(text).items():
+            base = index * n
+            for c in range(n):
+                scores[c] += weights[base + c] * value
+        return [1.0 / (1.0 + math.exp(-s)) for s in scores]
+
+    def close(self):
+        self.weights = self.bias = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+def write_model(path: str, vectorizer: HashingVectorizer, categories: List[str], weights: Sequence[float],
+                bias: Sequence[float], threshold: float = 0.5, source: Optional[str] = None) -> str:
+    """Écrit un modèle au format AURAMDL, retourne sa version"""
+    weights_bytes = array('f', weights).tobytes()
+    bias_bytes = array('f', bias).tobytes()
+    if sys.byteorder != 'little':
+        raise SystemExit("Le format AURAMDL est little-endian")
+    config = {**vectorizer.config(), 'categories': categories, 'threshold': threshold}
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8'))
+    digest.update(weights_bytes)
+    digest.update(bias_bytes)
+    version = digest.hexdigest()[:12]
+
+    meta = json.dumps({**config, 'version': version, 'source': source}, ensure_ascii=False).encode('utf-8')
+    offset = (HEADER.size + len(meta) + 7) & ~7
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        f.write(b'\0' * (offset - f.tell()))
+        f.write(weights_bytes)
+        f.write(bias_bytes)
+    os.replace(tmp, path)
+    return version
+
+def train(examples: Iterable[Tuple[str, Sequence[str]]], categories: List[str], vectorizer: HashingVectorizer,
+          epochs: int = 5, learning_rate: float = 0.5, seed: int = 0) -> Tuple[List[float], List[float]]:
+    """Régression logistique par SGD (une catégorie contre toutes), en Python pur"""
+    n = len(categories)
+    data = [(vectorizer.features(text), [1.0 if cat in labels else 0.0 for cat in categories])
+            for text, labels in examples]
+    weights = [0.0] * (vectorizer.n_features * n)
+    bias = [0.0] * n
+    rng = random.Random(seed)
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        rate = learning_rate / (1 + epoch)
+        for features, targets in data:
+            for c in range(n):
+                score = bias[c] + sum(weights[i * n + c] * v for i, v in features.items())
+                score = max(min(score, 30.0), -30.0)
+                gradient = 1.0 / (1.0 + math.exp(-score)) - targets[c]
+                if gradient:
+                    step = rate * gradient
+                    bias[c] -= step
+                    for i, v in features.items():
+                        weights[i * n + c] -= step * v
+    return weights, bias
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement / inspection des modèles rapides NLP AURA")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    fit = sub.add_parser('train', help="Entraîne un modèle sur des exemples JSONL annotés")
+    fit.add_argument('examples', help="JSONL: {\"text\": ..., \"labels\": [...]}")
+    fit.add_argument('-o', '--output', required=True, help="Fichier modèle à écrire")
+    fit.add_argument('--text-field', default='text')
+    fit.add_argument('--labels-field', default='labels')
+    fit.add_argument('--category', action='append', help="Catégorie à apprendre (répétable, défaut: labels vus)")
+    fit.add_argument('--n-features', type=int, default=1 << 18)
+    fit.add_argument('--epochs', type=int, default=5)
+    fit.add_argument('--learning-rate', type=float, default=0.5)
+    fit.add_argument('--threshold', type=float, default=0.5, help="Probabilité minimale d'une catégorie détectée")
+
+    info = sub.add_parser('info', help="Affiche les métadonnées d'un modèle")
+    info.add_argument('model', help="Fichier modèle")
+
+    args = parser.parse_args()
+    if args.command == 'info':
+        model = LinearTextModel.load(args.model)
+        print(json.dumps({**model.meta, 'size_bytes': os.path.getsize(args.model),
+                          'numpy': np is not None}, ensure_ascii=False, indent=2))
+        model.close()
+        return
+
+    # Même normalisation que l'analyse (import différé: nlp_analyzer importe ce module)
+    try:
+        from .nlp_analyzer import NLPAnalyzer
+    except ImportError:
+        from nlp_analyzer import NLPAnalyzer
+    normalize = NLPAnalyzer()._normalize_text
+
+    examples = []
+    with open(args.examples, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((normalize(record.get(args.text_field) or ''), record.get(args.labels_field) or []))
+    categories = args.category or sorted({cat for _, labels in examples for cat in labels})
+    vectorizer = HashingVectorizer(args.n_features)
+    weights, bias = train(examples, categories, vectorizer, args.epochs, args.learning_rate)
+    version = write_model(args.output, vectorizer, categories, weights, bias, args.threshold,
+                          source=os.path.basename(args.examples))
+    print(f"[model] {args.output}: {len(examples)} exemples, {len(categories)} catégories, version {version}")
+
+if __name__ == '__main__':
+    main()
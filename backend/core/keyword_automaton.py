@@ -0,0 +1,132 @@
+"""
+AURA OSINT - Keyword Automaton
+Automate Aho-Corasick multi-motifs pour le lexique de haine
+"""
+
+from typing import Dict, Iterable, List, Tuple
+from dataclasses import dataclass
+
+@dataclass
+class KeywordMatch:
+    """Occurrence d'un mot-clé dans le texte normalisé"""
+    keyword: str
+    category: str
+    start: int
+    end: int
+
+class KeywordAutomaton:
+    """Automate Aho-Corasick construit une seule fois à partir d'un lexique
+
+    Un seul parcours linéaire du texte trouve toutes les occurrences de tous les
+    mots-clés (y compris chevauchantes), quelle que soit la taille du lexique.
+    """
+
+    def __init__(self, lexicon: Dict[str, Iterable[str]]):
+        self.categories: List[str] = list(lexicon.keys())
+        # (mot-clé, catégorie) dans l'ordre du lexique
+        self.entries: List[Tuple[str, str]] = []
+        # Indice de catégorie (dans self.categories) de chaque entrée
+        self.entry_category_ids: List[int] = []
+        for category_id, (category, keywords) in enumerate(lexicon.items()):
+            for keyword in keywords:
+                if keyword:
+                    self.entries.append((keyword, category))
+                    self.entry_category_ids.append(category_id)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        """Construit le trie, les liens d'échec et les sorties"""
+        goto, out = self._goto, [[]]
+
+        for entry_id, (keyword, _) in enumerate(self.entries):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(entry_id)
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def export_tables(self) -> Dict[str, List[int]]:
+        """Tables plates de l'automate (transitions triées par caractère), pour sérialisation"""
+        state_trans, trans_char, trans_next = [0], [], []
+        out_offsets, out_entries = [0], []
+        for state, transitions in enumerate(self._goto):
+            for ch, nxt in sorted(transitions.items()):
+                trans_char.append(ord(ch))
+                trans_next.append(nxt)
+            state_trans.append(len(trans_char))
+            out_entries.extend(self._out[state])
+            out_offsets.append(len(out_entries))
+        return {
+            'state_trans': state_trans,
+            'trans_char': trans_char,
+            'trans_next': trans_next,
+            'fail': list(self._fail),
+            'out_offsets': out_offsets,
+            'out_entries': out_entries,
+        }
+
+    def scan_from(self, text: str, state: int = 0, offset: int = 0) -> Tuple[List[Tuple[int, int, int]], int]:
+        """Parcourt text depuis l'état state; retourne ([(entry_id, start, end)], état final)
+
+        Les positions sont décalées de offset. En réinjectant l'état final au segment suivant,
+        un flux découpé en morceaux donne les mêmes occurrences que le texte entier
+        (les occurrences à cheval ont alors un start antérieur au segment).
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        entries = self.entries
+        matches = []
+        for i, ch in enumerate(text, offset + 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for entry_id in out[state]:
+                    matches.append((entry_id, i - len(entries[entry_id][0]), i))
+        return matches, state
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Génère (entry_id, start, end) pour chaque occurrence, en un seul parcours"""
+        return iter(self.scan_from(text)[0])
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Retourne toutes les occurrences triées par position"""
+        entries = self.entries
+        matches = [
+            KeywordMatch(keyword=entries[eid][0], category=entries[eid][1], start=start, end=end)
+            for eid, start, end in self.iter_matches(text)
+        ]
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+    def found_entries(self, text: str) -> List[int]:
+        """Retourne les identifiants distincts des entrées trouvées, dans l'ordre du lexique"""
+        seen = set()
+        for eid, _, _ in self.iter_matches(text):
+            seen.add(eid)
+        return sorted(seen)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - Lexicon Store
+Format binaire versionné du lexique de haine (automate précompilé), chargé par mmap
+
+Le fichier contient l'automate Aho-Corasick déjà construit, les identifiants de
+catégorie et les poids. Les tables sont lues directement dans la projection mémoire:
+le chargement est quasi instantané et les pages sont partagées entre processus.
+
+Usage:
+    python3 backend/core/lexicon_store.py build lexique.csv -o hate.auralex
+    python3 backend/core/lexicon_store.py build lexique.yaml -o hate.auralex
+    python3 backend/core/lexicon_store.py info hate.auralex
+
+CSV: colonnes category,keyword[,weight][,label] (weight/label: première valeur non vide par catégorie)
+YAML: {categories: {racism: {weight: 0.9, label: racisme, keywords: [...]}}}
+"""
+
+import os
+import sys
+import csv
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # YAML optionnel: seul le CSV est alors accepté
+    yaml = None
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .keyword_automaton import KeywordAutomaton
+except ImportError:
+    from keyword_automaton import KeywordAutomaton
+
+MAGIC = b'AURALEX\0'
+FORMAT_VERSION = 1
+
+# Sections (tables u32 sauf meta/kw_blob), dans l'ordre d'écriture
+SECTIONS = (
+    'meta', 'kw_offsets', 'kw_blob', 'kw_len', 'kw_category',
+    'state_trans', 'trans_char', 'trans_next', 'fail', 'out_offsets', 'out_entries',
+)
+
+# magic, version, ordre des octets, nombre de sections, puis (offset, taille) par section
+HEADER = struct.Struct('<8sIBxxxI')
+SECTION_ENTRY = struct.Struct('<QQ')
+
+def lexicon_version(hate_keywords: Dict[str, List[str]], severity_weights: Dict[str, float]) -> str:
+    """Version du lexique: empreinte stable du contenu (mots-clés + poids)"""
+    fingerprint = json.dumps([hate_keywords, severity_weights], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+
+def write_lexicon(path: str, hate_keywords: Dict[str, List[str]], severity_weights: Dict[str, float],
+                  labels: Optional[Dict[str, str]] = None, source: Optional[str] = None) -> str:
+    """Compile le lexique et l'écrit au format binaire, retourne la version"""
+    automaton = KeywordAutomaton(hate_keywords)
+    categories = automaton.categories
+    category_ids = {cat: i for i, cat in enumerate(categories)}
+    version = lexicon_version(hate_keywords, severity_weights)
+
+    meta = {
+        'version': version,
+        'categories': categories,
+        'weights': {cat: severity_weights.get(cat, 0.5) for cat in categories},
+        'labels': labels or {},
+        'entries': len(automaton.entries),
+        'source': source,
+    }
+
+    kw_blob = bytearray()
+    kw_offsets, kw_len, kw_category = array('I', [0]), array('I'), array('I')
+    for keyword, category in automaton.entries:
+        kw_blob += keyword.encode('utf-8')
+        kw_offsets.append(len(kw_blob))
+        kw_len.append(len(keyword))
+        kw_category.append(category_ids[category])
+
+    payloads = {
+        'meta': json.dumps(meta, ensure_ascii=False).encode('utf-8'),
+        'kw_offsets': kw_offsets.tobytes(),
+        'kw_blob': bytes(kw_blob),
+        'kw_len': kw_len.tobytes(),
+        'kw_category': kw_category.tobytes(),
+    }
+    for name, values in automaton.export_tables().items():
+        payloads[name] = array('I', values).tobytes()
+
+    # Sections alignées sur 8 octets pour des vues memoryview.cast('I') valides
+    offset = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    table = []
+    for name in SECTIONS:
+        offset = (offset + 7) & ~7
+        table.append((offset, len(payloads[name])))
+        offset += len(payloads[name])
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0 if sys.byteorder == 'little' else 1, len(SECTIONS)))
+        for entry in table:
+            f.write(SECTION_ENTRY.pack(*entry))
+        for name, (start, _) in zip(SECTIONS, table):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp, path)
+    return version
+
+class _MappedEntries:
+    """Séquence paresseuse (mot-clé, catégorie) lue dans la projection mémoire"""
+
+    def __init__(self, blob: memoryview, offsets: memoryview, category_ids: memoryview, categories: List[str]):
+        self._blob = blob
+        self._offsets = offsets
+        self._category_ids = category_ids
+        self._categories = categories
+
+    def __len__(self) -> int:
+        return len(self._category_ids)
+
+    def __getitem__(self, entry_id: int) -> Tuple[str, str]:
+        keyword = bytes(self._blob[self._offsets[entry_id]:self._offsets[entry_id + 1]]).decode('utf-8')
+        return keyword, self._categories[self._category_ids[entry_id]]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for entry_id in range(len(self)):
+            yield self[entry_id]
+
+class MappedAutomaton(KeywordAutomaton):
+    """Automate Aho-Corasick servi directement depuis les tables projetées en mémoire"""
+
+    def __init__(self, tables: Dict[str, memoryview], categories: List[str]):
+        self.categories = categories
+        self.entries = _MappedEntries(tables['kw_blob'], tables['kw_offsets'], tables['kw_category'], categories)
+        self.entry_category_ids = tables['kw_category']
+        self._tables = tables
+        # Transitions de la racine en dict: c'est l'état le plus visité
+        lo, hi = tables['state_trans'][0], tables['state_trans'][1]
+        self._root = {chr(tables['trans_char'][j]): tables['trans_next'][j] for j in range(lo, hi)}
+
+    def scan_from(self, text: str, state: int = 0, offset: int = 0) -> Tuple[List[Tuple[int, int, int]], int]:
+        t = self._tables
+        state_trans, trans_char, trans_next = t['state_trans'], t['trans_char'], t['trans_next']
+        fail, out_offsets, out_entries, kw_len = t['fail'], t['out_offsets'], t['out_entries'], t['kw_len']
+        root = self._root
+        matches = []
+        for i, ch in enumerate(text, offset + 1):
+            code = ord(ch)
+            while state:
+                lo, hi = state_trans[state], state_trans[state + 1]
+                j = bisect_left(trans_char, code, lo, hi)
+                if j < hi and trans_char[j] == code:
+                    state = trans_next[j]
+                    break
+                state = fail[state]
+            else:
+                state = root.get(ch, 0)
+            a, b = out_offsets[state], out_offsets[state + 1]
+            if a != b:
+                for k in range(a, b):
+                    entry_id = out_entries[k]
+                    matches.append((entry_id, i - kw_len[entry_id], i))
+        return matches, state
+
+class MappedLexicon:
+    """Lexique binaire ouvert en mmap (lecture seule, partagé entre processus)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, byteorder, n_sections = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an AURA lexicon file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported lexicon format version {version}")
+        if byteorder != (0 if sys.byteorder == 'little' else 1):
+            raise ValueError(f"{path}: lexicon was built on a machine with a different byte order")
+        if n_sections != len(SECTIONS):
+            raise ValueError(f"{path}: corrupted section table")
+
+        self._tables: Dict[str, memoryview] = {}
+        for i, name in enumerate(SECTIONS):
+            start, size = SECTION_ENTRY.unpack_from(view, HEADER.size + i * SECTION_ENTRY.size)
+            section = view[start:start + size]
+            self._tables[name] = section if name in ('meta', 'kw_blob') else section.cast('I')
+
+        self.meta: Dict[str, Any] = json.loads(bytes(self._tables['meta']).decode('utf-8'))
+        self.version: str = self.meta['version']
+        self.categories: List[str] = self.meta['categories']
+        self.weights: Dict[str, float] = self.meta['weights']
+        self.labels: Dict[str, str] = self.meta.get('labels') or {}
+        self.automaton = MappedAutomaton(self._tables, self.categories)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Matérialise le lexique en dict catégorie → mots-clés (coûteux sur un gros lexique)"""
+        lexicon: Dict[str, List[str]] = {cat: [] for cat in self.categories}
+        for keyword, category in self.automaton.entries:
+            lexicon[category].append(keyword)
+        return lexicon
+
+    def close(self):
+        self.automaton = None
+        self._tables.clear()
+        self._mmap.close()
+
+def load_source(path: str) -> Tuple[Dict[str, List[str]], Dict[str, float], Dict[str, str]]:
+    """Lit un lexique source CSV ou YAML → (mots-clés, poids, libellés)"""
+    hate_keywords: Dict[str, List[str]] = {}
+    weights: Dict[str, float] = {}
+    labels: Dict[str, str] = {}
+
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise SystemExit("PyYAML est requis pour les lexiques YAML (pip install pyyaml)")
+        with open(path, encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        for category, spec in (data.get('categories') or {}).items():
+            hate_keywords[category] = [str(k).lower() for k in spec.get('keywords', [])]
+            if spec.get('weight') is not None:
+                weights[category] = float(spec['weight'])
+            if spec.get('label'):
+                labels[category] = spec['label']
+        return hate_keywords, weights, labels
+
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            category = (row.get('category') or '').strip()
+            keyword = (row.get('keyword') or '').strip().lower()
+            if not category or not keyword:
+                continue
+            hate_keywords.setdefault(category, []).append(keyword)
+            if row.get('weight') and category not in weights:
+                weights[category] = float(row['weight'])
+            if row.get('label') and category not in labels:
+                labels[category] = row['label'].strip()
+    return hate_keywords, weights, labels
+
+def main():
+    parser = argparse.ArgumentParser(description="Compilation / inspection des lexiques binaires AURA")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="Compile un lexique CSV/YAML en fichier binaire")
+    build.add_argument('source', help="Lexique source (.csv, .yaml, .yml)")
+    build.add_argument('-o', '--output', required=True, help="Fichier binaire à écrire")
+
+    info = sub.add_parser('info', help="Affiche l'en-tête d'un lexique binaire")
+    info.add_argument('lexicon', help="Fichier binaire")
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        hate_keywords, weights, labels = load_source(args.source)
+        version = write_lexicon(args.output, hate_keywords, weights, labels, source=os.path.basename(args.source))
+        total = sum(len(k) for k in hate_keywords.values())
+        print(f"[lexicon] {args.output}: {total} mots-clés, {len(hate_keywords)} catégories, version {version}")
+    else:
+        lexicon = MappedLexicon(args.lexicon)
+        print(json.dumps({**lexicon.meta, 'size_bytes': os.path.getsize(args.lexicon)}, ensure_ascii=False, indent=2))
+        lexicon.close()
+
+if __name__ == '__main__':
+    main()
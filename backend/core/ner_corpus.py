@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - NER Corpus
+Extraction d'entités FrenchNER sur une collection de documents (répertoire ou JSONL),
+répartie sur plusieurs processus, sortie JSONL dans l'ordre d'entrée
+
+Usage:
+    python3 backend/core/ner_corpus.py dossier/ -o entites.jsonl --jobs 8
+    python3 backend/core/ner_corpus.py corpus.jsonl -o entites.jsonl --jobs 8 --resolve --collapse
+    python3 backend/core/ner_corpus.py recrawl.jsonl -o entites.jsonl --segment-cache ner-segments.db
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .nlp_corpus import DEFAULT_TEXT_FIELDS, read_chunks
+    from .analysis_metrics import per_process_path
+    from .preintel_worker import DEFAULT_NER_PATH, load_french_ner
+except ImportError:
+    from nlp_corpus import DEFAULT_TEXT_FIELDS, read_chunks
+    from analysis_metrics import per_process_path
+    from preintel_worker import DEFAULT_NER_PATH, load_french_ner
+
+# Un FrenchNER par processus du pool
+_ner = None
+_options: Dict[str, Any] = {}
+
+def _init_worker(ner_path: str, gazetteer_path: Optional[str], text_fields: Tuple[str, ...],
+                 resolve: bool, collapse: bool, layout: str = 'grouped', segment_cache_path: Optional[str] = None,
+                 document_budget: Optional[float] = None, pattern_budget: Optional[float] = None,
+                 profile_path: Optional[str] = None):
+    global _ner, _options
+    # Patterns compilés une fois par processus, gazetteer projeté en mémoire (pages partagées)
+    _ner = load_french_ner(ner_path)(gazetteer_path=gazetteer_path, segment_cache_path=segment_cache_path)
+    if profile_path:
+        _ner.enable_profiling(export_path=profile_path)
+    _options = {'text_fields': text_fields, 'resolve': resolve, 'collapse': collapse, 'layout': layout,
+                'incremental': segment_cache_path is not None,
+                'document_budget': document_budget, 'pattern_budget': pattern_budget}
+
+def _ner_options() -> Dict[str, Any]:
+    options: Dict[str, Any] = {name: True for name in ('resolve', 'collapse', 'incremental') if _options[name]}
+    if _options['layout'] != 'grouped':
+        options['layout'] = _options['layout']
+    options.update((name, _options[name]) for name in ('document_budget', 'pattern_budget')
+                   if _options[name] is not None)
+    return options
+
+def _process(text: str) -> Dict[str, Any]:
+    return _ner.process_document(text, **_ner_options())
+
+def _process_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    return _ner.process_batch(texts, **_ner_options())
+
+def _export_profile():
+    # Fichier du processus réécrit à chaque lot: il reste à jour quand le pool s'arrête
+    if _ner.profile is not None:
+        _ner.profile.export()
+
+def _record_text(record: Any) -> str:
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict):
+        for field in _options['text_fields']:
+            value = record.get(field)
+            if isinstance(value, str):
+                return value
+    return ''
+
+def process_lines(chunk: Tuple[List[int], List[bytes]]) -> Tuple[bytes, int, int, int]:
+    """Traite un lot de lignes JSONL: (lignes de sortie, documents, erreurs, caractères)"""
+    line_numbers, lines = chunk
+    out: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    errors = chars = 0
+    for offset, raw in enumerate(lines):
+        try:
+            record = json.loads(raw)
+            text = _record_text(record)
+        except Exception as e:
+            errors += 1
+            out.append({'line': line_numbers[offset], 'error': f"{type(e).__name__}: {e}"})
+            continue
+        result = {'line': line_numbers[offset]}
+        if isinstance(record, dict) and 'id' in record:
+            result['id'] = record['id']
+        out.append(result)
+        texts.append(text)
+        chars += len(text)
+
+    pending = [result for result in out if 'error' not in result]
+    try:
+        # Lot entier en un seul passage (textes courts: coût fixe par appel amorti)
+        for result, document in zip(pending, _process_batch(texts)):
+            result.update(document)
+    except Exception:
+        # Une erreur n'affecte que son document: reprise document par document
+        for result, text in zip(pending, texts):
+            try:
+                result.update(_process(text))
+            except Exception as e:
+                errors += 1
+                result['error'] = f"{type(e).__name__}: {e}"
+    _export_profile()
+    lines_out = '\n'.join(json.dumps(result, ensure_ascii=False) for result in out)
+    return (lines_out + '\n').encode('utf-8'), len(lines), errors, chars
+
+def process_files(chunk: Tuple[str, List[str]]) -> Tuple[bytes, int, int, int]:
+    """Traite un lot de fichiers texte (lus dans le processus du pool)"""
+    root, paths = chunk
+    out = []
+    errors = chars = 0
+    for path in paths:
+        result = {'path': os.path.relpath(path, root)}
+        try:
+            with open(path, encoding='utf-8', errors='replace', newline='') as f:
+                text = f.read()
+            chars += len(text)
+            result.update(_process(text))
+        except Exception as e:
+            errors += 1
+            result['error'] = f"{type(e).__name__}: {e}"
+        out.append(json.dumps(result, ensure_ascii=False))
+    _export_profile()
+    return ('\n'.join(out) + '\n').encode('utf-8'), len(paths), errors, chars
+
+def iter_files(root: str, chunk_size: int) -> Iterator[List[str]]:
+    """Fichiers d'un répertoire par lots, parcours récursif trié (ordre de sortie stable)"""
+    batch: List[str] = []
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for name in sorted(files):
+            if name.startswith('.'):
+                continue
+            batch.append(os.path.join(directory, name))
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def run(args) -> Dict[str, Any]:
+    text_fields = tuple(args.text_field) if args.text_field else DEFAULT_TEXT_FIELDS
+    is_directory = os.path.isdir(args.input)
+    started = time.time()
+    last_report = started
+    documents = errors = chars = 0
+    # Un fichier de profil par processus du pool
+    profile_path = per_process_path(args.profile) if args.profile and args.jobs > 1 else args.profile
+
+    with open(args.output, 'wb') as dst, \
+            ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                initargs=(args.ner_path, args.name_gazetteer, text_fields,
+                                          args.resolve, args.collapse, args.layout,
+                                          args.segment_cache, args.document_budget,
+                                          args.pattern_budget, profile_path)) as pool:
+        src = None
+        if is_directory:
+            tasks = ((process_files, (args.input, paths)) for paths in iter_files(args.input, args.chunk_size))
+        else:
+            src = open(args.input, 'rb')
+            tasks = ((process_lines, (numbers, lines)) for numbers, lines, _, _ in
+                     read_chunks(src, args.chunk_size, 0))
+        try:
+            inflight = deque()
+            exhausted = False
+            while inflight or not exhausted:
+                # Fenêtre bornée de lots en vol: mémoire constante quelle que soit la taille du corpus
+                while not exhausted and len(inflight) < args.jobs * 2:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    inflight.append(pool.submit(*task))
+                if not inflight:
+                    break
+
+                output, count, failed, size = inflight.popleft().result()
+                dst.write(output)
+                documents += count
+                errors += failed
+                chars += size
+
+                now = time.time()
+                if not args.quiet and now - last_report >= args.progress_interval:
+                    last_report = now
+                    elapsed = now - started
+                    print(f"[ner-corpus] {documents} documents | {documents / elapsed:.0f} docs/s | "
+                          f"{chars / elapsed / 1e6:.2f} M car./s | {errors} erreurs", file=sys.stderr)
+        finally:
+            if src is not None:
+                src.close()
+
+    elapsed = time.time() - started
+    summary = {
+        'documents': documents,
+        'errors': errors,
+        'chars': chars,
+        'elapsed_s': round(elapsed, 3),
+        'docs_per_s': round(documents / elapsed, 1) if elapsed else 0.0,
+        'chars_per_s': round(chars / elapsed) if elapsed else 0,
+    }
+    if not args.quiet:
+        print(f"[ner-corpus] Terminé: {json.dumps(summary)}", file=sys.stderr)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction d'entités FrenchNER sur un corpus, sur plusieurs cœurs")
+    parser.add_argument('input', help="Répertoire de fichiers texte ou corpus JSONL (un objet ou une chaîne par ligne)")
+    parser.add_argument('-o', '--output', required=True, help="Fichier JSONL de résultats (ordre d'entrée)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument('--chunk-size', type=int, default=100, help="Documents par lot envoyé aux processus")
+    parser.add_argument('--text-field', action='append',
+                        help="Champ texte des objets JSONL (répétable, défaut: content, text, desc)")
+    parser.add_argument('--ner-path', default=os.environ.get('AURA_NER_PATH', DEFAULT_NER_PATH),
+                        help="Chemin de ner-french-enhanced.py")
+    parser.add_argument('--name-gazetteer', default=os.environ.get('AURA_NER_GAZETTEER'),
+                        help="Gazetteer prénoms/noms (osint-tools-advanced/services/name_gazetteer.py build)")
+    parser.add_argument('--resolve', action='store_true', help="Supprime les entités qui se chevauchent")
+    parser.add_argument('--collapse', action='store_true', help="Fusionne les valeurs répétées d'un document")
+    parser.add_argument('--layout', choices=('grouped', 'columns'), default='grouped',
+                        help="Entités groupées par type ou en colonnes (tableaux parallèles, chaînes internées)")
+    parser.add_argument('--segment-cache', default=os.environ.get('AURA_NER_SEGMENT_CACHE'),
+                        help="Cache SQLite des résultats par paragraphe (re-crawl: seuls les paragraphes modifiés "
+                             "sont réanalysés, aucune entité ne traverse une ligne vide)")
+    parser.add_argument('--document-budget', type=float,
+                        help="Budget de temps par document en secondes (résultat partiel marqué 'truncated')")
+    parser.add_argument('--pattern-budget', type=float,
+                        help="Budget de temps par étape d'extraction en secondes (textes pathologiques: OCR, minifiés)")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="Profilage FrenchNER par pattern (temps, correspondances, rejets), export Prometheus "
+                             "par processus ({pid} remplacé par le PID, ajouté automatiquement avec --jobs > 1, "
+                             "ex. ner-profile-{pid}.prom)")
+    parser.add_argument('--progress-interval', type=float, default=5.0, help="Secondes entre deux lignes de progression")
+    parser.add_argument('--quiet', action='store_true', help="Pas de progression sur stderr")
+    args = parser.parse_args()
+    if args.segment_cache and (args.document_budget is not None or args.pattern_budget is not None):
+        parser.error("--document-budget / --pattern-budget incompatibles avec --segment-cache "
+                     "(ou AURA_NER_SEGMENT_CACHE)")
+    run(args)
+
+if __name__ == '__main__':
+    main()
@@ -4,109 +4,445 @@ Moteur d'analyse IA pour détection de contenu haineux
 """
 
 import re
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
-@dataclass
-class AnalysisResult:
-    """Résultat d'analyse NLP"""
-    is_hate_speech: bool
-    confidence_score: float
-    detected_categories: List[str]
-    severity_level: str  # low, medium, high, critical
-    explanation: str
-    keywords_detected: List[str]
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .keyword_automaton import KeywordAutomaton, KeywordMatch
+    from .analysis_cache import AnalysisCache, content_key
+    from .lexicon_store import MappedLexicon, lexicon_version
+    from .analysis_metrics import AnalysisMetrics
+    from .analysis_result import AnalysisResult, ResultVocabulary, SAFE_EXPLANATION, format_explanation
+    from .hashing_model import LinearTextModel
+    from .fuzzy_matcher import DEFAULT_DISTANCES, MATCH_RULES_VERSION, FuzzyMatcher
+    from .transcript_stream import DEFAULT_WINDOW_CHARS, StreamingNormalizer, TranscriptWindow, iter_transcript_windows
+except ImportError:
+    from keyword_automaton import KeywordAutomaton, KeywordMatch
+    from analysis_cache import AnalysisCache, content_key
+    from lexicon_store import MappedLexicon, lexicon_version
+    from analysis_metrics import AnalysisMetrics
+    from analysis_result import AnalysisResult, ResultVocabulary, SAFE_EXPLANATION, format_explanation
+    from hashing_model import LinearTextModel
+    from fuzzy_matcher import DEFAULT_DISTANCES, MATCH_RULES_VERSION, FuzzyMatcher
+    from transcript_stream import DEFAULT_WINDOW_CHARS, StreamingNormalizer, TranscriptWindow, iter_transcript_windows
+
+# Caractères répétés 3 fois ou plus
+REPEATED_CHARS = re.compile(r'(.)\1{2,}')
+
+# Leet speak basique (remplacements caractère par caractère, en une passe)
+LEET_TABLE = str.maketrans({'4': 'a', '3': 'e', '1': 'i', '0': 'o', '5': 's'})
+
+def _item_text(item: Any) -> str:
+    """Texte d'un élément: chaîne brute ou Post (backend/adapters/platform_adapter.py)"""
+    if isinstance(item, str):
+        return item
+    return getattr(item, 'content', None) or ''
+
+def _frozen_keywords(hate_keywords: Mapping[str, Iterable[str]]) -> Dict[str, Tuple[str, ...]]:
+    """Copie du lexique aux listes figées: une modification en place échoue au lieu d'être ignorée"""
+    return {category: tuple(keywords) for category, keywords in hate_keywords.items()}
 
 class NLPAnalyzer:
     """Analyseur NLP pour détection de haine en ligne"""
     
-    def __init__(self):
-        self.hate_keywords = {
+    def __init__(self, cache: Optional[AnalysisCache] = None, lexicon_path: Optional[str] = None,
+                 metrics: Optional[AnalysisMetrics] = None, model_path: Optional[str] = None,
+                 fuzzy: bool = False):
+        self.cache = cache
+        self.metrics = metrics
+        self.model: Optional[LinearTextModel] = None
+        # Distances tolérées par longueur de mot-clé en mode approché (None = désactivé)
+        self.fuzzy_distances: Optional[Tuple[Tuple[int, int], ...]] = DEFAULT_DISTANCES if fuzzy else None
+        self._fuzzy: Optional[FuzzyMatcher] = None
+        if metrics is not None and cache is not None:
+            metrics.collectors.append(cache.to_prometheus)
+        self._lexicon_file: Optional[MappedLexicon] = None
+        
+        self.category_labels = {
+            'racism': 'racisme',
+            'sexism': 'sexisme',
+            'homophobia': 'homophobie',
+            'violence': 'violence',
+            'harassment': 'harcèlement'
+        }
+        
+        self._hate_keywords = _frozen_keywords({
             'racism': ['sale race', 'retourne', 'pays', 'étranger'],
             'sexism': ['salope', 'pute', 'femme au foyer'],
             'homophobia': ['pédé', 'tapette', 'anormal'],
             'violence': ['crever', 'tuer', 'mort', 'violence'],
             'harassment': ['harcèlement', 'insulte', 'menace']
-        }
+        })
         
-        self.severity_weights = {
+        self._severity_weights = {
             'racism': 0.9,
             'violence': 0.95,
             'harassment': 0.7,
             'sexism': 0.8,
             'homophobia': 0.85
         }
+        
+        if lexicon_path:
+            self.load_lexicon(lexicon_path)
+        else:
+            self.compile_lexicon()
+        if model_path:
+            self.load_model(model_path)
+    
+    @property
+    def hate_keywords(self) -> Mapping[str, Tuple[str, ...]]:
+        """Vue en lecture seule du lexique (catégorie → mots-clés)
+        
+        L'automate, la version du lexique et le cache en dépendent: une modification
+        passe par une réaffectation (analyzer.hate_keywords = {...}), qui recompile.
+        """
+        # Lexique projeté en mémoire: dict matérialisé seulement à la demande
+        if self._hate_keywords is None:
+            self._hate_keywords = _frozen_keywords(self._lexicon_file.to_dict())
+        return MappingProxyType(self._hate_keywords)
+    
+    @hate_keywords.setter
+    def hate_keywords(self, value: Mapping[str, Iterable[str]]):
+        self._hate_keywords = _frozen_keywords(value)
+        self.compile_lexicon()
+    
+    @property
+    def severity_weights(self) -> Mapping[str, float]:
+        """Vue en lecture seule des poids par catégorie (réaffecter pour modifier)"""
+        return MappingProxyType(self._severity_weights)
+    
+    @severity_weights.setter
+    def severity_weights(self, value: Mapping[str, float]):
+        self._severity_weights = dict(value)
+        self.compile_lexicon()
+    
+    def compile_lexicon(self):
+        """Compile hate_keywords en automate et recalcule la version du lexique
+        
+        Appelé automatiquement quand hate_keywords ou severity_weights sont réassignés
+        (les vues retournées par ces propriétés ne sont pas modifiables).
+        """
+        if self._hate_keywords is None:
+            self._hate_keywords = _frozen_keywords(self._lexicon_file.to_dict())
+        hate_keywords = self._hate_keywords
+        self._lexicon_file = None
+        self._matcher = KeywordAutomaton(hate_keywords)
+        self._vocab = ResultVocabulary(self._matcher.categories, self._matcher.entries, self.category_labels)
+        self.lexicon_version = lexicon_version(hate_keywords, self._severity_weights)
+        self._bind_engines()
+    
+    def load_lexicon(self, path: str):
+        """Charge un lexique binaire précompilé (lexicon_store.py) par projection mémoire"""
+        lexicon = MappedLexicon(path)
+        self._lexicon_file = lexicon
+        self._hate_keywords = None
+        self._severity_weights = dict(lexicon.weights)
+        self.category_labels.update(lexicon.labels)
+        self._matcher = lexicon.automaton
+        self._vocab = ResultVocabulary(self._matcher.categories, self._matcher.entries, self.category_labels)
+        self.lexicon_version = lexicon.version
+        self._bind_engines()
+    
+    def load_model(self, path: str):
+        """Active le mode rapide: modèle linéaire sur n-grammes hachés (hashing_model.py)
+        
+        Les catégories, la confiance et la sévérité viennent alors du modèle; les
+        mots-clés du lexique restent rapportés dans keywords_detected.
+        """
+        self.model = LinearTextModel.load(path)
+        self._bind_engines()
+    
+    def enable_fuzzy(self, distances: Sequence[Tuple[int, int]] = DEFAULT_DISTANCES):
+        """Active la détection approchée (homoglyphes, séparateurs, fautes de frappe)
+        
+        distances: ((longueur minimale, distance d'édition tolérée), ...) par longueur
+        décroissante; les mots-clés plus courts que la dernière borne restent exacts.
+        """
+        self.fuzzy_distances = tuple(distances)
+        self._bind_engines()
+    
+    def _bind_engines(self):
+        """Reconstruit les moteurs dépendant du lexique (modèle, index approché) et invalide le cache"""
+        self._fuzzy = None
+        if self.fuzzy_distances is not None:
+            self._fuzzy = FuzzyMatcher(self._matcher.entries, self.fuzzy_distances)
+        if self.model is not None:
+            bits = {cat: i for i, cat in enumerate(self._vocab.categories)}
+            unknown = [cat for cat in self.model.categories if cat not in bits]
+            if unknown:
+                raise ValueError(f"Model categories missing from lexicon: {', '.join(unknown)}")
+            self._model_bits = [bits[cat] for cat in self.model.categories]
+            self.result_version = f"{self.lexicon_version}+{self.model.version}"
+        else:
+            self.result_version = self.lexicon_version
+        if self._fuzzy is not None:
+            self.result_version += f'+fuzzy{MATCH_RULES_VERSION}' + ''.join(f"/{n}:{d}" for n, d in self.fuzzy_distances)
+        if self.cache is not None:
+            self.cache.invalidate(self.result_version)
+    
+    def find_keyword_matches(self, text: str) -> List[KeywordMatch]:
+        """Retourne chaque occurrence de mot-clé avec ses positions dans le texte normalisé
+        
+        En mode approché, les occurrences obfusquées (FuzzyMatch: forme rencontrée et
+        distance) s'ajoutent à celles qui ne recouvrent pas déjà le même mot-clé exact.
+        """
+        normalized_text = self._normalize_text(text)
+        matches = self._matcher.find_all(normalized_text)
+        if self._fuzzy is None:
+            return matches
+        exact = [(m.keyword, m.start, m.end) for m in matches]
+        for match in self._fuzzy.find_all(normalized_text):
+            if not any(k == match.keyword and s < match.end and match.start < e for k, s, e in exact):
+                matches.append(match)
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
     
     def analyze_content(self, text: str) -> AnalysisResult:
         """Analyse le contenu pour détecter la haine"""
+        if self.metrics is not None:
+            return self._analyze_instrumented(text)
+        
         if not text or len(text.strip()) < 3:
             return self._create_safe_result()
         
         # Normalisation du texte
         normalized_text = self._normalize_text(text)
         
-        # Détection des catégories
-        detected_categories = self._detect_categories(normalized_text)
-        keywords_found = self._extract_keywords(normalized_text, detected_categories)
+        if self.cache is None:
+            return self._analyze_normalized(normalized_text)
+        return self._analyze_cached(normalized_text, self._analyze_normalized)
+    
+    def _analyze_cached(self, normalized_text: str, analyze) -> AnalysisResult:
+        """Analyse via le cache: texte normalisé identique → résultat identique (spam, reposts)"""
+        key = content_key(normalized_text, self.result_version)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = analyze(normalized_text)
+            self.cache.put(key, cached)
+        return cached
+    
+    def _analyze_normalized(self, normalized_text: str) -> AnalysisResult:
+        """Analyse un texte déjà normalisé"""
+        if self.model is not None:
+            return self._model_result(self.model.predict_proba([normalized_text])[0], normalized_text)
+        
+        # Détection des catégories et mots-clés en un seul parcours
+        category_mask, keyword_ids = self._scan_ids(normalized_text)
+        return self._build_result(category_mask, keyword_ids)
+    
+    def _build_result(self, category_mask: int, keyword_ids: Tuple[int, ...]) -> AnalysisResult:
+        """Construit le résultat à partir des catégories et mots-clés détectés"""
+        detected_categories = self._vocab.categories_from_mask(category_mask)
         
         # Calcul du score de confiance
-        confidence = self._calculate_confidence(detected_categories, keywords_found)
+        confidence = self._calculate_confidence(detected_categories, keyword_ids)
         
         # Détermination de la sévérité
         severity = self._determine_severity(detected_categories, confidence)
         
-        # Classification finale
-        is_hate = confidence > 0.6 and len(detected_categories) > 0
+        # Classification finale (l'explication est construite à la lecture)
+        return AnalysisResult(
+            is_hate_speech=confidence > 0.6 and category_mask != 0,
+            confidence_score=confidence,
+            severity_level=severity,
+            category_mask=category_mask,
+            keyword_ids=keyword_ids,
+            vocab=self._vocab
+        )
+    
+    def _model_result(self, probabilities: List[float], normalized_text: str) -> AnalysisResult:
+        """Résultat du mode rapide: catégories au-dessus du seuil du modèle"""
+        threshold = self.model.threshold
+        category_mask = 0
+        for bit, probability in zip(self._model_bits, probabilities):
+            if probability >= threshold:
+                category_mask |= 1 << bit
+        confidence = round(max(probabilities, default=0.0), 3)
+        detected_categories = self._vocab.categories_from_mask(category_mask)
+        return AnalysisResult(
+            is_hate_speech=category_mask != 0,
+            confidence_score=confidence,
+            severity_level=self._determine_severity(detected_categories, confidence),
+            category_mask=category_mask,
+            keyword_ids=self._scan_ids(normalized_text)[1],
+            vocab=self._vocab
+        )
+    
+    def _analyze_instrumented(self, text: str) -> AnalysisResult:
+        """Même pipeline qu'analyze_content, chronométré étape par étape"""
+        metrics = self.metrics
+        start = perf_counter()
+        size = len(text.encode('utf-8')) if text else 0
+        
+        if not text or len(text.strip()) < 3:
+            result = self._create_safe_result()
+            metrics.record_text(size, perf_counter() - start, short_circuit=True)
+            return result
+        
+        normalized_text = self._normalize_text(text)
+        metrics.observe('normalize', perf_counter() - start)
+        
+        if self.cache is None:
+            result = self._analyze_normalized_timed(normalized_text)
+        else:
+            result = self._analyze_cached(normalized_text, self._analyze_normalized_timed)
+        
+        metrics.record_text(size, perf_counter() - start, is_hate=result.is_hate_speech)
+        return result
+    
+    def _analyze_normalized_timed(self, normalized_text: str) -> AnalysisResult:
+        """_analyze_normalized avec une mesure par étape"""
+        observe = self.metrics.observe
+        
+        t0 = perf_counter()
+        if self.model is not None:
+            probabilities = self.model.predict_proba([normalized_text])[0]
+            observe('model', perf_counter() - t0)
+            return self._model_result(probabilities, normalized_text)
+        
+        category_mask, keyword_ids = self._scan_ids(normalized_text)
+        detected_categories = self._vocab.categories_from_mask(category_mask)
+        t1 = perf_counter()
+        observe('match', t1 - t0)
+        
+        confidence = self._calculate_confidence(detected_categories, keyword_ids)
+        t2 = perf_counter()
+        observe('confidence', t2 - t1)
+        
+        severity = self._determine_severity(detected_categories, confidence)
+        observe('severity', perf_counter() - t2)
         
         return AnalysisResult(
-            is_hate_speech=is_hate,
+            is_hate_speech=confidence > 0.6 and category_mask != 0,
             confidence_score=confidence,
-            detected_categories=detected_categories,
             severity_level=severity,
-            explanation=self._generate_explanation(detected_categories, confidence),
-            keywords_detected=keywords_found
+            category_mask=category_mask,
+            keyword_ids=keyword_ids,
+            vocab=self._vocab
         )
     
+    def analyze_batch(self, items: Iterable[Union[str, Any]]) -> List[AnalysisResult]:
+        """Analyse une collection de textes ou de Post, résultats dans l'ordre d'entrée"""
+        if self.model is not None:
+            return self._analyze_batch_model([_item_text(item) for item in items])
+        analyze = self.analyze_content
+        return [analyze(_item_text(item)) for item in items]
+    
+    def _analyze_batch_model(self, texts: List[str]) -> List[AnalysisResult]:
+        """Mode rapide par lot: un seul passage matriciel du modèle pour tous les textes à calculer"""
+        start = perf_counter()
+        results: List[Optional[AnalysisResult]] = [None] * len(texts)
+        # Textes normalisés à calculer → positions dans le lot (doublons calculés une fois)
+        todo: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 3:
+                results[i] = self._create_safe_result()
+                continue
+            normalized_text = self._normalize_text(text)
+            positions = todo.get(normalized_text)
+            if positions is not None:
+                positions.append(i)
+                continue
+            if self.cache is not None:
+                results[i] = self.cache.get(content_key(normalized_text, self.result_version))
+                if results[i] is not None:
+                    continue
+            todo[normalized_text] = [i]
+        
+        model_start = perf_counter()
+        probabilities = self.model.predict_proba(list(todo))
+        if self.metrics is not None and todo:
+            self.metrics.observe('model', (perf_counter() - model_start) / len(todo))
+        for (normalized_text, positions), row in zip(todo.items(), probabilities):
+            result = self._model_result(row, normalized_text)
+            for i in positions:
+                results[i] = result
+            if self.cache is not None:
+                self.cache.put(content_key(normalized_text, self.result_version), result)
+        
+        if self.metrics is not None and texts:
+            per_text = (perf_counter() - start) / len(texts)
+            for text, result in zip(texts, results):
+                self.metrics.record_text(len(text.encode('utf-8')) if text else 0, per_text,
+                                         short_circuit=not text or len(text.strip()) < 3, is_hate=result.is_hate_speech)
+        return results
+    
+    def analyze_stream(self, posts: Iterable[Any]) -> Iterator[Tuple[Any, AnalysisResult]]:
+        """Analyse paresseuse d'un flux (éventuellement infini) de Post ou de textes
+        
+        Génère des couples (élément, résultat) un par un: la mémoire reste
+        constante quelle que soit la taille du flux.
+        """
+        analyze = self.analyze_content
+        for post in posts:
+            yield post, analyze(_item_text(post))
+    
+    def analyze_transcript(self, source: Union[str, Iterable[str], Any],
+                           window_chars: int = DEFAULT_WINDOW_CHARS) -> Iterator[TranscriptWindow]:
+        """Analyse fenêtrée d'un long texte (transcription, fil de discussion)
+        
+        source: chaîne, itérable de morceaux ou fichier texte ouvert. Génère une
+        TranscriptWindow par fenêtre: occurrences aux positions du texte brut et
+        résultat cumulé depuis le début. Le dernier résultat est celui
+        qu'analyze_content donnerait sur le texte entier (3 caractères ou plus).
+        
+        Seule la détection exacte par automate se poursuit d'une fenêtre à l'autre: le
+        mode approché et le modèle rapide ont besoin du texte entier (ValueError).
+        """
+        if self._fuzzy is not None or self.model is not None:
+            raise ValueError("analyze_transcript only supports exact lexicon matching "
+                             "(disable fuzzy mode and the model, or use analyze_content)")
+        entries = self._matcher.entries
+        keep_back = max((len(keyword) for keyword, _ in entries), default=0)
+        normalizer = StreamingNormalizer(REPEATED_CHARS, LEET_TABLE, keep_back)
+        return iter_transcript_windows(self, normalizer, source, window_chars)
+    
     def _normalize_text(self, text: str) -> str:
         """Normalise le texte pour l'analyse"""
         # Conversion en minuscules
         text = text.lower()
         
         # Suppression des caractères spéciaux répétés
-        text = re.sub(r'(.)\1{2,}', r'\1', text)
+        text = REPEATED_CHARS.sub(r'\1', text)
         
         # Gestion du leet speak basique
-        replacements = {
-            '4': 'a', '3': 'e', '1': 'i', '0': 'o', '5': 's'
-        }
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        
-        return text
+        return text.translate(LEET_TABLE)
+    
+    def _scan_ids(self, text: str) -> Tuple[int, Tuple[int, ...]]:
+        """Parcourt le texte une seule fois et retourne (masque de catégories, identifiants de mots-clés)"""
+        # Les identifiants d'entrée suivent l'ordre du lexique (catégorie puis mot-clé)
+        keyword_ids = self._matcher.found_entries(text)
+        if self._fuzzy is not None:
+            fuzzy_ids = self._fuzzy.found_entries(text)
+            if fuzzy_ids:
+                keyword_ids = sorted(set(keyword_ids).union(fuzzy_ids))
+        if not keyword_ids:
+            return 0, ()
+        category_ids = self._matcher.entry_category_ids
+        mask = 0
+        for entry_id in keyword_ids:
+            mask |= 1 << category_ids[entry_id]
+        return mask, tuple(keyword_ids)
+    
+    def _scan_lexicon(self, text: str) -> Tuple[List[str], List[str]]:
+        """Parcourt le texte une seule fois et retourne (catégories, mots-clés)"""
+        category_mask, keyword_ids = self._scan_ids(text)
+        entries = self._matcher.entries
+        return self._vocab.categories_from_mask(category_mask), [entries[i][0] for i in keyword_ids]
     
     def _detect_categories(self, text: str) -> List[str]:
         """Détecte les catégories de haine présentes"""
-        detected = []
-        
-        for category, keywords in self.hate_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    if category not in detected:
-                        detected.append(category)
-                    break
-        
-        return detected
+        return self._scan_lexicon(text)[0]
     
     def _extract_keywords(self, text: str, categories: List[str]) -> List[str]:
         """Extrait les mots-clés détectés"""
-        found_keywords = []
-        
-        for category in categories:
-            for keyword in self.hate_keywords[category]:
-                if keyword in text:
-                    found_keywords.append(keyword)
-        
-        return found_keywords
+        entries = self._matcher.entries
+        return [
+            entries[entry_id][0]
+            for entry_id in self._scan_ids(text)[1]
+            if entries[entry_id][1] in categories
+        ]
     
     def _calculate_confidence(self, categories: List[str], keywords: List[str]) -> float:
         """Calcule le score de confiance"""
@@ -114,7 +450,7 @@ class NLPAnalyzer:
             return 0.0
         
         # Score basé sur les catégories et leur poids
-        category_score = sum(self.severity_weights.get(cat, 0.5) for cat in categories)
+        category_score = sum(self._severity_weights.get(cat, 0.5) for cat in categories)
         
         # Bonus pour multiple catégories
         multi_category_bonus = min(len(categories) * 0.1, 0.3)
@@ -137,28 +473,14 @@ class NLPAnalyzer:
     
     def _generate_explanation(self, categories: List[str], confidence: float) -> str:
         """Génère une explication de l'analyse"""
-        if not categories:
-            return "Aucun contenu haineux détecté"
-        
-        category_names = {
-            'racism': 'racisme',
-            'sexism': 'sexisme', 
-            'homophobia': 'homophobie',
-            'violence': 'violence',
-            'harassment': 'harcèlement'
-        }
-        
-        detected_names = [category_names.get(cat, cat) for cat in categories]
-        
-        return f"Contenu potentiellement haineux détecté: {', '.join(detected_names)} (confiance: {confidence:.1%})"
+        detected_names = [self.category_labels.get(cat, cat) for cat in categories]
+        return format_explanation(detected_names, confidence)
     
     def _create_safe_result(self) -> AnalysisResult:
-        """Crée un résultat pour contenu sûr"""
+        """Crée un résultat pour contenu sûr (nouvelle instance: l'appelant peut la modifier)"""
         return AnalysisResult(
             is_hate_speech=False,
             confidence_score=0.0,
-            detected_categories=[],
             severity_level='low',
-            explanation="Contenu analysé comme sûr",
-            keywords_detected=[]
-        )
\ No newline at end of file
+            explanation=SAFE_EXPLANATION
+        )
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - NLP Corpus
+Analyse multi-cœurs d'un corpus JSONL avec NLPAnalyzer (sortie ordonnée, reprise sur checkpoint)
+
+Usage:
+    python3 backend/core/nlp_corpus.py corpus.jsonl -o scores.jsonl --jobs 8
+    python3 backend/core/nlp_corpus.py corpus.jsonl -o scores.jsonl --jobs 8 --resume
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .nlp_analyzer import NLPAnalyzer
+    from .analysis_metrics import AnalysisMetrics, per_process_path
+except ImportError:
+    from nlp_analyzer import NLPAnalyzer
+    from analysis_metrics import AnalysisMetrics, per_process_path
+
+DEFAULT_TEXT_FIELDS = ('content', 'text', 'desc')
+
+# Un analyseur par processus du pool
+_analyzer: Optional[NLPAnalyzer] = None
+_text_fields: Tuple[str, ...] = DEFAULT_TEXT_FIELDS
+
+def _init_worker(text_fields: Tuple[str, ...], lexicon_path: Optional[str] = None,
+                 metrics_path: Optional[str] = None, model_path: Optional[str] = None, fuzzy: bool = False):
+    global _analyzer, _text_fields
+    metrics = AnalysisMetrics(export_path=metrics_path) if metrics_path else None
+    # Lexique binaire et modèle: projetés en mémoire, pages partagées entre les processus du pool
+    _analyzer = NLPAnalyzer(lexicon_path=lexicon_path, metrics=metrics, model_path=model_path, fuzzy=fuzzy)
+    _text_fields = text_fields
+
+def _record_text(record: Any) -> str:
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict):
+        for field in _text_fields:
+            value = record.get(field)
+            if isinstance(value, str):
+                return value
+    return ''
+
+def analyze_chunk(chunk: Tuple[List[int], List[bytes]]) -> bytes:
+    """Analyse un lot de lignes JSONL brutes et retourne les lignes de sortie encodées"""
+    line_numbers, lines = chunk
+    out: List[Optional[str]] = []
+    records = []
+    for offset, raw in enumerate(lines):
+        try:
+            records.append((len(out), json.loads(raw)))
+            out.append(None)
+        except ValueError as e:
+            out.append(json.dumps({'line': line_numbers[offset], 'error': f"Invalid JSON: {e}"}))
+
+    # Lot entier d'un coup: vectorisé en mode modèle rapide
+    results = _analyzer.analyze_batch([_record_text(record) for _, record in records])
+    for (offset, record), analysis in zip(records, results):
+        result = analysis.to_dict()
+        result['line'] = line_numbers[offset]
+        if isinstance(record, dict) and 'id' in record:
+            result['id'] = record['id']
+        out[offset] = json.dumps(result, ensure_ascii=False)
+    if _analyzer.metrics is not None:
+        _analyzer.metrics.export()
+    return ('\n'.join(out) + '\n').encode('utf-8')
+
+def read_chunks(handle, chunk_size: int,
+                first_line: int) -> Iterator[Tuple[List[int], List[bytes], int, int]]:
+    """Lit l'entrée par lots: (numéros de ligne, lignes, position après le lot, ligne suivante)
+
+    Les lignes vides sont ignorées mais comptées: chaque ligne garde son numéro dans le
+    fichier (à partir de first_line, numéro de la ligne à la position courante).
+    """
+    line_no = first_line
+    numbers: List[int] = []
+    lines: List[bytes] = []
+    for raw in handle:
+        if raw.strip():
+            numbers.append(line_no)
+            lines.append(raw)
+        line_no += 1
+        if len(lines) >= chunk_size:
+            yield numbers, lines, handle.tell(), line_no
+            numbers, lines = [], []
+    if lines:
+        yield numbers, lines, handle.tell(), line_no
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path: str, state: Dict[str, Any]):
+    """Écriture atomique du checkpoint"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def run(args) -> Dict[str, Any]:
+    checkpoint_path = args.checkpoint or args.output + '.ckpt'
+    state = load_checkpoint(checkpoint_path) if args.resume else {}
+    if state and state.get('input') != os.path.abspath(args.input):
+        raise SystemExit(f"Checkpoint {checkpoint_path} concerne un autre fichier: {state.get('input')}")
+
+    input_offset = state.get('input_offset', 0)
+    output_offset = state.get('output_offset', 0)
+    lines_done = state.get('lines_done', 0)
+    # Numéro de ligne à input_offset (lignes vides comprises; anciens checkpoints: lignes traitées)
+    next_line = state.get('next_line', lines_done)
+    input_size = os.path.getsize(args.input)
+
+    text_fields = tuple(args.text_field) if args.text_field else DEFAULT_TEXT_FIELDS
+    started = time.time()
+    last_report = started
+    processed = 0
+    # Un fichier de métriques par processus du pool
+    metrics_path = per_process_path(args.metrics_file) if args.metrics_file and args.jobs > 1 else args.metrics_file
+
+    with open(args.input, 'rb') as src, open(args.output, 'r+b' if state else 'wb') as dst, \
+            ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                initargs=(text_fields, args.lexicon, metrics_path, args.model,
+                                          args.fuzzy)) as pool:
+        # Reprise: on ignore ce qui a déjà été écrit après le dernier checkpoint
+        src.seek(input_offset)
+        dst.seek(output_offset)
+        dst.truncate()
+
+        inflight = deque()
+        chunks = read_chunks(src, args.chunk_size, next_line)
+        exhausted = False
+        while inflight or not exhausted:
+            # Fenêtre bornée de lots en vol: mémoire constante quelle que soit la taille du corpus
+            while not exhausted and len(inflight) < args.jobs * 2:
+                try:
+                    numbers, lines, end_offset, end_line = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                inflight.append((pool.submit(analyze_chunk, (numbers, lines)), len(lines), end_offset, end_line))
+            if not inflight:
+                break
+
+            future, count, end_offset, next_line = inflight.popleft()
+            dst.write(future.result())
+            dst.flush()
+            lines_done += count
+            processed += count
+            save_checkpoint(checkpoint_path, {
+                'input': os.path.abspath(args.input),
+                'input_offset': end_offset,
+                'output_offset': dst.tell(),
+                'lines_done': lines_done,
+                'next_line': next_line,
+            })
+
+            now = time.time()
+            if not args.quiet and now - last_report >= args.progress_interval:
+                last_report = now
+                elapsed = now - started
+                print(f"[nlp-corpus] {lines_done} lignes | {processed / elapsed:.0f} lignes/s | "
+                      f"{end_offset / input_size:.1%} de l'entrée", file=sys.stderr)
+
+    elapsed = time.time() - started
+    summary = {
+        'lines': lines_done,
+        'processed': processed,
+        'elapsed_s': round(elapsed, 3),
+        'lines_per_s': round(processed / elapsed, 1) if elapsed else 0.0,
+    }
+    if not args.quiet:
+        print(f"[nlp-corpus] Terminé: {json.dumps(summary)}", file=sys.stderr)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse NLP d'un corpus JSONL sur plusieurs cœurs")
+    parser.add_argument('input', help="Corpus JSONL (un objet ou une chaîne par ligne)")
+    parser.add_argument('-o', '--output', required=True, help="Fichier JSONL de résultats (ordre d'entrée)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Lignes par lot envoyé aux processus")
+    parser.add_argument('--text-field', action='append',
+                        help="Champ texte à analyser (répétable, défaut: content, text, desc)")
+    parser.add_argument('--lexicon', help="Lexique binaire précompilé (lexicon_store.py build)")
+    parser.add_argument('--model', help="Modèle rapide n-grammes hachés (hashing_model.py train)")
+    parser.add_argument('--fuzzy', action='store_true',
+                        help="Détection approchée des mots-clés obfusqués (homoglyphes, séparateurs, fautes)")
+    parser.add_argument('--metrics-file',
+                        help="Export Prometheus par processus ({pid} remplacé par le PID, ajouté automatiquement "
+                             "avec --jobs > 1), ex: logs/run/preintel/nlp-{pid}.prom")
+    parser.add_argument('--checkpoint', help="Fichier de checkpoint (défaut: <output>.ckpt)")
+    parser.add_argument('--resume', action='store_true', help="Reprend depuis le checkpoint")
+    parser.add_argument('--progress-interval', type=float, default=5.0, help="Secondes entre deux lignes de progression")
+    parser.add_argument('--quiet', action='store_true', help="Pas de progression sur stderr")
+    run(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+AURA OSINT - Preintel Worker
+Processus Python persistant servant NLPAnalyzer et FrenchNER en JSON-lines
+
+Protocole (une requête JSON par ligne sur stdin, une réponse par ligne sur stdout):
+    {"id": 1, "method": "nlp", "params": {"text": "..."}}
+    {"id": 2, "method": "ner", "params": {"text": "...", "resolve": true, "collapse": true, "layout": "columns"}}
+    {"id": 5, "method": "ner_batch", "params": {"texts": ["...", "..."]}}
+    {"id": 6, "method": "ner", "params": {"text": "...", "document_budget": 0.5, "pattern_budget": 0.2}}
+    {"id": 3, "method": "health"}
+    {"id": 4, "method": "shutdown"}
+Réponses: {"id": 1, "ok": true, "result": {...}} ou {"id": 1, "ok": false, "error": "..."}
+Les réponses peuvent arriver dans le désordre: le client les associe par "id".
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+import importlib.util
+import multiprocessing.util
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .nlp_analyzer import NLPAnalyzer
+    from .analysis_cache import AnalysisCache
+    from .analysis_metrics import AnalysisMetrics, per_process_path
+except ImportError:
+    from nlp_analyzer import NLPAnalyzer
+    from analysis_cache import AnalysisCache
+    from analysis_metrics import AnalysisMetrics, per_process_path
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_NER_PATH = os.path.join(REPO_ROOT, 'osint-tools-advanced', 'services', 'ner-french-enhanced.py')
+
+# Moteurs chargés une fois par processus (processus principal ou worker du pool)
+_engines: Dict[str, Any] = {}
+
+def load_french_ner(path: str):
+    """Charge la classe FrenchNER depuis le script ner-french-enhanced.py"""
+    services_dir = os.path.dirname(os.path.abspath(path))
+    if services_dir not in sys.path:
+        sys.path.insert(0, services_dir)
+    spec = importlib.util.spec_from_file_location('ner_french_enhanced', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.FrenchNER
+
+def init_engines(ner_path: str = DEFAULT_NER_PATH, cache_size: int = 0, lexicon_path: Optional[str] = None,
+                 metrics_path: Optional[str] = None, model_path: Optional[str] = None, fuzzy: bool = False,
+                 gazetteer_path: Optional[str] = None, ner_profile_path: Optional[str] = None):
+    """Instancie NLPAnalyzer et FrenchNER (patterns compilés une seule fois)"""
+    cache = AnalysisCache(max_entries=cache_size) if cache_size > 0 else None
+    metrics = AnalysisMetrics(export_path=metrics_path) if metrics_path else None
+    if metrics is not None:
+        # Dernier export à la sortie d'un processus du pool (atexit n'y est pas exécuté)
+        multiprocessing.util.Finalize(None, metrics.export, exitpriority=10)
+    _engines['nlp'] = NLPAnalyzer(cache=cache, lexicon_path=lexicon_path, metrics=metrics, model_path=model_path,
+                                  fuzzy=fuzzy)
+    # Gazetteer de noms projeté en mémoire: pages partagées entre les processus du pool
+    _engines['ner'] = load_french_ner(ner_path)(gazetteer_path=gazetteer_path)
+    if ner_profile_path:
+        # Temps / correspondances / rejets par pattern, export Prometheus périodique
+        _engines['ner'].enable_profiling(export_path=ner_profile_path)
+        # Dernier export à la sortie d'un processus du pool (atexit n'y est pas exécuté)
+        multiprocessing.util.Finalize(None, _engines['ner'].profile.export, exitpriority=10)
+
+def run_method(method: str, params: Dict[str, Any]) -> Any:
+    """Exécute une méthode d'analyse dans le processus courant"""
+    # Options facultatives de 'ner': chevauchements résolus, valeurs répétées fusionnées, format colonnes
+    options: Dict[str, Any] = {name: True for name in ('resolve', 'collapse') if params.get(name)}
+    if params.get('layout'):
+        options['layout'] = params['layout']
+    # Budgets de temps en secondes: latence bornée, résultat partiel marqué 'truncated'
+    for name in ('document_budget', 'pattern_budget'):
+        if params.get(name) is not None:
+            options[name] = float(params[name])
+    if method == 'ner_batch':
+        # Textes courts (commentaires, tweets) analysés en un seul passage
+        texts = params.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise ValueError("params.texts must be a list of strings")
+        return _engines['ner'].process_batch(texts, **options)
+    text = params.get('text')
+    if not isinstance(text, str):
+        raise ValueError("params.text must be a string")
+    if method == 'nlp':
+        return _engines['nlp'].analyze_content(text).to_dict()
+    if method == 'ner':
+        return _engines['ner'].process_document(text, **options)
+    raise ValueError(f"Unknown method: {method}")
+
+class PreintelWorker:
+    """Boucle JSON-lines: lit stdin, distribue aux moteurs, écrit les réponses sur stdout"""
+
+    def __init__(self, jobs: int = 1, ner_path: str = DEFAULT_NER_PATH, cache_size: int = 0,
+                 lexicon_path: Optional[str] = None, metrics_path: Optional[str] = None,
+                 model_path: Optional[str] = None, fuzzy: bool = False, gazetteer_path: Optional[str] = None,
+                 ner_profile_path: Optional[str] = None, stdin=None, stdout=None):
+        self.jobs = max(1, jobs)
+        self.ner_path = ner_path
+        self.cache_size = cache_size
+        self.lexicon_path = lexicon_path
+        # Un fichier par processus du pool
+        self.metrics_path = per_process_path(metrics_path) if metrics_path and self.jobs > 1 else metrics_path
+        self.model_path = model_path
+        self.fuzzy = fuzzy
+        self.gazetteer_path = gazetteer_path
+        # Un fichier par processus du pool
+        self.ner_profile_path = (per_process_path(ner_profile_path) if ner_profile_path and self.jobs > 1
+                                 else ner_profile_path)
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.started_at = time.time()
+        self.served = 0
+        self.failed = 0
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+        self._executor: Optional[Executor] = None
+
+    def _create_executor(self) -> Executor:
+        if self.jobs == 1:
+            # Un seul thread de calcul: les moteurs vivent dans le processus principal
+            init_engines(self.ner_path, self.cache_size, self.lexicon_path, self.metrics_path, self.model_path,
+                         self.fuzzy, self.gazetteer_path, self.ner_profile_path)
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=init_engines,
+                                   initargs=(self.ner_path, self.cache_size, self.lexicon_path, self.metrics_path,
+                                             self.model_path, self.fuzzy, self.gazetteer_path,
+                                             self.ner_profile_path))
+
+    def _write(self, payload: Dict[str, Any]):
+        line = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self.stdout.write(line + '\n')
+            self.stdout.flush()
+
+    def health(self) -> Dict[str, Any]:
+        """État du worker"""
+        with self._lock:
+            return {
+                'status': 'stopping' if self._stopping.is_set() else 'ok',
+                'pid': os.getpid(),
+                'jobs': self.jobs,
+                'uptime_s': round(time.time() - self.started_at, 3),
+                'served': self.served,
+                'failed': self.failed,
+                'pending': self.pending,
+            }
+
+    def _on_done(self, request_id, future):
+        try:
+            payload = {'id': request_id, 'ok': True, 'result': future.result()}
+            failed = 0
+        except Exception as e:
+            payload = {'id': request_id, 'ok': False, 'error': str(e)}
+            failed = 1
+        self._write(payload)
+        with self._lock:
+            self.served += 1
+            self.failed += failed
+            self.pending -= 1
+            self._idle.notify_all()
+
+    def handle_line(self, line: str):
+        """Traite une ligne de requête"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self._write({'id': None, 'ok': False, 'error': f"Invalid JSON: {e}"})
+            return
+        if not isinstance(request, dict):
+            self._write({'id': None, 'ok': False, 'error': "Invalid request: expected a JSON object"})
+            return
+
+        request_id = request.get('id')
+        method = request.get('method')
+
+        if method == 'health':
+            self._write({'id': request_id, 'ok': True, 'result': self.health()})
+            return
+        if method == 'shutdown':
+            self._stopping.set()
+            self._write({'id': request_id, 'ok': True, 'result': {'status': 'stopping'}})
+            return
+        if self._stopping.is_set():
+            self._write({'id': request_id, 'ok': False, 'error': 'Worker is shutting down'})
+            return
+
+        with self._lock:
+            self.pending += 1
+        future = self._executor.submit(run_method, method, request.get('params') or {})
+        future.add_done_callback(lambda f: self._on_done(request_id, f))
+
+    def stop(self, *_):
+        """Demande un arrêt propre (les requêtes en cours sont terminées)"""
+        self._stopping.set()
+
+    def _on_signal(self, signum, frame):
+        # Interrompt la lecture bloquante de stdin; serve() draine ensuite les requêtes en cours
+        self.stop()
+        raise SystemExit(0)
+
+    def serve(self):
+        """Sert les requêtes jusqu'à EOF, 'shutdown' ou SIGTERM"""
+        self._executor = self._create_executor()
+        self._write({'id': None, 'ok': True, 'result': {'event': 'ready', **self.health()}})
+        try:
+            for line in self.stdin:
+                if line.strip():
+                    self.handle_line(line)
+                if self._stopping.is_set():
+                    break
+        finally:
+            with self._idle:
+                while self.pending:
+                    self._idle.wait()
+            self._executor.shutdown(wait=True)
+            # Export final (processus principal uniquement; les processus du pool exportent périodiquement)
+            if 'nlp' in _engines and _engines['nlp'].metrics is not None:
+                _engines['nlp'].metrics.export()
+            if 'ner' in _engines and _engines['ner'].profile is not None:
+                _engines['ner'].profile.export()
+
+def main():
+    parser = argparse.ArgumentParser(description="AURA preintel worker (JSON-lines sur stdin/stdout)")
+    parser.add_argument('--jobs', type=int, default=int(os.environ.get('AURA_PREINTEL_JOBS', '1')),
+                        help="Nombre de requêtes traitées en parallèle (processus)")
+    parser.add_argument('--ner-path', default=os.environ.get('AURA_NER_PATH', DEFAULT_NER_PATH),
+                        help="Chemin de ner-french-enhanced.py")
+    parser.add_argument('--cache-size', type=int, default=int(os.environ.get('AURA_NLP_CACHE_SIZE', '0')),
+                        help="Taille du cache de résultats NLP par processus (0 = désactivé)")
+    parser.add_argument('--lexicon', default=os.environ.get('AURA_NLP_LEXICON'),
+                        help="Lexique binaire précompilé (lexicon_store.py build)")
+    parser.add_argument('--metrics-file', default=os.environ.get('AURA_PREINTEL_METRICS_FILE'),
+                        help="Export Prometheus des métriques NLP ({pid} remplacé par le PID du processus, "
+                             "ajouté automatiquement avec --jobs > 1)")
+    parser.add_argument('--model', default=os.environ.get('AURA_NLP_MODEL'),
+                        help="Modèle rapide n-grammes hachés (hashing_model.py train) utilisé pour 'nlp'")
+    parser.add_argument('--fuzzy', action='store_true', default=os.environ.get('AURA_NLP_FUZZY') == '1',
+                        help="Détection approchée des mots-clés obfusqués (homoglyphes, séparateurs, fautes)")
+    parser.add_argument('--name-gazetteer', default=os.environ.get('AURA_NER_GAZETTEER'),
+                        help="Gazetteer prénoms/noms pour 'ner' (osint-tools-advanced/services/name_gazetteer.py build)")
+    parser.add_argument('--ner-profile-file', default=os.environ.get('AURA_NER_PROFILE_FILE'),
+                        help="Active le profilage FrenchNER par pattern, export Prometheus ({pid} remplacé par le PID, "
+                             "ajouté automatiquement avec --jobs > 1)")
+    args = parser.parse_args()
+
+    worker = PreintelWorker(jobs=args.jobs, ner_path=args.ner_path, cache_size=args.cache_size,
+                            lexicon_path=args.lexicon, metrics_path=args.metrics_file, model_path=args.model, fuzzy=args.fuzzy,
+                            gazetteer_path=args.name_gazetteer, ner_profile_path=args.ner_profile_file)
+    signal.signal(signal.SIGTERM, worker._on_signal)
+    worker.serve()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+AURA OSINT - Transcript Stream
+Analyse fenêtrée de longs textes (transcriptions vidéo, fils de discussion) en flux
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:  # import en tant que paquet (backend.core) ou via sys.path (gateway)
+    from .keyword_automaton import KeywordMatch
+except ImportError:
+    from keyword_automaton import KeywordMatch
+
+DEFAULT_WINDOW_CHARS = 64 * 1024
+
+@dataclass
+class TranscriptWindow:
+    """Détections d'une fenêtre, positions absolues dans le texte brut"""
+    index: int
+    start: int
+    end: int
+    matches: List[KeywordMatch] = field(default_factory=list)
+    result: Any = None  # AnalysisResult cumulé depuis le début du flux
+
+class StreamingNormalizer:
+    """Équivalent en flux de NLPAnalyzer._normalize_text
+
+    Minuscules, réduction des caractères répétés 3 fois ou plus et leet speak, appliqués
+    morceau par morceau: une répétition en fin de morceau est retenue jusqu'au suivant.
+    Des ancres (position normalisée, position brute) permettent de ramener chaque
+    position normalisée à sa position absolue dans le texte d'origine.
+    """
+
+    def __init__(self, repeated_chars, leet_table, keep_back: int = 0):
+        self.repeated_chars = repeated_chars
+        self.leet_table = leet_table
+        self.keep_back = keep_back  # positions normalisées à conserver en arrière (longueur max d'un mot-clé)
+        self.raw_pos = 0            # position brute du début de _pending
+        self.norm_pos = 0           # nombre de caractères normalisés émis
+        self._pending = ''
+        self._collapsed: Optional[str] = None  # dernier caractère émis issu d'une répétition réduite
+        self._anchors: List[Tuple[int, int]] = [(0, 0)]
+        self._anchor_norm: List[int] = [0]
+
+    def _add_anchor(self, norm: int, raw: int):
+        if self._anchors[-1][0] == norm:
+            self._anchors[-1] = (norm, raw)
+        else:
+            self._anchors.append((norm, raw))
+            self._anchor_norm.append(norm)
+
+    def _trim_anchors(self, window_start: int):
+        # Seules les ancres utiles aux occurrences à cheval sur la fenêtre précédente sont gardées
+        bound = window_start - self.keep_back
+        cut = bisect_right(self._anchor_norm, bound) - 1
+        if cut > 0:
+            del self._anchors[:cut]
+            del self._anchor_norm[:cut]
+
+    def to_raw(self, norm: int) -> int:
+        """Position brute absolue d'une position normalisée"""
+        i = bisect_right(self._anchor_norm, norm) - 1
+        anchor_norm, anchor_raw = self._anchors[max(i, 0)]
+        return anchor_raw + (norm - anchor_norm)
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        """Normalise un morceau; retourne le texte normalisé prêt à être parcouru"""
+        buf = self._pending + chunk
+        raw_base = self.raw_pos
+
+        lowered = buf.lower()
+        raw_map = None
+        if len(lowered) != len(buf):
+            # Rare: minuscule de longueur différente (ex. 'İ'), correspondance caractère par caractère
+            parts = []
+            raw_map = []
+            for i, ch in enumerate(buf):
+                low = ch.lower()
+                parts.append(low)
+                raw_map.extend([i] * len(low))
+            lowered = ''.join(parts)
+            raw_map.append(len(buf))
+
+        def raw_of(i: int) -> int:
+            return raw_base + (raw_map[i] if raw_map is not None else i)
+
+        # Suite d'une répétition déjà réduite au morceau précédent
+        start = 0
+        if self._collapsed is not None:
+            while start < len(lowered) and lowered[start] == self._collapsed:
+                start += 1
+            if start == len(lowered) and not final:
+                self.raw_pos = raw_base + len(buf)
+                self._pending = ''
+                return ''
+        collapsed, self._collapsed = self._collapsed, None
+
+        # Répétition en fin de morceau: retenue si elle peut encore atteindre 3 caractères
+        stop = len(lowered)
+        while not final and stop > start:
+            last = lowered[stop - 1]
+            run = stop - 1
+            while run > start and lowered[run - 1] == last:
+                run -= 1
+            if last != '\n' and stop - run < 3:
+                stop = run
+            if raw_map is None:
+                break
+            # Coupure au début d'un caractère brut, pas au milieu de sa minuscule ('İ' → 'i̇'):
+            # la répétition qui précède alors la coupure est vérifiée à son tour
+            snapped = stop
+            while snapped > start and raw_map[snapped - 1] == raw_map[snapped]:
+                snapped -= 1
+            if snapped == stop:
+                break
+            stop = snapped
+        if stop == start:
+            # Rien d'émis: le morceau retenu repasse par la suite de la répétition au prochain appel
+            self._collapsed = collapsed
+
+        segment = lowered[start:stop]
+        spans = [m.span() for m in self.repeated_chars.finditer(segment)]
+        ends, removed_after = [], []
+        removed = 0
+        for s, e in spans:
+            removed += e - s - 1
+            ends.append(e)
+            removed_after.append(removed)
+
+        def norm_of(k: int) -> int:
+            i = bisect_right(ends, k)
+            return self.norm_pos + k - (removed_after[i - 1] if i else 0)
+
+        anchors = [(self.norm_pos, raw_of(start))]
+        anchors.extend((norm_of(e), raw_of(start + e)) for _, e in spans)
+        if raw_map is not None:
+            for k in range(1, len(segment)):
+                j = start + k
+                if raw_map[j] != raw_map[j - 1] + 1:
+                    i = bisect_right(ends, k)
+                    if i < len(spans) and spans[i][0] < k:
+                        continue  # caractère supprimé par une réduction
+                    anchors.append((norm_of(k), raw_of(j)))
+            anchors.sort()
+        for norm, raw in anchors:
+            self._add_anchor(norm, raw)
+
+        pieces = []
+        prev = 0
+        for s, e in spans:
+            pieces.append(segment[prev:s + 1])
+            prev = e
+        pieces.append(segment[prev:])
+        if spans and spans[-1][1] == len(segment):
+            self._collapsed = segment[spans[-1][0]]
+
+        if stop < len(lowered):
+            self._pending = buf[(raw_map[stop] if raw_map is not None else stop):]
+        else:
+            self._pending = ''
+        self.raw_pos = raw_base + len(buf) - len(self._pending)
+        self._trim_anchors(self.norm_pos)
+        self.norm_pos = norm_of(len(segment))
+        return ''.join(pieces).translate(self.leet_table)
+
+def iter_chunks(source: Union[str, Iterable[str], Any], window_chars: int) -> Iterator[str]:
+    """Découpe une source (chaîne, itérable de chaînes ou fichier texte) en morceaux"""
+    if isinstance(source, str):
+        for i in range(0, len(source), window_chars):
+            yield source[i:i + window_chars]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(window_chars)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
+
+def iter_transcript_windows(analyzer, normalizer: StreamingNormalizer, source,
+                            window_chars: int = DEFAULT_WINDOW_CHARS) -> Iterator[TranscriptWindow]:
+    """Analyse un long texte fenêtre par fenêtre avec NLPAnalyzer
+
+    L'état de l'automate est conservé d'une fenêtre à l'autre: un mot-clé à cheval sur
+    deux fenêtres est trouvé (et rapporté dans la fenêtre où il se termine). La mémoire
+    reste bornée par la taille de fenêtre et la première détection est émise dès la
+    fenêtre qui la contient.
+    """
+    matcher = analyzer._matcher
+    entries = matcher.entries
+    category_ids = matcher.entry_category_ids
+
+    state = 0
+    seen = set()
+    mask = 0
+    index = 0
+    raw_start = 0
+    chunks = iter_chunks(source, window_chars)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        following = next(chunks, None)
+        final = following is None
+        norm_base = normalizer.norm_pos
+        normalized = normalizer.feed(chunk, final=final)
+        found, state = matcher.scan_from(normalized, state, norm_base)
+
+        matches = []
+        for entry_id, start, end in found:
+            if entry_id not in seen:
+                seen.add(entry_id)
+                mask |= 1 << category_ids[entry_id]
+            keyword, category = entries[entry_id]
+            matches.append(KeywordMatch(
+                keyword=keyword,
+                category=category,
+                start=normalizer.to_raw(start),
+                end=normalizer.to_raw(end - 1) + 1
+            ))
+
+        yield TranscriptWindow(
+            index=index,
+            start=raw_start,
+            end=normalizer.raw_pos,
+            matches=matches,
+            result=analyzer._build_result(mask, tuple(sorted(seen)))
+        )
+        index += 1
+        raw_start = normalizer.raw_pos
+        chunk = following
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+AURA Name Gazetteer - memory-mapped first-name / last-name frequency tables for FrenchNER
+
+Names are stored as sorted UTF-8 keys (accent-free, upper case) with their
+occurrence counts, one table per kind ('first', 'last'). Lookups are a binary
+search directly in the mapped file: loading takes milliseconds whatever the
+size, and the pages are shared between the worker processes.
+
+Usage:
+    python3 name_gazetteer.py build --first nat2022.csv --last noms2008nat_txt.txt -o names.auragaz
+    python3 name_gazetteer.py info names.auragaz
+    python3 name_gazetteer.py lookup names.auragaz Jean MARTIN
+
+Sources: CSV/TSV with a header (INSEE first-name file: sexe;preusuel;annais;nombre,
+INSEE last-name file: NOM + one count column per decade) or a plain list, one name per line.
+"""
+
+import os
+import sys
+import csv
+import json
+import math
+import mmap
+import struct
+import argparse
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b'AURAGAZ\0'
+FORMAT_VERSION = 1
+KINDS = ('first', 'last')
+
+# Sections (u32 tables except meta and blobs), in write order
+SECTIONS = ('meta', 'first_offsets', 'first_blob', 'first_counts', 'last_offsets', 'last_blob', 'last_counts')
+
+# magic, version, byte order, number of sections, then (offset, size) per section
+HEADER = struct.Struct('<8sIBxxxI')
+SECTION_ENTRY = struct.Struct('<QQ')
+
+NAME_COLUMNS = ('preusuel', 'prenom', 'prénom', 'nom', 'patronyme', 'name', 'first_name', 'last_name')
+COUNT_COLUMNS = ('nombre', 'count', 'frequency', 'freq', 'effectif')
+LIGATURES = str.maketrans({'Œ': 'OE', 'Æ': 'AE'})
+
+def name_key(name: str) -> str:
+    """Lookup key of a name: upper case, without accents ('Françoise' -> 'FRANCOISE')"""
+    decomposed = unicodedata.normalize('NFKD', name.strip())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).upper().translate(LIGATURES)
+
+def read_name_counts(path: str) -> Dict[str, int]:
+    """Read a name source file and aggregate counts by key"""
+    counts: Dict[str, int] = {}
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        header = f.readline()
+        delimiter = next((d for d in (';', '\t', ',') if d in header), None)
+        if delimiter is None:
+            # Plain list: one name per line, the first line included
+            for line in [header] + f.readlines():
+                key = name_key(line)
+                if key:
+                    counts[key] = counts.get(key, 0) + 1
+            return counts
+
+        fields = [h.strip() for h in next(csv.reader([header], delimiter=delimiter))]
+        lowered = [h.lower() for h in fields]
+        name_col = next((lowered.index(c) for c in NAME_COLUMNS if c in lowered), 0)
+        count_cols = [i for i, h in enumerate(lowered) if h in COUNT_COLUMNS]
+        if not count_cols:
+            # INSEE last names: one column per decade ('_1891_1900', ...)
+            count_cols = [i for i, h in enumerate(fields) if h.startswith('_')]
+
+        for row in csv.reader(f, delimiter=delimiter):
+            if len(row) <= name_col:
+                continue
+            name = row[name_col].strip()
+            if not name or name.startswith('_'):  # '_PRENOMS_RARES' and similar aggregates
+                continue
+            total = 0
+            for i in count_cols:
+                try:
+                    total += int(float(row[i]))
+                except (IndexError, ValueError):
+                    pass
+            key = name_key(name)
+            counts[key] = counts.get(key, 0) + (total if count_cols else 1)
+    return counts
+
+def write_gazetteer(path: str, names: Dict[str, Dict[str, int]], sources: Optional[Dict[str, List[str]]] = None) -> Dict:
+    """Write the gazetteer file from {'first': {key: count}, 'last': {key: count}}, return its meta"""
+    meta = {'kinds': {}, 'sources': sources or {}}
+    payloads: Dict[str, bytes] = {}
+    for kind in KINDS:
+        merged: Dict[bytes, int] = {}
+        for name, count in (names.get(kind) or {}).items():
+            key = name_key(name).encode('utf-8')
+            if key and count > 0:
+                merged[key] = merged.get(key, 0) + count
+        encoded = sorted(merged.items())
+        blob = bytearray()
+        offsets, counts = array('I', [0]), array('I')
+        for key, count in encoded:
+            blob += key
+            offsets.append(len(blob))
+            counts.append(min(count, 0xFFFFFFFF))
+        payloads[f'{kind}_offsets'] = offsets.tobytes()
+        payloads[f'{kind}_blob'] = bytes(blob)
+        payloads[f'{kind}_counts'] = counts.tobytes()
+        meta['kinds'][kind] = {'entries': len(encoded), 'max_count': max(counts) if counts else 0}
+    payloads['meta'] = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+    # Sections aligned on 8 bytes for valid memoryview.cast('I') views
+    offset = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    table = []
+    for name in SECTIONS:
+        offset = (offset + 7) & ~7
+        table.append((offset, len(payloads[name])))
+        offset += len(payloads[name])
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0 if sys.byteorder == 'little' else 1, len(SECTIONS)))
+        for entry in table:
+            f.write(SECTION_ENTRY.pack(*entry))
+        for name, (start, _) in zip(SECTIONS, table):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp, path)
+    return meta
+
+class NameGazetteer:
+    """Read-only name gazetteer opened with mmap (O(log n) lookups, shared between processes)"""
+
+    def __init__(self, path: str, cache_size: int = 50000):
+        self.path = path
+        self.cache_size = cache_size
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, byteorder, n_sections = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an AURA name gazetteer")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported gazetteer format version {version}")
+        if byteorder != (0 if sys.byteorder == 'little' else 1):
+            raise ValueError(f"{path}: gazetteer was built on a machine with a different byte order")
+        if n_sections != len(SECTIONS):
+            raise ValueError(f"{path}: corrupted section table")
+
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        self._tables: Dict[str, memoryview] = {}
+        for i, name in enumerate(SECTIONS):
+            start, size = SECTION_ENTRY.unpack_from(view, HEADER.size + i * SECTION_ENTRY.size)
+            self._sections[name] = (start, size)
+            if not name.endswith(('meta', 'blob')):
+                self._tables[name] = view[start:start + size].cast('I')
+
+        meta_start, meta_size = self._sections['meta']
+        self.meta = json.loads(self._mmap[meta_start:meta_start + meta_size].decode('utf-8'))
+        self._log_max = {kind: math.log1p(self.meta['kinds'][kind]['max_count']) for kind in KINDS}
+        self._cache: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return sum(self.meta['kinds'][kind]['entries'] for kind in KINDS)
+
+    def count(self, kind: str, name: str) -> int:
+        """Occurrence count of a name ('first' or 'last'), 0 if unknown"""
+        cached = self._cache.get((kind, name))
+        if cached is not None:
+            return cached
+        key = name_key(name).encode('utf-8')
+        offsets = self._tables[f'{kind}_offsets']
+        blob_start = self._sections[f'{kind}_blob'][0]
+        data = self._mmap
+        lo, hi = 0, len(offsets) - 1
+        found = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = data[blob_start + offsets[mid]:blob_start + offsets[mid + 1]]
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                found = self._tables[f'{kind}_counts'][mid]
+                break
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[(kind, name)] = found
+        return found
+
+    def weight(self, kind: str, name: str) -> float:
+        """Frequency weight in [0.5, 1] for a known name (log scale), 0.0 if unknown"""
+        found = self.count(kind, name)
+        if not found:
+            return 0.0
+        log_max = self._log_max[kind]
+        return round(0.5 + 0.5 * math.log1p(found) / log_max, 3) if log_max else 1.0
+
+    def names(self, kind: str) -> Iterable[Tuple[str, int]]:
+        """All (key, count) pairs of a kind, in key order"""
+        offsets = self._tables[f'{kind}_offsets']
+        counts = self._tables[f'{kind}_counts']
+        blob_start = self._sections[f'{kind}_blob'][0]
+        for i in range(len(counts)):
+            yield self._mmap[blob_start + offsets[i]:blob_start + offsets[i + 1]].decode('utf-8'), counts[i]
+
+    def close(self):
+        self._tables.clear()
+        self._cache.clear()
+        self._mmap.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / inspect AURA name gazetteers")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="Build a gazetteer from first-name / last-name sources")
+    build.add_argument('--first', action='append', default=[], help="First-name source (repeatable)")
+    build.add_argument('--last', action='append', default=[], help="Last-name source (repeatable)")
+    build.add_argument('-o', '--output', required=True, help="Gazetteer file to write")
+
+    info = sub.add_parser('info', help="Show the gazetteer header")
+    info.add_argument('gazetteer', help="Gazetteer file")
+
+    lookup = sub.add_parser('lookup', help="Look up names (first name, then last name)")
+    lookup.add_argument('gazetteer', help="Gazetteer file")
+    lookup.add_argument('names', nargs='+', help="Names to look up")
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        names: Dict[str, Dict[str, int]] = {}
+        sources: Dict[str, List[str]] = {}
+        for kind in KINDS:
+            table: Dict[str, int] = {}
+            for path in getattr(args, kind):
+                for key, count in read_name_counts(path).items():
+                    table[key] = table.get(key, 0) + count
+            names[kind] = table
+            sources[kind] = [os.path.basename(p) for p in getattr(args, kind)]
+        meta = write_gazetteer(args.output, names, sources)
+        summary = ', '.join(f"{meta['kinds'][k]['entries']} {k} names" for k in KINDS)
+        print(f"[gazetteer] {args.output}: {summary}")
+    elif args.command == 'info':
+        gazetteer = NameGazetteer(args.gazetteer)
+        print(json.dumps({**gazetteer.meta, 'size_bytes': os.path.getsize(args.gazetteer)}, ensure_ascii=False, indent=2))
+        gazetteer.close()
+    else:
+        gazetteer = NameGazetteer(args.gazetteer)
+        for name in args.names:
+            print(json.dumps({'name': name, **{kind: {'count': gazetteer.count(kind, name),
+                                                      'weight': gazetteer.weight(kind, name)} for kind in KINDS}},
+                             ensure_ascii=False))
+        gazetteer.close()
+
+if __name__ == '__main__':
+    main()
@@ -4,24 +4,477 @@ AURA French NER v2.0 - Enhanced Named Entity Recognition for French OSINT
 Extracts: SIREN/SIRET (Luhn validated), phones (E.164), emails, addresses, persons, companies
 """
 
+import os
 import re
 import json
 import sys
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
+import time
+import argparse
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, TextIO, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optional: SIREN/SIRET candidates are then checked one by one
+    np = None
+
+from name_gazetteer import NameGazetteer, name_key
+from segment_cache import SegmentCache, segment_key
+from ner_profile import NERProfile, TimedPattern
+
+# Single-pass anchor scan for the structured patterns: '+' (international phones),
+# '@' (emails), 'FR' (IBAN, VAT) and digit clusters (SIREN, SIRET, phones, postal codes, NAF).
+# A digit cluster is a maximal run of digits and [\s.-] separators, plus an optional
+# trailing capital letter: no numeric pattern can match across two clusters.
+STRUCTURED_ANCHORS = re.compile(r'\+|@|\bFR|\d(?:[\d\s.-]*\d)?[A-Z]?')
+
+# Numeric pattern types searched inside digit clusters, with their minimal match length
+CLUSTER_TYPES = {'siren': 9, 'siret': 14, 'phone_fr': 10, 'postal_code': 5, 'naf_ape': 5}
+
+EMAIL_LOCAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+EMAIL_DOMAIN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-')
+
+# Address patterns, written so that re never backtracks more than linearly: a number is
+# only tried at the start of a digit run, whitespace runs are consumed in one way only, and
+# the street part between the street type and the postal code is bounded
+ADDRESS_STREET_MAX_CHARS = 200
+ADDRESS_WITH_POSTAL_CODE = (
+    r'(?<!\d)\d+(?:\s+(?:bis|ter|quater))?\s+(?:rue|avenue|boulevard|place|impasse|allée|chemin|route)'
+    rf'\s+[^,\s][^,\n]{{0,{ADDRESS_STREET_MAX_CHARS}}}?(?<=\S)\s+\d{{5}}\s+[A-Za-zÀ-ÿ\s-]+'
+)
+ADDRESS_STREET = r'(?<!\d)\d+\s+(?:(?:bis|ter)\s*)?(?:rue|av\.?|bd\.?|pl\.|imp\.)\s+[^,\n]+'
+
+# SIREN/SIRET: separators allowed between digit groups, digit sum of a doubled Luhn digit
+SIREN_SEPARATORS = re.compile(r'[\s.-]')
+LUHN_DOUBLED = {str(d): (2 * d if d < 5 else 2 * d - 9) for d in range(10)}
+LUHN_DOUBLED_NP = np.array([2 * d if d < 5 else 2 * d - 9 for d in range(10)], dtype=np.uint8) if np is not None else None
+LUHN_BATCH_MIN = 32       # below this many new candidates, NumPy costs more than the Python loop
+LUHN_CACHE_SIZE = 100000  # known-valid / known-invalid numbers kept per FrenchNER
+
+def _ascii_digits(number: str) -> str:
+    # '\d' also matches non-ASCII decimal digits ('٣'): map them to ASCII
+    return number if number.isascii() else ''.join(str(int(d)) for d in number)
+
+def _is_word(ch: str) -> bool:
+    """Word character in the sense of re's \\b (str patterns)"""
+    return ch.isalnum() or ch == '_'
+
+def _luhn_np(digits) -> 'np.ndarray':
+    """Luhn check of each row of a (n, length) digit matrix"""
+    length = digits.shape[1]
+    doubled = (length - 1 - np.arange(length)) % 2 == 1
+    values = np.where(doubled, LUHN_DOUBLED_NP[digits], digits)
+    return values.sum(axis=1, dtype=np.int64) % 10 == 0
+
+# Streaming mode: characters read per chunk, and characters re-scanned on each side of a
+# chunk boundary (entities and the context they depend on must fit in the overlap)
+DEFAULT_CHUNK_CHARS = 1 << 20
+DEFAULT_OVERLAP_CHARS = 4096
+
+# Bounded mode (extract_bounded): each extraction stage runs over windows of this many
+# characters, the time budgets being checked between two windows
+BOUNDED_WINDOW_CHARS = 1 << 16
+
+# Micro-batch mode: texts are joined with a separator no pattern can match or cross
+# (every pattern is built from character classes excluding ','), which also behaves like
+# the start / end of a text for \b, lookarounds and the company name runs
+BATCH_SEPARATOR = ','
+
+# Incremental mode: documents are split into paragraphs (blank-line separated segments),
+# each cached by content. Bump SEGMENT_CACHE_VERSION when extraction results change.
+SEGMENT_BREAK = re.compile(r'\n[ \t\r\f\v]*\n')
+SEGMENT_CACHE_VERSION = 1
+
+# Overlap resolution: the most specific type wins (a SIRET over the SIREN and postal code it
+# contains, a phone over a postal code), then the highest confidence, then the longest span
+TYPE_PRIORITY = {
+    'siret': 10, 'iban_fr': 9, 'tva_fr': 9, 'email': 8, 'phone_intl': 7, 'phone_fr': 7, 'siren': 6,
+    'address': 5, 'company': 4, 'person': 3, 'naf_ape': 2, 'postal_code': 1
+}
+
+# Company names: a capitalized word followed by letters, spaces, '&', apostrophes, hyphens
+COMPANY_NAME_START = re.compile(r'\b[A-ZÀ-Ÿ]')
+COMPANY_NAME_RUN = re.compile(r"[a-zA-ZÀ-ÿ\s&'-]+")
+
+def build_alternation(words: Iterable[str]) -> str:
+    """Regex alternation of literal words factored as a trie
+    
+    Matching cost depends on the word length, not on the number of words, and the
+    longest word wins at a given position ('SASU' before 'SAS' before 'SA').
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def to_regex(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + to_regex(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return to_regex(trie)
+
+def normalize_phone(value: str) -> str:
+    """Normalize French phone to E.164 format"""
+    clean = re.sub(r'[\s.-]', '', value)
+    if clean.startswith('0') and len(clean) == 10:
+        return '+33' + clean[1:]
+    elif clean.startswith('+33') and len(clean) == 12:
+        return clean
+    elif clean.startswith('33') and len(clean) == 11:
+        return '+' + clean
+    return clean
+
+def normalize_email(value: str) -> str:
+    """Normalize email to lowercase"""
+    return value.lower().strip()
+
+def normalize_iban(value: str) -> str:
+    """Normalize IBAN by removing spaces"""
+    return re.sub(r'\s', '', value.upper())
+
+def _siren_fields(value: str) -> Tuple[str, Dict]:
+    # Only validated numbers become entities
+    return SIREN_SEPARATORS.sub('', value), {'validated': True, 'luhn_check': True}
+
+def _phone_fields(value: str) -> Tuple[str, Dict]:
+    normalized = normalize_phone(value)
+    return normalized, {'format': 'E.164' if normalized.startswith('+33') else 'raw'}
+
+def _email_fields(value: str) -> Tuple[str, Dict]:
+    normalized = normalize_email(value)
+    return normalized, {'domain': normalized.split('@')[1] if '@' in normalized else None}
+
+def _iban_fields(value: str) -> Tuple[str, Dict]:
+    normalized = normalize_iban(value)
+    return normalized, {'country': 'FR', 'bank_code': normalized[4:9] if len(normalized) >= 9 else None}
+
+def _address_fields(value: str) -> Tuple[str, Dict]:
+    return value.strip(), {'pattern': 'french_address'}
+
+def _person_fields(value: str) -> Tuple[str, Dict]:
+    # 'Prénom NOM': two whitespace-free words
+    first_name, last_name = value.split()
+    return f"{first_name} {last_name}", {'first_name': first_name, 'last_name': last_name}
+
+def _plain_fields(value: str) -> Tuple[str, Dict]:
+    return value.strip(), {}
+
+# Span-based entities: (normalized, metadata) computed from the value on first access
+ENTITY_FIELDS = {
+    'siren': _siren_fields, 'siret': _siren_fields, 'phone_fr': _phone_fields, 'phone_intl': _phone_fields,
+    'email': _email_fields, 'iban_fr': _iban_fields, 'address': _address_fields, 'person': _person_fields,
+}
+
+# Bulk export: distinct (type, value) pairs whose fields are computed once per call
+EXPORT_MEMO_SIZE = 100000
 
-@dataclass
 class Entity:
-    type: str
-    value: str
-    normalized: str
-    confidence: float
-    start: int
-    end: int
-    metadata: Dict = field(default_factory=dict)
+    """An entity: type, span [start, end) in the text and confidence
+    
+    Entities built by FrenchNER are span-based: they keep a reference to the scanned
+    text instead of a copy of their value, and value, normalized and metadata are
+    computed on first access (ENTITY_FIELDS). normalized and metadata are then kept, so
+    changes to the metadata dict persist. Entities can also be built with explicit values.
+    """
+    __slots__ = ('type', 'confidence', 'start', 'end', '_source', '_source_start', '_value', '_normalized',
+                 '_metadata')
+
+    def __init__(self, type: str, value: Optional[str] = None, normalized: Optional[str] = None,
+                 confidence: float = 0.0, start: int = 0, end: int = 0, metadata: Optional[Dict] = None,
+                 source: Optional[str] = None):
+        self.type = type
+        self.confidence = confidence
+        self.start = start
+        self.end = end
+        # start and end may be shifted later (batch, streaming): the value stays at the original span
+        self._source = source
+        self._source_start = start
+        self._value = value
+        self._normalized = normalized
+        self._metadata = {} if metadata is None and source is None else metadata
+
+    @property
+    def value(self) -> str:
+        if self._value is not None:
+            return self._value
+        return self._source[self._source_start:self._source_start + self.end - self.start]
+
+    @value.setter
+    def value(self, value: str):
+        self._value = value
+
+    def _compute_fields(self):
+        normalized, metadata = ENTITY_FIELDS.get(self.type, _plain_fields)(self.value)
+        if self._normalized is None:
+            self._normalized = normalized
+        if self._metadata is None:
+            self._metadata = metadata
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._compute_fields()
+        return self._normalized
+
+    @normalized.setter
+    def normalized(self, normalized: str):
+        self._normalized = normalized
+
+    @property
+    def metadata(self) -> Dict:
+        if self._metadata is None:
+            self._compute_fields()
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict):
+        self._metadata = metadata
+
+    def detach(self) -> 'Entity':
+        """Copy the value out of the scanned text and drop the reference to it (returns self)"""
+        if self._source is not None:
+            self._value = self.value
+            self._source = None
+        return self
+
+    def _rebase(self, source: str, offset: int):
+        # Same characters read from source, a text in which the scanned one starts at offset
+        if self._source is not None:
+            self._source = source
+            self._source_start += offset
+
+    def replace(self, **changes) -> 'Entity':
+        """Copy with some fields changed (as dataclasses.replace); lazy fields stay lazy"""
+        entity = Entity.__new__(Entity)
+        for name in Entity.__slots__:
+            setattr(entity, name, getattr(self, name))
+        for name, value in changes.items():
+            setattr(entity, name, value)
+        return entity
+
+    def to_dict(self) -> Dict:
+        return {
+            'type': self.type,
+            'value': self.value,
+            'normalized': self.normalized,
+            'confidence': self.confidence,
+            'position': [self.start, self.end],
+            'metadata': self.metadata
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Entity):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Entity(type={self.type!r}, value={self.value!r}, confidence={self.confidence!r}, "
+                f"start={self.start!r}, end={self.end!r})")
+
+def _export_fields(entities: Iterable[Entity]) -> Iterator[Tuple[Entity, str, str, Dict]]:
+    """(entity, value, normalized, metadata) for many entities
+    
+    Fields of span-based entities not accessed yet are computed once per distinct
+    (type, value) instead of once per entity (thousands of identical postal codes, NAF
+    codes), without being stored on the entities. Metadata dicts may then be shared.
+    """
+    memo: Dict[Tuple[str, str], Tuple[str, Dict]] = {}
+    for entity in entities:
+        value = entity.value
+        if entity._normalized is None and entity._metadata is None:
+            key = (entity.type, value)
+            fields = memo.get(key)
+            if fields is None:
+                if len(memo) >= EXPORT_MEMO_SIZE:
+                    memo.clear()
+                fields = memo[key] = ENTITY_FIELDS.get(entity.type, _plain_fields)(value)
+            yield entity, value, fields[0], fields[1]
+        else:
+            yield entity, value, entity.normalized, entity.metadata
+
+def export_entities(entities: Iterable[Entity]) -> List[Dict]:
+    """Entity.to_dict for a whole result set, computing the lazy fields in bulk"""
+    return [{
+        'type': entity.type,
+        'value': value,
+        'normalized': normalized,
+        'confidence': entity.confidence,
+        'position': [entity.start, entity.end],
+        'metadata': metadata
+    } for entity, value, normalized, metadata in _export_fields(entities)]
+
+def resolve_overlaps(entities: List[Entity], priority: Optional[Dict[str, int]] = None) -> List[Entity]:
+    """Keep a set of non-overlapping entities, sorted by start
+    
+    Entities are considered from the strongest (type priority, confidence, length) to
+    the weakest; each one is kept unless it overlaps an already kept span. Kept spans
+    are disjoint, so only the kept neighbours in start order are checked; they are
+    found in a Fenwick tree over the start-sorted positions: O(n log n).
+    """
+    priority = TYPE_PRIORITY if priority is None else priority
+    n = len(entities)
+    by_start = sorted(range(n), key=lambda i: entities[i].start)
+    position = [0] * n
+    for pos, i in enumerate(by_start):
+        position[i] = pos
+    ranked = sorted(range(n), key=lambda i: (
+        -priority.get(entities[i].type, 0), -entities[i].confidence,
+        entities[i].start - entities[i].end, entities[i].start, i))
+    tree = [0] * (n + 1)
+    top = 1 << n.bit_length()
+
+    def count_before(pos: int) -> int:
+        # Kept entities at positions < pos
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def nth_kept(k: int) -> int:
+        # Position of the k-th kept entity in start order (k >= 1)
+        pos = 0
+        step = top
+        while step:
+            if pos + step <= n and tree[pos + step] < k:
+                pos += step
+                k -= tree[pos]
+            step >>= 1
+        return pos
+
+    kept = 0
+    kept_positions: List[int] = []
+    for i in ranked:
+        entity = entities[i]
+        end = max(entity.end, entity.start + 1)
+        pos = position[i]
+        before = count_before(pos)
+        if before:
+            previous = entities[by_start[nth_kept(before)]]
+            if max(previous.end, previous.start + 1) > entity.start:
+                continue
+        if before < kept and entities[by_start[nth_kept(before + 1)]].start < end:
+            continue
+        j = pos + 1
+        while j <= n:
+            tree[j] += 1
+            j += j & -j
+        kept += 1
+        kept_positions.append(pos)
+    return [entities[by_start[pos]] for pos in sorted(kept_positions)]
+
+def collapse_repeats(entities: List[Entity]) -> List[Entity]:
+    """Merge the entities sharing a type and normalized value into their first occurrence
+    
+    The merged entity keeps the highest confidence and lists every span in
+    metadata['occurrences'] ([start, end] pairs, in text order).
+    """
+    groups: Dict[Tuple[str, str], List[Entity]] = {}
+    for entity in entities:
+        groups.setdefault((entity.type, entity.normalized), []).append(entity)
+    collapsed = []
+    for entity in entities:
+        group = groups[(entity.type, entity.normalized)]
+        if group[0] is not entity:
+            continue
+        if len(group) == 1:
+            collapsed.append(entity)
+            continue
+        collapsed.append(entity.replace(
+            confidence=max(e.confidence for e in group),
+            metadata={**entity.metadata, 'occurrences': [[e.start, e.end] for e in group]}
+        ))
+    return collapsed
+
+def entities_to_columns(entities: List[Entity]) -> Dict:
+    """Columnar layout: parallel arrays per field, with interned tables
+    
+    'types' lists the entity types and 'strings' the distinct values and normalized
+    values; 'metadata' lists the distinct metadata dicts. The columns under 'entities'
+    hold indexes into these tables, plus start, end and confidence.
+    """
+    types: Dict[str, int] = {}
+    strings: Dict[str, int] = {}
+    metadata: Dict = {}
+    metadata_table: List[Dict] = []
+    type_ids, starts, ends, confidences, values, normalized, metadata_ids = [], [], [], [], [], [], []
+    high_confidence = validated = 0
+    for entity, value, normalized_value, entity_metadata in _export_fields(entities):
+        type_ids.append(types.setdefault(entity.type, len(types)))
+        starts.append(entity.start)
+        ends.append(entity.end)
+        confidences.append(entity.confidence)
+        values.append(strings.setdefault(value, len(strings)))
+        normalized.append(strings.setdefault(normalized_value, len(strings)))
+        try:
+            key = tuple(entity_metadata.items())
+            hash(key)
+        except TypeError:  # list values (occurrences)
+            key = json.dumps(entity_metadata, sort_keys=True)
+        metadata_id = metadata.get(key)
+        if metadata_id is None:
+            metadata_id = metadata[key] = len(metadata_table)
+            metadata_table.append(entity_metadata)
+        metadata_ids.append(metadata_id)
+        if entity.confidence > 0.8:
+            high_confidence += 1
+        if entity.type in ('siren', 'siret') and entity_metadata.get('validated'):
+            validated += 1
+    return {
+        'total_entities': len(type_ids),
+        'types': list(types),
+        'strings': list(strings),
+        'metadata': metadata_table,
+        'entities': {
+            'type': type_ids,
+            'start': starts,
+            'end': ends,
+            'confidence': confidences,
+            'value': values,
+            'normalized': normalized,
+            'metadata': metadata_ids
+        },
+        'high_confidence_count': high_confidence,
+        'validated_siren_siret': validated
+    }
+
+def columns_to_entities(columns: Dict) -> List[Entity]:
+    """Entities back from the columnar layout (entities_to_columns)"""
+    types, strings, metadata = columns['types'], columns['strings'], columns['metadata']
+    c = columns['entities']
+    return [
+        Entity(type=types[t], value=strings[v], normalized=strings[n], confidence=confidence,
+               start=start, end=end, metadata=metadata[m])
+        for t, start, end, confidence, v, n, m in zip(c['type'], c['start'], c['end'], c['confidence'],
+                                                       c['value'], c['normalized'], c['metadata'])
+    ]
+
+def read_chunks(stream: Union[TextIO, Iterable[str]], chunk_chars: int) -> Iterator[str]:
+    """Yield text chunks from a text file object (read by chunk_chars) or an iterable of strings"""
+    if hasattr(stream, 'read'):
+        while True:
+            chunk = stream.read(chunk_chars)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in stream:
+            if chunk:
+                yield chunk
 
 class FrenchNER:
-    def __init__(self):
+    def __init__(self, legal_forms: Optional[Iterable[str]] = None, gazetteer_path: Optional[str] = None,
+                 segment_cache_path: Optional[str] = None):
         # Enhanced French-specific patterns
         self.patterns = {
             'siren': re.compile(r'\b(\d{3})[\s.-]?(\d{3})[\s.-]?(\d{3})\b'),
@@ -34,11 +487,13 @@ class FrenchNER:
             'tva_fr': re.compile(r'\bFR\s?[A-Z0-9]{2}\s?\d{9}\b'),
             'naf_ape': re.compile(r'\b\d{4}[A-Z]\b'),  # Code NAF/APE
         }
+        # Patterns eligible for the fused scan (a replaced pattern falls back to its own finditer)
+        self._fused_patterns = dict(self.patterns)
         
         # Enhanced address patterns
         self.address_patterns = [
-            re.compile(r'\d+(?:\s+(?:bis|ter|quater))?\s+(?:rue|avenue|boulevard|place|impasse|allée|chemin|route)\s+[^,\n]+?\s+\d{5}\s+[A-Za-zÀ-ÿ\s-]+', re.IGNORECASE),
-            re.compile(r'\d+\s+(?:bis|ter)?\s*(?:rue|av\.?|bd\.?|pl\.|imp\.)\s+[^,\n]+', re.IGNORECASE)
+            re.compile(ADDRESS_WITH_POSTAL_CODE, re.IGNORECASE),
+            re.compile(ADDRESS_STREET, re.IGNORECASE)
         ]
         
         # Enhanced company suffixes with variations
@@ -47,6 +502,8 @@ class FrenchNER:
             'SCOP', 'SCIC', 'GIE', 'GEIE', 'Association', 'Fondation',
             'S\.A\.S\.', 'S\.A\.R\.L\.', 'S\.A\.', 'E\.U\.R\.L\.'
         ]
+        self.set_legal_forms(legal_forms if legal_forms is not None
+                             else [suffix.replace('\\.', '.') for suffix in self.company_suffixes])
         
         # Expanded French names database
         self.french_names = {
@@ -55,42 +512,93 @@ class FrenchNER:
             'last': ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard', 'Petit', 'Durand', 'Leroy', 'Moreau',
                     'Simon', 'Laurent', 'Lefebvre', 'Michel', 'Garcia', 'David', 'Bertrand', 'Roux', 'Vincent', 'Fournier']
         }
+        self._siren_cache: Dict[str, bool] = {}
+        self._builtin_names = {kind: frozenset(map(name_key, names)) for kind, names in self.french_names.items()}
+        # Full first-name / last-name tables with frequencies (name_gazetteer.py build), memory-mapped
+        self.gazetteer = NameGazetteer(gazetteer_path) if gazetteer_path else None
+        # Per-paragraph results for extract_incremental (in memory when no path is given)
+        self.segment_cache = SegmentCache(segment_cache_path) if segment_cache_path else None
+        # Per-stage / per-pattern counters, None unless enable_profiling() was called
+        self.profile: Optional[NERProfile] = None
+
+    def enable_profiling(self, export_path: Optional[str] = None, export_interval: float = 5.0) -> NERProfile:
+        """Start profiling extract_entities (see ner_profile.py); returns the profile"""
+        if self.profile is None:
+            self.profile = NERProfile(export_path=export_path, export_interval=export_interval)
+        return self.profile
+
+    def disable_profiling(self) -> Optional[NERProfile]:
+        """Stop profiling; returns the profile collected so far"""
+        profile, self.profile = self.profile, None
+        return profile
 
     def luhn_check(self, number: str) -> bool:
         """Validate number using Luhn algorithm (for SIREN/SIRET)"""
-        def luhn_digit(n):
-            return n if n < 10 else n - 9
-        
-        digits = [int(d) for d in number]
-        checksum = sum(luhn_digit(d * 2) if i % 2 == 0 else d for i, d in enumerate(reversed(digits)))
+        # From the right: the check digit is kept, then every other digit is doubled
+        reversed_digits = _ascii_digits(number)[::-1]
+        checksum = sum(map(int, reversed_digits[0::2])) + sum(LUHN_DOUBLED[d] for d in reversed_digits[1::2])
         return checksum % 10 == 0
 
     def normalize_siren_siret(self, value: str) -> Optional[str]:
         """Normalize SIREN/SIRET by removing spaces and validate"""
-        clean = re.sub(r'[\s.-]', '', value)
+        clean = SIREN_SEPARATORS.sub('', value)
         return clean if self.validate_siren_siret(clean) else None
 
     def normalize_phone(self, value: str) -> str:
-        """Normalize French phone to E.164 format"""
-        clean = re.sub(r'[\s.-]', '', value)
-        if clean.startswith('0') and len(clean) == 10:
-            return '+33' + clean[1:]
-        elif clean.startswith('+33') and len(clean) == 12:
-            return clean
-        elif clean.startswith('33') and len(clean) == 11:
-            return '+' + clean
-        return clean
+        return normalize_phone(value)
 
     def normalize_email(self, value: str) -> str:
-        """Normalize email to lowercase"""
-        return value.lower().strip()
+        return normalize_email(value)
 
     def normalize_iban(self, value: str) -> str:
-        """Normalize IBAN by removing spaces"""
-        return re.sub(r'\s', '', value.upper())
+        return normalize_iban(value)
 
     def validate_siren_siret(self, number: str) -> bool:
-        """Validate SIREN/SIRET using Luhn algorithm"""
+        """Validate SIREN/SIRET using Luhn algorithm (cached)"""
+        valid = self._siren_cache.get(number)
+        if valid is None:
+            if len(self._siren_cache) >= LUHN_CACHE_SIZE:
+                self._siren_cache.clear()
+            valid = self._siren_cache[number] = self._check_siren_siret(number)
+        return valid
+
+    def validate_siren_siret_batch(self, numbers: List[str]) -> List[bool]:
+        """Validate many SIREN/SIRET candidates at once
+        
+        Numbers not seen before are checked together with NumPy array arithmetic when
+        available (grouped by length), and every result is cached.
+        """
+        cache = self._siren_cache
+        unknown = list({number for number in numbers if number not in cache})
+        if unknown:
+            if len(cache) + len(unknown) > LUHN_CACHE_SIZE:
+                cache.clear()
+                unknown = list(set(numbers))
+            if np is not None and len(unknown) >= LUHN_BATCH_MIN:
+                cache.update(zip(unknown, self._check_siren_siret_np(unknown)))
+            else:
+                cache.update((number, self._check_siren_siret(number)) for number in unknown)
+        return [cache[number] for number in numbers]
+
+    def _check_siren_siret_np(self, numbers: List[str]) -> List[bool]:
+        valid = [False] * len(numbers)
+        by_length: Dict[int, List[int]] = {9: [], 14: []}
+        for i, number in enumerate(numbers):
+            if len(number) in by_length and number.isdigit():
+                by_length[len(number)].append(i)
+        for length, indices in by_length.items():
+            if not indices:
+                continue
+            batch = ''.join(_ascii_digits(numbers[i]) for i in indices).encode('ascii')
+            digits = (np.frombuffer(batch, dtype=np.uint8) - 48).reshape(len(indices), length)
+            ok = _luhn_np(digits)
+            if length == 14:
+                ok &= _luhn_np(digits[:, :9])
+            for i, flag in zip(indices, ok.tolist()):
+                valid[i] = flag
+        return valid
+
+    def _check_siren_siret(self, number: str) -> bool:
         if len(number) not in [9, 14]:
             return False
         
@@ -104,91 +612,299 @@ class FrenchNER:
         else:
             return self.luhn_check(number)
 
-    def extract_entities(self, text: str) -> List[Entity]:
-        """Extract all entities from text"""
-        entities = []
-        
-        # Extract structured data (SIREN, phones, emails, etc.)
-        for entity_type, pattern in self.patterns.items():
-            for match in pattern.finditer(text):
-                value = match.group()
-                
-                # Normalize based on type with enhanced validation
-                if entity_type in ['siren', 'siret']:
-                    normalized = self.normalize_siren_siret(value)
-                    if normalized:
-                        confidence = 0.95
-                        metadata = {'validated': True, 'luhn_check': True}
-                    else:
-                        continue  # Skip invalid SIREN/SIRET
-                elif entity_type.startswith('phone'):
-                    normalized = self.normalize_phone(value)
-                    confidence = 0.9 if normalized.startswith('+33') else 0.7
-                    metadata = {'format': 'E.164' if normalized.startswith('+33') else 'raw'}
-                elif entity_type == 'email':
-                    normalized = self.normalize_email(value)
-                    confidence = 0.95
-                    metadata = {'domain': normalized.split('@')[1] if '@' in normalized else None}
-                elif entity_type == 'iban_fr':
-                    normalized = self.normalize_iban(value)
-                    confidence = 0.9
-                    metadata = {'country': 'FR', 'bank_code': normalized[4:9] if len(normalized) >= 9 else None}
-                else:
-                    normalized = value.strip()
-                    confidence = 0.8
-                    metadata = {}
-                
-                entities.append(Entity(
-                    type=entity_type,
-                    value=value,
-                    normalized=normalized,
-                    confidence=confidence,
-                    start=match.start(),
-                    end=match.end(),
-                    metadata=metadata
-                ))
+    def _structured_entity(self, entity_type: str, match: re.Match) -> Optional[Entity]:
+        """Build the entity for a structured pattern match (None if validation fails)"""
+        # Span-based: normalized value and metadata are computed on access (ENTITY_FIELDS)
+        normalized = None
+        if entity_type in ['siren', 'siret']:
+            if self.normalize_siren_siret(match.group()) is None:
+                return None  # Skip invalid SIREN/SIRET
+            confidence = 0.95
+        elif entity_type.startswith('phone'):
+            normalized = normalize_phone(match.group())
+            confidence = 0.9 if normalized.startswith('+33') else 0.7
+        elif entity_type == 'email':
+            confidence = 0.95
+        elif entity_type == 'iban_fr':
+            confidence = 0.9
+        else:
+            confidence = 0.8
         
-        # Extract addresses
-        for pattern in self.address_patterns:
-            for match in pattern.finditer(text):
-                entities.append(Entity(
-                    type='address',
-                    value=match.group(),
-                    normalized=match.group().strip(),
-                    confidence=0.8,
-                    start=match.start(),
-                    end=match.end(),
-                    metadata={'pattern': 'french_address'}
-                ))
+        return Entity(type=entity_type, normalized=normalized, confidence=confidence,
+                      start=match.start(), end=match.end(), source=match.string)
+
+    def _scan_structured(self, text: str) -> Dict[str, List[re.Match]]:
+        """Find the matches of every structured pattern in a single pass over the text
         
-        # Extract companies (enhanced)
-        entities.extend(self.extract_companies(text))
+        Returns the same matches, in the same order, as one finditer per pattern: each
+        pattern only runs on the anchors it can start from (bounded windows), with
+        finditer's non-overlapping semantics kept per type.
+        """
+        fused = {t: p for t, p in self.patterns.items() if self._fused_patterns.get(t) is p}
+        patterns = self.patterns
+        if self.profile is not None:
+            # Every regex call is timed; the rest of the stage time is the anchor scan and validation
+            fused = {t: TimedPattern(p, t, self.profile) for t, p in fused.items()}
+            patterns = {t: TimedPattern(p, t, self.profile) for t, p in patterns.items()}
+        found: Dict[str, List[re.Match]] = {t: [] for t in self.patterns}
+        cluster_types = [(t, fused[t], n) for t, n in CLUSTER_TYPES.items() if t in fused]
+        min_cluster = min((n for _, _, n in cluster_types), default=0)
+        fr_types = [(t, fused[t]) for t in ('iban_fr', 'tva_fr') if t in fused]
+        fr_ends = {t: 0 for t, _ in fr_types}
+        phone_intl = fused.get('phone_intl')
+        email = fused.get('email')
+        email_end = 0
+        size = len(text)
         
-        # Extract persons (enhanced)
-        entities.extend(self.extract_persons(text))
+        for anchor in STRUCTURED_ANCHORS.finditer(text):
+            start, end = anchor.span()
+            first = text[start]
+            if first == '+':
+                if phone_intl is not None:
+                    match = phone_intl.match(text, start)
+                    if match:
+                        found['phone_intl'].append(match)
+            elif first == '@':
+                if email is None:
+                    continue
+                # Window: the local-part run before '@' and the domain run after it
+                left = start
+                while left > email_end and text[left - 1] in EMAIL_LOCAL_CHARS:
+                    left -= 1
+                right = start + 1
+                while right < size and text[right] in EMAIL_DOMAIN_CHARS:
+                    right += 1
+                # Every start in the local-part run reaches this '@' and the same domain: only
+                # the first word boundary can match (searching on would be quadratic in the run)
+                lo = max(left, email_end)
+                while lo < start and (lo > 0 and _is_word(text[lo - 1])) == _is_word(text[lo]):
+                    lo += 1
+                match = email.match(text, lo, min(right + 1, size)) if lo < start else None
+                if match:
+                    found['email'].append(match)
+                    email_end = match.end()
+            elif first == 'F':
+                for entity_type, pattern in fr_types:
+                    if start >= fr_ends[entity_type]:
+                        match = pattern.match(text, start)
+                        if match:
+                            found[entity_type].append(match)
+                            fr_ends[entity_type] = match.end()
+            elif end - start >= min_cluster:
+                # The window extends one character past the cluster so that \b sees the real text
+                window_end = min(end + 1, size)
+                for entity_type, pattern, min_length in cluster_types:
+                    if end - start >= min_length:
+                        found[entity_type].extend(pattern.finditer(text, start, window_end))
         
+        for entity_type, pattern in patterns.items():
+            if entity_type not in fused:
+                found[entity_type] = list(pattern.finditer(text))
+        return found
+
+    def _extract_structured(self, text: str) -> List[Entity]:
+        """Structured entities (SIREN, phones, emails, etc.), found in a single pass"""
+        entities = []
+        structured = self._scan_structured(text)
+        # All SIREN/SIRET candidates are Luhn-checked together, results land in the cache
+        candidates = [SIREN_SEPARATORS.sub('', match.group())
+                      for entity_type in ('siren', 'siret') for match in structured.get(entity_type, ())]
+        if len(candidates) > 1:
+            self.validate_siren_siret_batch(candidates)
+        for entity_type, matches in structured.items():
+            for match in matches:
+                entity = self._structured_entity(entity_type, match)
+                if entity is not None:
+                    entities.append(entity)
+        if self.profile is not None:
+            emitted: Dict[str, int] = {}
+            for entity in entities:
+                emitted[entity.type] = emitted.get(entity.type, 0) + 1
+            for entity_type, matches in structured.items():
+                self.profile.pattern(entity_type, matches=len(matches),
+                                     rejected=len(matches) - emitted.get(entity_type, 0))
+        return entities
+
+    def _extract_addresses(self, pattern: re.Pattern, text: str) -> List[Entity]:
+        return [Entity(type='address', confidence=0.8, start=match.start(), end=match.end(), source=text)
+                for match in pattern.finditer(text)]
+
+    def stages(self) -> List[Tuple[str, Callable[[str], List[Entity]]]]:
+        """Extraction stages of extract_entities, in order: (name, text -> entities)"""
+        stages = [('structured', self._extract_structured)]
+        stages += [(f'address_{i}', partial(self._extract_addresses, pattern))
+                   for i, pattern in enumerate(self.address_patterns)]
+        stages += [('company', self.extract_companies), ('person', self.extract_persons)]
+        return stages
+
+    def extract_entities(self, text: str) -> List[Entity]:
+        """Extract all entities from text"""
+        if self.profile is not None:
+            return self._extract_profiled(text)
+        entities = []
+        for _, stage in self.stages():
+            entities.extend(stage(text))
         return sorted(entities, key=lambda e: e.start)
 
+    def _run_profiled(self, name: str, stage: Callable[[str], List[Entity]], text: str,
+                      size_bytes: int) -> List[Entity]:
+        """Run a stage, adding its time, bytes and entities to the profile"""
+        started = time.perf_counter()
+        entities = stage(text)
+        elapsed = time.perf_counter() - started
+        self.profile.stage(name, elapsed, size_bytes, len(entities))
+        # One regex per address / person stage: the pattern time is the stage time
+        # (the structured and company stages time their regexes themselves)
+        if name not in ('structured', 'company'):
+            self.profile.pattern(name, calls=1, seconds=elapsed, matches=len(entities))
+        return entities
+
+    def _extract_profiled(self, text: str) -> List[Entity]:
+        started = time.perf_counter()
+        size_bytes = len(text.encode('utf-8', 'surrogatepass'))
+        entities = []
+        for name, stage in self.stages():
+            entities.extend(self._run_profiled(name, stage, text, size_bytes))
+        self.profile.record_document(size_bytes, time.perf_counter() - started)
+        return sorted(entities, key=lambda e: e.start)
+
+    def extract_bounded(self, text: str, document_budget: Optional[float] = None,
+                        pattern_budget: Optional[float] = None, window_chars: int = BOUNDED_WINDOW_CHARS,
+                        overlap: int = DEFAULT_OVERLAP_CHARS) -> Tuple[List[Entity], Dict]:
+        """extract_entities with time budgets in seconds, returning partial results when they run out
+        
+        Each stage runs over windows of window_chars characters, with `overlap` characters of
+        context on each side (as in iter_entities), and the clock is checked between windows:
+        a stage stops once it has used pattern_budget, the extraction once it has used
+        document_budget. The report lists the stages cut short ('truncated_patterns').
+        The default patterns match in linear time, so the latency is bounded by the budget
+        plus one window. A text shorter than a window gives the same entities as
+        extract_entities unless a stage is skipped.
+        """
+        started = time.perf_counter()
+        deadline = started + document_budget if document_budget is not None else None
+        entities = []
+        truncated = []
+        size = len(text)
+        for name, stage in self.stages():
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                truncated.append(name)
+                continue
+            limits = [deadline, now + pattern_budget if pattern_budget is not None else None]
+            limit = min((t for t in limits if t is not None), default=None)
+            if size <= window_chars:
+                entities.extend(stage(text) if self.profile is None else
+                                self._run_profiled(name, stage, text, len(text.encode('utf-8', 'surrogatepass'))))
+                continue
+            position = 0
+            while position < size:
+                end = min(position + window_chars, size)
+                lo, hi = max(position - overlap, 0), min(end + overlap, size)
+                window = text[lo:hi]
+                found = (stage(window) if self.profile is None else
+                         self._run_profiled(name, stage, window, len(window.encode('utf-8', 'surrogatepass'))))
+                for entity in found:
+                    if position <= lo + entity.start < end:
+                        # Entities are built by this scan: shifting their offsets in place is safe
+                        entity.start += lo
+                        entity.end += lo
+                        entity._rebase(text, lo)
+                        entities.append(entity)
+                position = end
+                if position < size and limit is not None and time.perf_counter() >= limit:
+                    truncated.append(name)
+                    break
+        elapsed = time.perf_counter() - started
+        if self.profile is not None:
+            self.profile.record_document(len(text.encode('utf-8', 'surrogatepass')), elapsed)
+        report = {
+            'truncated': bool(truncated),
+            'truncated_patterns': truncated,
+            'elapsed_ms': round(elapsed * 1000, 3),
+        }
+        return sorted(entities, key=lambda e: e.start), report
+
+    def set_legal_forms(self, legal_forms: Iterable[str]):
+        """Set the legal forms / acronyms recognized after company names (plain strings)
+        
+        All forms are compiled once into a single trie-shaped pattern, so hundreds of
+        forms cost about the same per scan as a handful.
+        """
+        self.legal_forms = sorted({form.strip() for form in legal_forms if form.strip()})
+        alternation = build_alternation(self.legal_forms)
+        # A form is a whole token preceded by whitespace: 'SA' does not match inside 'SASU' or 'S.A.R.L.'
+        # (a form ending with a dot may be glued to the next word)
+        self._legal_form_pattern = (re.compile(rf'(?<=\s){alternation}(?:(?<=\.)|(?!\w))')
+                                    if self.legal_forms else None)
+
     def extract_companies(self, text: str) -> List[Entity]:
-        """Extract company names using suffix patterns"""
+        """Extract company names using suffix patterns
+        
+        One pass finds the legal forms; at a given position the longest form wins.
+        The name is the text from the first capitalized word of the run of name
+        characters preceding the form, without overlapping the previous company.
+        """
         entities = []
+        if self._legal_form_pattern is None:
+            return entities
         
-        for suffix in self.company_suffixes:
-            pattern = re.compile(rf'\b([A-ZÀ-Ÿ][a-zA-ZÀ-ÿ\s&\'-]+)\s+{suffix}\b')
-            for match in pattern.finditer(text):
-                company_name = match.group(1).strip() + ' ' + suffix.replace('\\.', '.')
-                entities.append(Entity(
-                    type='company',
-                    value=match.group(),
-                    normalized=company_name,
-                    confidence=0.8,
-                    start=match.start(),
-                    end=match.end(),
-                    metadata={'legal_form': suffix.replace('\\.', '.')}
-                ))
+        legal_forms, name_run, name_start = self._legal_form_pattern, COMPANY_NAME_RUN, COMPANY_NAME_START
+        if self.profile is not None:
+            legal_forms = TimedPattern(legal_forms, 'legal_forms', self.profile)
+            name_run = TimedPattern(name_run, 'company_name_run', self.profile)
+            name_start = TimedPattern(name_start, 'company_name_start', self.profile)
+        runs: Optional[List[Tuple[int, int]]] = None
+        run_ends: List[int] = []
+        starts: List[int] = []
+        previous_end = 0
+        forms = 0
+        for match in legal_forms.finditer(text):
+            forms += 1
+            if runs is None:
+                # Computed only once a legal form is seen (most short texts have none)
+                runs = [m.span() for m in name_run.finditer(text)]
+                run_ends = [end for _, end in runs]
+                starts = [m.start() for m in name_start.finditer(text)]
+            form_start = match.start()
+            # Run of name characters ending right before the form (the preceding whitespace belongs to it)
+            run_start = runs[bisect_left(run_ends, form_start)][0]
+            # The capitalized first letter may itself lie outside the run (e.g. 'Ł')
+            lowest = max(run_start - 1, previous_end)
+            k = bisect_left(starts, lowest)
+            if k == len(starts):
+                continue
+            start = starts[k]
+            if form_start - start < 3:
+                continue
+            
+            legal_form = match.group()
+            company_name = text[start:form_start].strip() + ' ' + legal_form
+            entities.append(Entity(
+                type='company',
+                normalized=company_name,
+                confidence=0.8,
+                start=start,
+                end=match.end(),
+                metadata={'legal_form': legal_form},
+                source=text
+            ))
+            previous_end = match.end()
         
+        if self.profile is not None:
+            # Legal forms without a usable company name before them are rejected
+            self.profile.pattern('legal_forms', matches=forms, rejected=forms - len(entities))
         return entities
 
+    def name_weight(self, kind: str, name: str) -> float:
+        """Confidence weight of a first or last name (case and accent insensitive): 1.0 for the
+        built-in names, frequency-based weight in [0.5, 1] from the gazetteer, 0.0 if unknown"""
+        if name_key(name) in self._builtin_names[kind]:
+            return 1.0
+        if self.gazetteer is not None:
+            return self.gazetteer.weight(kind, name)
+        return 0.0
+
     def extract_persons(self, text: str) -> List[Entity]:
         """Extract person names using French name patterns"""
         entities = []
@@ -199,58 +915,308 @@ class FrenchNER:
             first_name, last_name = match.groups()
             confidence = 0.6
             
-            # Boost confidence if names are in our database
-            if first_name in self.french_names['first']:
-                confidence += 0.2
-            if last_name in self.french_names['last']:
-                confidence += 0.2
+            # Boost confidence if names are in our database (weighted by frequency in the gazetteer)
+            confidence += 0.2 * self.name_weight('first', first_name)
+            confidence += 0.2 * self.name_weight('last', last_name)
                 
             entities.append(Entity(
                 type='person',
-                value=match.group(),
-                normalized=f"{first_name} {last_name}",
                 confidence=min(confidence, 0.95),
                 start=match.start(),
                 end=match.end(),
-                metadata={'first_name': first_name, 'last_name': last_name}
+                source=text
             ))
         
         return entities
 
-    def process_document(self, text: str) -> Dict:
-        """Process a document and return structured results"""
-        entities = self.extract_entities(text)
+    def extract_batch(self, texts: List[str]) -> List[List[Entity]]:
+        """Extract the entities of many short texts with a single scan
+        
+        The texts are joined with BATCH_SEPARATOR and scanned once, then each entity is
+        given back to its text with local offsets: the result equals
+        [extract_entities(text) for text in texts] without the fixed per-call cost.
+        """
+        if len(texts) == 1:
+            return [self.extract_entities(texts[0])]
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(BATCH_SEPARATOR)
+        results: List[List[Entity]] = [[] for _ in texts]
+        for entity in self.extract_entities(BATCH_SEPARATOR.join(texts)):
+            index = bisect_right(starts, entity.start) - 1
+            # Entities are built by this scan: shifting their offsets in place is safe
+            entity.start -= starts[index]
+            entity.end -= starts[index]
+            # Values read from the caller's text: the joined string is not kept alive
+            entity._rebase(texts[index], -starts[index])
+            results[index].append(entity)
+        return results
+
+    def split_segments(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) of the paragraphs of a text, blank lines excluded"""
+        segments = []
+        start = 0
+        for match in SEGMENT_BREAK.finditer(text):
+            if match.start() > start:
+                segments.append((start, match.start()))
+            start = match.end()
+        if start < len(text):
+            segments.append((start, len(text)))
+        return segments
+
+    def _segment_version(self) -> str:
+        """Identifies the extraction configuration the cached segment results depend on"""
+        parts = [str(SEGMENT_CACHE_VERSION), getattr(self._legal_form_pattern, 'pattern', '')]
+        parts += [pattern.pattern for _, pattern in sorted(self.patterns.items())]
+        parts += [pattern.pattern for pattern in self.address_patterns]
+        if self.gazetteer is not None:
+            parts.append(json.dumps(self.gazetteer.meta, sort_keys=True))
+        return '\0'.join(parts)
+
+    def extract_incremental(self, text: str) -> List[Entity]:
+        """Extract entities paragraph by paragraph, reusing cached results of unchanged paragraphs
+        
+        Each segment (see split_segments) is looked up by content hash in segment_cache;
+        cached entities are shifted to the segment position, only new segments are
+        extracted (together, see extract_batch) and stored. The result equals
+        extract_entities applied to each paragraph: no entity spans a blank line.
+        """
+        if self.segment_cache is None:
+            self.segment_cache = SegmentCache()
+        segments = self.split_segments(text)
+        version = self._segment_version()
+        keys = [segment_key(text[start:end], version) for start, end in segments]
+        cached = self.segment_cache.get_many(keys)
+
+        missing = {}
+        for key, (start, end) in zip(keys, segments):
+            if key not in cached and key not in missing:
+                missing[key] = text[start:end]
+        if missing:
+            extracted = self.extract_batch(list(missing.values()))
+            rows = [[[e.type, value, normalized, e.confidence, e.start, e.end, metadata]
+                     for e, value, normalized, metadata in _export_fields(entities)]
+                    for entities in extracted]
+            self.segment_cache.put_many(zip(missing, rows))
+            cached.update(zip(missing, rows))
+
+        entities = []
+        for key, (offset, _) in zip(keys, segments):
+            for entity_type, _, normalized, confidence, start, end, metadata in cached[key]:
+                # Value read from the document (same content as the cached segment); own metadata
+                # dict per entity: a repeated paragraph reuses the same rows
+                entities.append(Entity(entity_type, None, normalized, confidence, offset + start, offset + end,
+                                       dict(metadata), source=text))
+        return entities
+
+    def iter_entities(self, stream: Union[TextIO, Iterable[str]], chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                      overlap: int = DEFAULT_OVERLAP_CHARS, resolve: bool = False) -> Iterator[Entity]:
+        """Extract entities from an arbitrarily large text stream with bounded memory
+        
+        The text is processed in chunks; each scan also covers `overlap` characters of
+        context before and after the part it owns, so an entity crossing a chunk boundary
+        is found whole. An entity is yielded by the scan owning its start position, with
+        absolute offsets in the stream, in the same order as extract_entities.
+        Entities longer than the overlap may be truncated at a boundary. With resolve,
+        overlaps are resolved in each scan (resolve_overlaps), context included.
+        """
+        buffer = ''
+        base = 0      # absolute offset of buffer[0]
+        emitted = 0   # entities starting before this offset have been yielded
+        chunks = read_chunks(stream, chunk_chars)
+        chunk = next(chunks, None)
+        while chunk is not None:
+            following = next(chunks, None)
+            buffer += chunk
+            end = base + len(buffer)
+            cut = end if following is None else end - overlap
+            if cut > emitted:
+                entities = self.extract_entities(buffer)
+                if resolve:
+                    entities = resolve_overlaps(entities)
+                for entity in entities:
+                    start = base + entity.start
+                    if emitted <= start < cut:
+                        # Entities are built by this scan: shifting their offsets in place is safe
+                        entity.start = start
+                        entity.end += base
+                        # Bounded memory: a kept entity must not keep its chunk buffer alive
+                        yield entity.detach()
+                emitted = cut
+            # Keep the context needed before the next owned part
+            keep = max(cut - overlap, base) - base
+            buffer = buffer[keep:]
+            base += keep
+            chunk = following
+
+    def extract_file(self, path: str, chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                     overlap: int = DEFAULT_OVERLAP_CHARS, encoding: str = 'utf-8',
+                     resolve: bool = False) -> Iterator[Entity]:
+        """Stream the entities of a text file ('-' for stdin); offsets are in characters"""
+        if path == '-':
+            yield from self.iter_entities(sys.stdin, chunk_chars, overlap, resolve)
+            return
+        # newline='' keeps '\r\n' as is, so offsets match the file content
+        with open(path, encoding=encoding, errors='replace', newline='') as f:
+            yield from self.iter_entities(f, chunk_chars, overlap, resolve)
+
+    def process_document(self, text: str, resolve: bool = False, collapse: bool = False,
+                         layout: str = 'grouped', incremental: bool = False,
+                         document_budget: Optional[float] = None, pattern_budget: Optional[float] = None) -> Dict:
+        """Process a document and return structured results
+        
+        resolve drops overlapping matches (resolve_overlaps), collapse merges repeated
+        values into one entity with their occurrences (collapse_repeats). layout is
+        'grouped' (entities grouped by type) or 'columns' (entities_to_columns).
+        incremental extracts paragraph by paragraph through the segment cache.
+        With a time budget (extract_bounded), the result also carries 'truncated' and
+        'truncated_patterns'.
+        """
+        if document_budget is None and pattern_budget is None:
+            entities = self.extract_incremental(text) if incremental else self.extract_entities(text)
+            return self._document_result(entities, resolve, collapse, layout)
+        if incremental:
+            raise ValueError("Time budgets are not supported in incremental mode")
+        entities, report = self.extract_bounded(text, document_budget, pattern_budget)
+        result = self._document_result(entities, resolve, collapse, layout)
+        result['truncated'] = report['truncated']
+        result['truncated_patterns'] = report['truncated_patterns']
+        return result
+
+    def process_batch(self, texts: List[str], resolve: bool = False, collapse: bool = False,
+                      layout: str = 'grouped', incremental: bool = False,
+                      document_budget: Optional[float] = None, pattern_budget: Optional[float] = None) -> List[Dict]:
+        """process_document for many short texts, scanned together (see extract_batch)
+        
+        Incremental and budgeted processing go document by document.
+        """
+        if incremental or document_budget is not None or pattern_budget is not None:
+            return [self.process_document(text, resolve, collapse, layout, incremental, document_budget,
+                                          pattern_budget) for text in texts]
+        return [self._document_result(entities, resolve, collapse, layout) for entities in self.extract_batch(texts)]
+
+    def _document_result(self, entities: List[Entity], resolve: bool, collapse: bool, layout: str) -> Dict:
+        if layout not in ('grouped', 'columns'):
+            raise ValueError(f"Unknown layout: {layout}")
+        if resolve:
+            entities = resolve_overlaps(entities)
+        if collapse:
+            entities = collapse_repeats(entities)
+        if layout == 'columns':
+            return entities_to_columns(entities)
         
         # Group by type
         by_type = {}
-        for entity in entities:
-            if entity.type not in by_type:
-                by_type[entity.type] = []
-            by_type[entity.type].append({
-                'value': entity.value,
-                'normalized': entity.normalized,
-                'confidence': entity.confidence,
-                'position': [entity.start, entity.end],
-                'metadata': entity.metadata
-            })
+        validated = 0
+        for record in export_entities(entities):
+            entity_type = record.pop('type')
+            if entity_type not in by_type:
+                by_type[entity_type] = []
+            by_type[entity_type].append(record)
+            if entity_type in ['siren', 'siret'] and record['metadata'].get('validated'):
+                validated += 1
         
         return {
             'total_entities': len(entities),
             'entities_by_type': by_type,
             'high_confidence_count': len([e for e in entities if e.confidence > 0.8]),
-            'validated_siren_siret': len([e for e in entities if e.type in ['siren', 'siret'] and e.metadata.get('validated')])
+            'validated_siren_siret': validated
         }
 
+def write_jsonl(entities: Iterable[Entity], out: TextIO) -> int:
+    """Write entities as JSON lines, return the number written"""
+    count = 0
+    # Entities are exported (and their lazy fields computed) one batch at a time
+    batch: List[Entity] = []
+    for entity in entities:
+        batch.append(entity)
+        if len(batch) >= 1000:
+            out.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in export_entities(batch))
+            count += len(batch)
+            batch = []
+    out.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in export_entities(batch))
+    return count + len(batch)
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 ner-french-enhanced.py <text>", file=sys.stderr)
+    parser = argparse.ArgumentParser(description="AURA French NER")
+    parser.add_argument('text', nargs='?',
+                        help="Text to analyze (JSON document on stdout); '-' reads it from stdin, "
+                             "put -- before a text starting with '-'")
+    parser.add_argument('--format', choices=('grouped', 'columns', 'jsonl'), default='grouped',
+                        help="Text mode output: entities grouped by type (indented), columnar layout, "
+                             "or one JSON entity per line")
+    parser.add_argument('--file', help="Stream a large text file ('-' for stdin), one JSON entity per line")
+    parser.add_argument('-o', '--output', help="JSONL output file for --file (default: stdout)")
+    parser.add_argument('--chunk-chars', type=int, default=DEFAULT_CHUNK_CHARS, help="Characters read per chunk")
+    parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_CHARS,
+                        help="Characters re-scanned around chunk boundaries")
+    parser.add_argument('--resolve', action='store_true', help="Drop overlapping matches (type priority, confidence)")
+    parser.add_argument('--collapse', action='store_true',
+                        help="Merge repeated values into one entity with their occurrences (text mode)")
+    parser.add_argument('--segment-cache', default=os.environ.get('AURA_NER_SEGMENT_CACHE'),
+                        help="Persistent per-paragraph result cache (text mode): only new paragraphs are extracted")
+    parser.add_argument('--profile', choices=('json', 'prometheus'),
+                        help="Print per-stage / per-pattern timings, matches and rejections on stderr")
+    parser.add_argument('--document-budget', type=float,
+                        help="Time budget in seconds for the whole document (grouped / columns output, "
+                             "partial result flagged as truncated)")
+    parser.add_argument('--pattern-budget', type=float, help="Time budget in seconds per extraction stage (grouped / columns output)")
+    args = parser.parse_args()
+    if args.segment_cache and (args.document_budget is not None or args.pattern_budget is not None):
+        parser.error("--document-budget / --pattern-budget cannot be combined with --segment-cache "
+                     "(or AURA_NER_SEGMENT_CACHE)")
+    if args.text is None and args.file is None:
+        parser.print_usage(sys.stderr)
         sys.exit(1)
+    if args.text is not None and args.file is not None:
+        parser.error("give either a text or --file, not both")
+    budgeted = args.document_budget is not None or args.pattern_budget is not None
+    if budgeted and (args.file is not None or args.format == 'jsonl'):
+        parser.error("--document-budget / --pattern-budget only apply to a text with the grouped or columns format")
+    if args.text == '-':
+        args.text = sys.stdin.read()
     
-    text = sys.argv[1]
-    ner = FrenchNER()
-    result = ner.process_document(text)
+    ner = FrenchNER(gazetteer_path=os.environ.get('AURA_NER_GAZETTEER'), segment_cache_path=args.segment_cache)
+    if args.profile:
+        ner.enable_profiling()
+    try:
+        incremental = ner.segment_cache is not None
+        if args.file is None:
+            if args.format == 'jsonl':
+                entities = ner.extract_incremental(args.text) if incremental else ner.extract_entities(args.text)
+                if args.resolve:
+                    entities = resolve_overlaps(entities)
+                if args.collapse:
+                    entities = collapse_repeats(entities)
+                write_jsonl(entities, sys.stdout)
+                return
+            result = ner.process_document(args.text, resolve=args.resolve, collapse=args.collapse, layout=args.format,
+                                          incremental=incremental, document_budget=args.document_budget,
+                                          pattern_budget=args.pattern_budget)
+            # Compact separators for the machine-oriented layout
+            if args.format == 'columns':
+                print(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+            else:
+                print(json.dumps(result, ensure_ascii=False, indent=2))
+            return
     
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+        started = time.time()
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            count = write_jsonl(ner.extract_file(args.file, args.chunk_chars, args.overlap, resolve=args.resolve), out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        elapsed = time.time() - started
+        print(f"[ner] {count} entities in {elapsed:.1f}s", file=sys.stderr)
+    finally:
+        if ner.profile is not None:
+            if args.profile == 'prometheus':
+                sys.stderr.write(ner.profile.to_prometheus())
+            else:
+                print(json.dumps(ner.profile.report(), indent=2), file=sys.stderr)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
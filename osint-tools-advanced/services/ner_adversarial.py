@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+AURA NER Adversarial Corpus - pathological inputs pinning FrenchNER's worst-case latency
+
+Each case generates a text of a given size designed to make a backtracking regex
+engine go quadratic or worse (long comma-free lines, OCR / minified text, long digit
+and whitespace runs). The self-check runs every case at two sizes and fails when
+the extraction time does not scale linearly, or when the budgeted mode
+(FrenchNER.extract_bounded) overruns its document budget.
+
+Usage:
+    python3 ner_adversarial.py                  # self-check, exit code 1 on failure
+    python3 ner_adversarial.py --size 200000 --budget 0.05
+    python3 ner_adversarial.py --write corpus/  # dump the corpus as text files
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib.util
+from typing import Callable, Dict
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+# name -> generator(size) of an adversarial text of about `size` characters
+CASES: Dict[str, Callable[[int], str]] = {
+    # Street prefixes on one comma-free line without postal code: the street body is re-scanned
+    'street_no_postal': lambda n: _repeat('12 rue de la Paix ', n),
+    'street_whitespace': lambda n: '1 rue ' + ' ' * n + 'x',
+    'number_whitespace': lambda n: '1' + ' ' * n + 'x',
+    'digit_run': lambda n: '1' * n + ' x',
+    'digits_spaced': lambda n: _repeat('1 ', n),
+    'minified': lambda n: _repeat('var a=1;b.rue(2);c ', n),
+    'ocr_line': lambda n: _repeat('Lorem Ipsum dolor Sit amet 75 rue ', n),
+    'postal_no_city': lambda n: '1 rue a' + _repeat(' 75002', n) + ',',
+    'email_local_run': lambda n: _repeat('a.', n) + '@x',
+    'email_domain_run': lambda n: 'a@' + _repeat('b.', n) + '1',
+    'capitalized_run': lambda n: _repeat('Aa ', n),
+    'company_no_form': lambda n: _repeat('Societe Generale Des Eaux ', n) + 'SAS',
+    'uppercase_run': lambda n: 'Jean ' + 'A' * n + '1',
+}
+
+def load_french_ner(path: str):
+    """Load FrenchNER from the ner-french-enhanced.py script (sibling modules importable)"""
+    services_dir = os.path.dirname(os.path.abspath(path))
+    if services_dir not in sys.path:
+        sys.path.insert(0, services_dir)
+    spec = importlib.util.spec_from_file_location('ner_french_enhanced', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.FrenchNER
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+def self_check(ner, size: int, budget: float, max_ratio: float) -> Dict[str, Dict]:
+    """Time every case at size and 4 x size, unbounded and with a document budget"""
+    report = {}
+    for name, generate in CASES.items():
+        small, large = generate(size), generate(4 * size)
+        t_small = timed(ner.extract_entities, small)
+        t_large = timed(ner.extract_entities, large)
+        started = time.perf_counter()
+        _, info = ner.extract_bounded(large, document_budget=budget)
+        t_bounded = time.perf_counter() - started
+        # 4 x the input must cost at most max_ratio x the time (with a floor for timer noise)
+        linear = t_large <= max_ratio * max(t_small, 0.005)
+        # One window of work may be in flight when the budget runs out
+        bounded = t_bounded <= budget + max(budget, 0.25)
+        report[name] = {
+            'chars': len(large),
+            'small_s': round(t_small, 4),
+            'large_s': round(t_large, 4),
+            'bounded_s': round(t_bounded, 4),
+            'truncated': info['truncated'],
+            'ok': linear and bounded,
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="FrenchNER adversarial corpus and latency self-check")
+    parser.add_argument('--ner-path', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           'ner-french-enhanced.py'))
+    parser.add_argument('--size', type=int, default=50000, help="Characters of the small variant of each case")
+    parser.add_argument('--budget', type=float, default=0.05, help="Document budget in seconds (bounded mode)")
+    parser.add_argument('--max-ratio', type=float, default=8.0,
+                        help="Largest allowed time ratio between the 4 x and 1 x inputs")
+    parser.add_argument('--write', metavar='DIR', help="Write the corpus as text files instead of checking")
+    args = parser.parse_args()
+
+    if args.write:
+        os.makedirs(args.write, exist_ok=True)
+        for name, generate in CASES.items():
+            with open(os.path.join(args.write, f'{name}.txt'), 'w', encoding='utf-8') as f:
+                f.write(generate(args.size))
+        print(f"[adversarial] {len(CASES)} cases written to {args.write}")
+        return
+
+    ner = load_french_ner(args.ner_path)()
+    report = self_check(ner, args.size, args.budget, args.max_ratio)
+    for name, row in report.items():
+        print(json.dumps({'case': name, **row}))
+    failed = [name for name, row in report.items() if not row['ok']]
+    if failed:
+        print(f"[adversarial] FAILED: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+    print(f"[adversarial] {len(report)} cases OK", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
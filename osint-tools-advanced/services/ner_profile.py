@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+AURA NER Profile - opt-in per-stage / per-pattern counters for FrenchNER
+
+Stages are the passes of FrenchNER.extract_entities (structured anchor scan, each
+address pattern, companies, persons): wall time, bytes scanned and entities kept.
+Patterns are the regexes inside them: calls, wall time, candidate matches and
+candidates rejected (SIREN/SIRET failing Luhn, legal forms without a company name).
+Reports are available as a dict and as Prometheus text; export_path may contain
+{pid} so that each process of a pool writes its own file (values add up).
+
+Enabled with FrenchNER.enable_profiling(); when disabled, extraction only pays one
+attribute check per document.
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Dict, List, Optional
+
+STAGE_FIELDS = ('calls', 'seconds', 'bytes', 'entities')
+PATTERN_FIELDS = ('calls', 'seconds', 'matches', 'rejected')
+
+class NERProfile:
+    """Cumulative FrenchNER profiling counters"""
+
+    def __init__(self, metric_prefix: str = 'french_ner', export_path: Optional[str] = None,
+                 export_interval: float = 5.0):
+        self.metric_prefix = metric_prefix
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._lock = threading.Lock()
+        self._last_export = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        self.documents = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.patterns: Dict[str, Dict[str, float]] = {}
+
+    def stage(self, name: str, seconds: float, size_bytes: int, entities: int):
+        """Record one run of a stage over size_bytes of text"""
+        row = self.stages.get(name)
+        if row is None:
+            row = self.stages[name] = dict.fromkeys(STAGE_FIELDS, 0)
+        row['calls'] += 1
+        row['seconds'] += seconds
+        row['bytes'] += size_bytes
+        row['entities'] += entities
+
+    def pattern(self, name: str, calls: int = 0, seconds: float = 0.0, matches: int = 0, rejected: int = 0):
+        """Add to the counters of a pattern"""
+        row = self.patterns.get(name)
+        if row is None:
+            row = self.patterns[name] = dict.fromkeys(PATTERN_FIELDS, 0)
+        row['calls'] += calls
+        row['seconds'] += seconds
+        row['matches'] += matches
+        row['rejected'] += rejected
+
+    def record_document(self, size_bytes: int, seconds: float):
+        self.documents += 1
+        self.bytes += size_bytes
+        self.seconds += seconds
+        if self.export_path and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
+
+    def report(self) -> Dict:
+        """Structured report; stages and patterns sorted by decreasing time"""
+        total = self.seconds or sum(row['seconds'] for row in self.stages.values()) or 1e-9
+        by_time = lambda table: sorted(table.items(), key=lambda item: -item[1]['seconds'])
+        return {
+            'documents': self.documents,
+            'bytes': self.bytes,
+            'seconds': round(self.seconds, 6),
+            'bytes_per_second': round(self.bytes / self.seconds) if self.seconds else 0,
+            'stages': {name: {**row, 'seconds': round(row['seconds'], 6),
+                              'share': round(row['seconds'] / total, 4)} for name, row in by_time(self.stages)},
+            'patterns': {name: {**row, 'seconds': round(row['seconds'], 6)} for name, row in by_time(self.patterns)},
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text format export"""
+        p = self.metric_prefix
+        lines: List[str] = [
+            f"# HELP {p}_documents_total Texts scanned by extract_entities (a micro-batch counts as one)",
+            f"# TYPE {p}_documents_total counter",
+            f"{p}_documents_total {self.documents}",
+            f"# HELP {p}_bytes_total UTF-8 bytes processed by extract_entities",
+            f"# TYPE {p}_bytes_total counter",
+            f"{p}_bytes_total {self.bytes}",
+            f"# HELP {p}_seconds_total Time spent in extract_entities",
+            f"# TYPE {p}_seconds_total counter",
+            f"{p}_seconds_total {self.seconds:.9f}",
+        ]
+        families = [
+            ('stage', self.stages, 'calls', "Runs of each extraction stage"),
+            ('stage', self.stages, 'seconds', "Time spent in each extraction stage"),
+            ('stage', self.stages, 'bytes', "UTF-8 bytes scanned by each extraction stage"),
+            ('stage', self.stages, 'entities', "Entities produced by each extraction stage"),
+            ('pattern', self.patterns, 'calls', "Regex calls per pattern"),
+            ('pattern', self.patterns, 'seconds', "Time spent in each pattern"),
+            ('pattern', self.patterns, 'matches', "Candidate matches per pattern"),
+            ('pattern', self.patterns, 'rejected', "Candidate matches rejected by validation per pattern"),
+        ]
+        for label, table, field, help_text in families:
+            name = f"{p}_{label}_{field}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, row in table.items():
+                value = f"{row[field]:.9f}" if field == 'seconds' else f"{row[field]}"
+                lines.append(f'{name}{{{label}="{key}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: Optional[str] = None):
+        """Write the Prometheus export to a file, atomically"""
+        path = (path or self.export_path).format(pid=os.getpid())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp, path)
+            self._last_export = time.monotonic()
+
+class TimedPattern:
+    """Compiled pattern wrapper adding its calls and time to a profile (finditer returns a list)"""
+    __slots__ = ('pattern', 'name', 'profile')
+
+    def __init__(self, pattern, name: str, profile: NERProfile):
+        self.pattern = pattern
+        self.name = name
+        self.profile = profile
+
+    def match(self, text: str, pos: int = 0, endpos: int = sys.maxsize):
+        started = time.perf_counter()
+        match = self.pattern.match(text, pos, endpos)
+        self.profile.pattern(self.name, calls=1, seconds=time.perf_counter() - started)
+        return match
+
+    def search(self, text: str, pos: int = 0, endpos: int = sys.maxsize):
+        started = time.perf_counter()
+        match = self.pattern.search(text, pos, endpos)
+        self.profile.pattern(self.name, calls=1, seconds=time.perf_counter() - started)
+        return match
+
+    def finditer(self, text: str, pos: int = 0, endpos: int = sys.maxsize) -> list:
+        started = time.perf_counter()
+        matches = list(self.pattern.finditer(text, pos, endpos))
+        self.profile.pattern(self.name, calls=1, seconds=time.perf_counter() - started)
+        return matches
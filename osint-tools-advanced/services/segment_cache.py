@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+AURA Segment Cache - bounded, persistent cache of per-segment NER results
+
+Keys are content hashes of text segments (paragraphs), values the entities found
+in the segment with segment-relative offsets. Entries live in a SQLite file (or
+in memory) and the least recently used ones are evicted beyond max_entries, so a
+daily re-crawl only pays extraction for the paragraphs that changed.
+
+Usage:
+    python3 segment_cache.py info ner-segments.db
+    python3 segment_cache.py clear ner-segments.db
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    key BLOB PRIMARY KEY,
+    entities TEXT NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_used ON segments (used);
+"""
+
+def segment_key(text: str, version: str) -> bytes:
+    """Content hash of a segment for a given extractor version"""
+    digest = hashlib.blake2b(version.encode('utf-8') + b'\0', digest_size=16)
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+class SegmentCache:
+    """Segment key -> list of entity rows, LRU-bounded, persistent when a path is given"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 200000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # timeout: the file may be shared by the worker processes of a pool
+        self._db = sqlite3.connect(path or ':memory:', timeout=30)
+        if path:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._clock = self._db.execute('SELECT COALESCE(MAX(used), 0) FROM segments').fetchone()[0]
+        self._count = self._db.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[List[Any]]]:
+        """Cached rows for the keys found (and marks them as recently used)"""
+        keys = list(set(keys))
+        found: Dict[bytes, List[List[Any]]] = {}
+        # SQLite limits the number of bound parameters per statement
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            marks = ','.join('?' * len(batch))
+            for key, entities in self._db.execute(f'SELECT key, entities FROM segments WHERE key IN ({marks})', batch):
+                found[bytes(key)] = json.loads(entities)
+        if found:
+            self._clock += 1
+            with self._db:
+                found_keys = list(found)
+                for i in range(0, len(found_keys), 500):
+                    batch = found_keys[i:i + 500]
+                    self._db.execute(f"UPDATE segments SET used = ? WHERE key IN ({','.join('?' * len(batch))})",
+                                     [self._clock] + batch)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, List[List[Any]]]]):
+        """Stores segment results, then evicts the least recently used entries beyond max_entries"""
+        self._clock += 1
+        rows = [(key, json.dumps(entities, ensure_ascii=False), self._clock) for key, entities in items]
+        if not rows:
+            return
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO segments (key, entities, used) VALUES (?, ?, ?)', rows)
+            self._count = self._db.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+            if self._count > self.max_entries:
+                # Evict 10% more than needed so eviction does not run on every insert
+                excess = self._count - self.max_entries + self.max_entries // 10
+                self._db.execute('DELETE FROM segments WHERE key IN '
+                                 '(SELECT key FROM segments ORDER BY used LIMIT ?)', (excess,))
+                self._count -= excess
+
+    def clear(self):
+        with self._db:
+            self._db.execute('DELETE FROM segments')
+        self._count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': self._count,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'size_bytes': os.path.getsize(self.path) if self.path and os.path.exists(self.path) else 0,
+        }
+
+    def close(self):
+        self._db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect / clear an AURA NER segment cache")
+    parser.add_argument('command', choices=('info', 'clear'))
+    parser.add_argument('cache', help="Segment cache file (SQLite)")
+    args = parser.parse_args()
+    if not os.path.isfile(args.cache):
+        raise SystemExit(f"Segment cache not found: {args.cache}")
+    cache = SegmentCache(args.cache)
+    try:
+        if args.command == 'clear':
+            cache.clear()
+        print(json.dumps(cache.stats(), indent=2))
+    finally:
+        cache.close()
+
+if __name__ == '__main__':
+    main()
@@ -63,12 +63,14 @@ pruning_events = metrics.get("ai_pruning_events_total",0)
 rag_chunks = metrics.get("rag_retrieved_chunks_total",0)
 rag_ingested = metrics.get("rag_ingested_chunks_total",0)
 rag_cache_hits = metrics.get("rag_cache_hits_total",0)
+nlp_texts = metrics.get("nlp_analysis_texts_total",0)
+nlp_short_circuits = metrics.get("nlp_analysis_short_circuit_total",0)
 
 ratio_saved = (tokens_saved / (tokens_in + tokens_out) * 100) if (tokens_in+tokens_out)>0 else 0
 cache_hit_ratio = 0  # semantic + rag split (approx if we had misses)
 # For rough: we can inspect metrics file for miss/hit lines separately
 with open(FINAL_METRICS,"r") as f:
-    sem_hits=0; sem_miss=0; rag_hit=0; rag_miss=0
+    sem_hits=0; sem_miss=0; rag_hit=0; rag_miss=0; nlp_hit=0; nlp_miss=0
     for line in f:
         if line.startswith("ai_semantic_cache_hits_total"):
             if 'result="hit"' in line: sem_hits += float(line.rsplit(' ',1)[-1])
@@ -76,8 +78,22 @@ with open(FINAL_METRICS,"r") as f:
         if line.startswith("rag_cache_hits_total"):
             if 'result="hit"' in line: rag_hit += float(line.rsplit(' ',1)[-1])
             if 'result="miss"' in line: rag_miss += float(line.rsplit(' ',1)[-1])
+        if line.startswith("nlp_analysis_cache_hits_total"):
+            if 'result="hit"' in line: nlp_hit += float(line.rsplit(' ',1)[-1])
+            if 'result="miss"' in line: nlp_miss += float(line.rsplit(' ',1)[-1])
     cache_hit_ratio = (sem_hits / (sem_hits+sem_miss)*100) if (sem_hits+sem_miss)>0 else 0
     rag_cache_ratio = (rag_hit / (rag_hit+rag_miss)*100) if (rag_hit+rag_miss)>0 else 0
+    nlp_cache_ratio = (nlp_hit / (nlp_hit+nlp_miss)*100) if (nlp_hit+nlp_miss)>0 else 0
+
+# Latence moyenne par étape NLPAnalyzer (nlp_analysis_stage_seconds_sum / _count)
+nlp_stage_sum = {}; nlp_stage_count = {}
+with open(FINAL_METRICS,"r") as f:
+    for line in f:
+        m = re.match(r'^nlp_analysis_stage_seconds_(sum|count)\{stage="([^"]+)"\}\s+([0-9\.eE\+\-]+)$', line.strip())
+        if m:
+            target = nlp_stage_sum if m.group(1) == "sum" else nlp_stage_count
+            target[m.group(2)] = target.get(m.group(2), 0.0) + float(m.group(3))
+nlp_stage_mean_ms = {stage: round(nlp_stage_sum.get(stage, 0.0) / n * 1000, 4) for stage, n in nlp_stage_count.items() if n}
 
 stress_summary = {
     "count": len(stress_lat),
@@ -141,6 +157,10 @@ kpis = {
     "tokens_saved": int(tokens_saved),
     "tokens_saved_ratio": round(ratio_saved, 2),
     "semantic_cache_hit_ratio": round(cache_hit_ratio, 2),
+    "nlp_cache_hit_ratio": round(nlp_cache_ratio, 2),
+    "nlp_texts_total": int(nlp_texts),
+    "nlp_short_circuit_total": int(nlp_short_circuits),
+    "nlp_stage_mean_ms": nlp_stage_mean_ms,
     "rag_retrieved_chunks_total": int(rag_chunks),
     "rag_ingested_chunks_total": int(rag_ingested),
     "stress_latency_ms": stress_summary,
@@ -9,6 +9,9 @@
 #   logs/run/final/*     → métriques finales, snapshots
 #   artifacts/           → copies dataset, rapport agrégé (après aggregate-report)
 #
+# Métriques NLP (preintel worker lancé avec AURA_PREINTEL_METRICS_FILE=logs/run/preintel/nlp-{pid}.prom):
+#   ajoutées à logs/run/final/metrics.prom lors du snapshot final
+#
 set -euo pipefail
 
 # ------------------ Paramètres configurables ------------------
@@ -18,6 +21,7 @@ RAG_TOPK="${RAG_TOPK:-6}"
 STRESS_COUNT="${STRESS_COUNT:-20}"
 WAIT_EMB_SEC="${WAIT_EMB_SEC:-10}"
 DEGRADE_SIMULATION="${DEGRADE_SIMULATION:-false}"   # true pour étape I
+PREINTEL_METRICS_DIR="${PREINTEL_METRICS_DIR:-logs/run/preintel}"
 OUTPUT_DIR="logs/run"
 DATE_TAG="$(date -Iseconds | tr ':' '_')"
 RUN_TAG="run_${DATE_TAG}"
@@ -29,6 +33,11 @@ ARTIF_DIR="artifacts"
 
 mkdir -p "$INITIAL_DIR" "$DURING_DIR" "$FINAL_DIR" "$ARTIF_DIR" scripts/run
 
+# Exports NLP d'exécutions précédentes: seuls ceux de ce run sont agrégés au snapshot final
+# (un worker actif réécrit son fichier à l'export suivant)
+mkdir -p "$PREINTEL_METRICS_DIR"
+rm -f "$PREINTEL_METRICS_DIR"/*.prom "$PREINTEL_METRICS_DIR"/*.prom.tmp
+
 # Couleurs
 C_RESET="\033[0m"; C_INFO="\033[36m"; C_OK="\033[32m"; C_WARN="\033[33m"; C_ERR="\033[31m"
 
@@ -174,6 +183,10 @@ done
 # ------------------ Snapshot final ------------------
 log "Snapshot final..."
 curl -s "$GATEWAY_URL/metrics" > "$FINAL_DIR/metrics.prom" || true
+if compgen -G "$PREINTEL_METRICS_DIR/*.prom" >/dev/null; then
+  cat "$PREINTEL_METRICS_DIR"/*.prom >> "$FINAL_DIR/metrics.prom"
+  ok "Métriques NLP preintel ajoutées ($PREINTEL_METRICS_DIR)."
+fi
 ps -eo pid,cmd,%cpu,%mem | grep -E 'llama|gateway' | grep -v grep > "$FINAL_DIR/procs.txt" || true
 free -h > "$FINAL_DIR/memory.txt" || true
 df -h > "$FINAL_DIR/disk.txt"